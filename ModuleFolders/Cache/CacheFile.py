@@ -1,4 +1,6 @@
+import hashlib
 import os
+from collections import Counter
 from dataclasses import dataclass, field
 from functools import cached_property
 from typing import Any
@@ -35,6 +37,18 @@ class CacheFile(ThreadSafeCache, ExtraMixin):
     extra: dict[str, Any] = field(default_factory=dict)
     """额外属性，用于存储特定reader产生的文件的额外属性，共用属性请加到CacheFile中"""
 
+    def __post_init__(self):
+        # msgspec 反序列化时不会经过 __setattr__，需要在这里建立状态计数
+        if "_status_counts" not in self.__dict__:
+            self._attach_items()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name == "items":
+            self._attach_items()
+        if not name.startswith("_"):
+            self.mark_dirty()
+
     @property
     def file_name(self):
         return os.path.split(self.storage_path)[1]
@@ -44,7 +58,66 @@ class CacheFile(ThreadSafeCache, ExtraMixin):
         with self._lock:
             if hasattr(self, "items_dict"):
                 del self.items_dict
+            with CacheItem._STATUS_COUNT_LOCK:
+                item._owner_file = self
+                self._move_status_count(None, item.translation_status)
             self.items.append(item)
+            self.mark_dirty()
+
+    def count_items(self, status=None) -> int:
+        """获取条目数量，按状态计数时直接读取维护好的计数，不遍历条目"""
+        if status is None:
+            return len(self.items)
+        return self._status_counts[status]
+
+    def _attach_items(self) -> None:
+        """绑定条目的所属文件，并重新统计各翻译状态的条目数量"""
+        with CacheItem._STATUS_COUNT_LOCK:
+            old_counts = self.__dict__.get("_status_counts", Counter())
+            status_counts = Counter()
+            for item in self.items:
+                item._owner_file = self
+                status_counts[item.translation_status] += 1
+            object.__setattr__(self, "_status_counts", status_counts)
+
+            owner_project = self.__dict__.get("_owner_project")
+            if owner_project is not None:
+                owner_project._status_counts.subtract(old_counts)
+                owner_project._status_counts.update(status_counts)
+
+    def _move_status_count(self, old_status: int | None, new_status: int) -> None:
+        """需在持有 CacheItem._STATUS_COUNT_LOCK 时调用"""
+        counters = [self._status_counts]
+        owner_project = self.__dict__.get("_owner_project")
+        if owner_project is not None:
+            counters.append(owner_project._status_counts)
+        for counts in counters:
+            if old_status is not None:
+                counts[old_status] -= 1
+            counts[new_status] += 1
+
+    def mark_dirty(self) -> None:
+        """标记文件内容已变动，使缓存的内容哈希失效"""
+        self.__dict__["_content_version"] = self.__dict__.get("_content_version", 0) + 1
+
+    def get_content_hash(self) -> str:
+        """影响输出结果的文件内容的哈希，内容未变动时直接返回上次的计算结果"""
+        version = self.__dict__.get("_content_version", 0)
+        cached = self.__dict__.get("_content_hash")
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        hasher = hashlib.blake2b(digest_size=16)
+        hasher.update(repr((self.storage_path, self.encoding, self.file_project_type, self.line_ending, self.extra)).encode("utf-8", "surrogatepass"))
+        for item in self.items:
+            hasher.update(repr((
+                item.translation_status, item.source_text, item.translated_text, item.polished_text, item.extra
+            )).encode("utf-8", "surrogatepass"))
+        content_hash = hasher.hexdigest()
+
+        # 计算期间内容发生变动时，版本号不一致，下次会重新计算
+        self.__dict__["_content_hash"] = (version, content_hash)
+        return content_hash
 
     def get_item(self, text_index: int) -> CacheItem:
         """线程安全获取缓存项"""
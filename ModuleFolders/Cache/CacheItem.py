@@ -1,10 +1,9 @@
+import threading
 from dataclasses import dataclass, field
-from functools import cache
-from typing import Any
-
-import tiktoken
+from typing import Any, ClassVar
 
 from ModuleFolders.Cache.BaseCache import ExtraMixin, ThreadSafeCache
+from ModuleFolders.TokenCounter.TokenCounter import TokenCounter
 
 
 class TranslationStatus:
@@ -29,6 +28,47 @@ class CacheItem(ThreadSafeCache, ExtraMixin):
     extra: dict[str, Any] = field(default_factory=dict)
     """额外属性，用于存储特定reader产生的原文片段的额外属性，共用属性请加到CacheItem中"""
 
+    # 翻译状态计数专用锁，只在更新计数时短暂持有，不与条目/文件/项目的池化锁嵌套
+    _STATUS_COUNT_LOCK: ClassVar[threading.Lock] = threading.Lock()
+
+    # 影响输出结果的属性，变化时标记所属文件已变动
+    _OUTPUT_FIELDS: ClassVar[frozenset[str]] = frozenset(("source_text", "translated_text", "polished_text", "extra"))
+
+    # 各计数模式下的 Token 数分别记录在条目上，直接读写属性字典，切分大量条目时不必逐条调用方法
+    _TOKEN_COUNT_KEYS: ClassVar[dict[str, str]] = {
+        TokenCounter.MODE_EXACT: "_token_count_exact",
+        TokenCounter.MODE_APPROXIMATE: "_token_count_approximate",
+    }
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        if name != "translation_status":
+            # 原文变化时记录的 Token 数随之失效
+            if name == "source_text":
+                for key in CacheItem._TOKEN_COUNT_KEYS.values():
+                    self.__dict__.pop(key, None)
+            object.__setattr__(self, name, value)
+            if name in CacheItem._OUTPUT_FIELDS:
+                self._mark_owner_dirty()
+            return None
+
+        # 翻译状态变化时同步更新所属文件与项目的状态计数
+        with CacheItem._STATUS_COUNT_LOCK:
+            old_status = self.__dict__.get("translation_status")
+            object.__setattr__(self, name, value)
+            owner_file = self.__dict__.get("_owner_file")
+            if owner_file is not None and old_status != value:
+                owner_file._move_status_count(old_status, value)
+                owner_file.mark_dirty()
+
+    def _mark_owner_dirty(self) -> None:
+        owner_file = self.__dict__.get("_owner_file")
+        if owner_file is not None:
+            owner_file.mark_dirty()
+
+    def set_extra(self, key, value):
+        super().set_extra(key, value)
+        self._mark_owner_dirty()
+
     # 这里的赋值操作会自动调用下面的setter方法，行为保持不变
     def __post_init__(self):
         if self.source_text is None:
@@ -53,13 +93,33 @@ class CacheItem(ThreadSafeCache, ExtraMixin):
         return self.polished_text or self.translated_text or self.source_text
     
     @property
-    def token_count(self):
-        return self.get_token_count(self.source_text)
+    def token_count(self) -> int:
+        """原文的 Token 数，计算后按计数模式记录在条目上，原文变化前不再重复计算"""
+        token_counter = TokenCounter.get_singleton()
+        token_count = self.get_token_count(token_counter.mode)
+        if token_count is None:
+            token_count = token_counter.compute(self.source_text, token_counter.mode)
+            self.set_token_count(token_counter.mode, token_count)
+        return token_count
+
+    def get_token_count(self, mode: str) -> int | None:
+        return self.__dict__.get(CacheItem._TOKEN_COUNT_KEYS[mode])
+
+    def set_token_count(self, mode: str, token_count: int) -> None:
+        self.__dict__[CacheItem._TOKEN_COUNT_KEYS[mode]] = token_count
+
+    @staticmethod
+    def get_token_counts(items: list["CacheItem"], mode: str) -> list[int | None]:
+        """批量读取条目上记录的 Token 数，未记录的为 None"""
+        key = CacheItem._TOKEN_COUNT_KEYS[mode]
+        return [item.__dict__.get(key) for item in items]
 
-    @classmethod
-    @cache
-    def get_token_count(cls, text) -> int:
-        return len(tiktoken.get_encoding("cl100k_base").encode(text))
+    @staticmethod
+    def set_token_counts(items: list["CacheItem"], mode: str, token_counts: list[int]) -> None:
+        """批量记录条目的 Token 数"""
+        key = CacheItem._TOKEN_COUNT_KEYS[mode]
+        for item, token_count in zip(items, token_counts):
+            item.__dict__[key] = token_count
 
     def get_lang_code(self, default_lang=None):
         """获取语言代码，可选择使用默认值"""
@@ -3,6 +3,8 @@ import os
 import re
 import threading
 import time
+import unicodedata
+import zlib
 from dataclasses import fields
 from typing import Dict, List, Tuple
 
@@ -13,14 +15,18 @@ from Base.Base import Base
 from ModuleFolders.TaskConfig.TaskType import TaskType
 from ModuleFolders.Cache.CacheFile import CacheFile
 from ModuleFolders.Cache.CacheItem import CacheItem, TranslationStatus
+from ModuleFolders.Cache.ChunkPlanner import ChunkPlanner
 from ModuleFolders.Cache.CacheProject import (
     CacheProject,
     CacheProjectStatistics
 )
+from ModuleFolders.TranslationMemory.TranslationMemory import TranslationMemory
 
 
 class CacheManager(Base):
     SAVE_INTERVAL = 8  # 缓存保存间隔（秒）
+    JOURNAL_COMPACT_SIZE = 16 * 1024 * 1024  # 增量日志超过该大小（字节）时合并为完整快照
+    JOURNAL_ITEM_FIELDS = ("translation_status", "model", "translated_text", "polished_text")  # 增量日志记录的条目属性
 
     def __init__(self) -> None:
         super().__init__()
@@ -28,11 +34,26 @@ class CacheManager(Base):
         # 线程锁
         self.file_lock = threading.Lock()
 
+        # 增量日志相关状态
+        self.dirty_lock = threading.Lock()
+        self.dirty_items: dict[int, CacheItem] = {}  # 自上次保存以来变动的条目，以 text_index 为键
+        self.snapshot_required = True  # 下次保存时是否需要写入完整快照
+        self.snapshot_path = ""  # 当前快照文件路径
+        self.snapshot_crc32 = 0  # 当前快照内容的校验值，用于判断增量日志是否属于该快照
+
+        # 去重相关状态
+        self.duplicate_lock = threading.Lock()
+        self.duplicate_groups: dict[int, list[CacheItem]] = {}  # 代表条目的 text_index 到其余相同原文条目的映射
+        self.dedup_stats: dict = {}  # 最近一次切分时的去重效果
+
         # 注册事件
         self.subscribe(Base.EVENT.TASK_START, self.start_interval_saving)
         self.subscribe(Base.EVENT.APP_SHUT_DOWN, self.app_shut_down)
 
     def start_interval_saving(self, event: int, data: dict):
+        # 任务开始前插件可能会直接修改条目，第一次保存时写入完整快照
+        self.require_full_save()
+
         # 定时器
         self.save_to_file_stop_flag = False
         threading.Thread(target=self.save_to_file_tick, daemon=True).start()
@@ -59,13 +80,24 @@ class CacheManager(Base):
                 "path/to/file2.txt": { ... }
             }
         }
+
+        快照写入后，后续的保存只把变动的条目追加到增量日志 AinieeCacheData.journal 中，
+        日志超过 JOURNAL_COMPACT_SIZE 时再合并为新的完整快照
         """
         path = os.path.join(self.save_to_file_require_path, "cache", "AinieeCacheData.json")
+        journal_path = self.get_journal_path(path)
         with self.file_lock:
             os.makedirs(os.path.dirname(path), exist_ok=True)
-            content_bytes = msgspec.json.encode(self.project)
-            with open(path, "wb") as writer:
-                writer.write(content_bytes)
+
+            if (
+                self.snapshot_required
+                or self.snapshot_path != path
+                or not os.path.isfile(path)
+                or (os.path.isfile(journal_path) and os.path.getsize(journal_path) >= self.JOURNAL_COMPACT_SIZE)
+            ):
+                self.write_snapshot(path, journal_path)
+            else:
+                self.append_journal(journal_path)
 
             # 写入项目整体翻译状态文件
             total_line = self.project.stats_data.total_line # 获取需翻译总行数
@@ -77,6 +109,68 @@ class CacheManager(Base):
             with open(json_path, "w", encoding="utf-8") as writer:
                 json.dump(json_data, writer, ensure_ascii=False, indent=4)  # 直接写入 JSON 数据
 
+    # 写入完整快照
+    def write_snapshot(self, path: str, journal_path: str) -> None:
+        # 先清空变动记录再编码，编码期间发生的变动会进入下一次的增量日志
+        with self.dirty_lock:
+            self.dirty_items.clear()
+        self.snapshot_required = False
+
+        content_bytes = msgspec.json.encode(self.project)
+
+        # 先写临时文件再替换，避免写入中途崩溃损坏快照
+        temp_path = path + ".tmp"
+        with open(temp_path, "wb") as writer:
+            writer.write(content_bytes)
+            writer.flush()
+            os.fsync(writer.fileno())
+        os.replace(temp_path, path)
+
+        # 旧日志中的记录已包含在快照中，日志头部的校验值不再匹配，删除失败也不会被误回放
+        if os.path.isfile(journal_path):
+            os.remove(journal_path)
+
+        self.snapshot_path = path
+        self.snapshot_crc32 = zlib.crc32(content_bytes)
+
+    # 追加增量日志
+    def append_journal(self, journal_path: str) -> None:
+        with self.dirty_lock:
+            dirty_items = list(self.dirty_items.values())
+            self.dirty_items.clear()
+
+        lines = []
+        if not os.path.isfile(journal_path):
+            lines.append(msgspec.json.encode({"snapshot_crc32": self.snapshot_crc32}))
+        for item in dirty_items:
+            with item.atomic_scope():
+                record = {"text_index": item.text_index}
+                for name in self.JOURNAL_ITEM_FIELDS:
+                    record[name] = getattr(item, name)
+            lines.append(msgspec.json.encode(record))
+        if self.project.stats_data is not None:
+            lines.append(msgspec.json.encode({"stats_data": self.project.stats_data.to_dict()}))
+
+        with open(journal_path, "ab") as writer:
+            writer.write(b"\n".join(lines) + b"\n")
+            writer.flush()
+            os.fsync(writer.fileno())
+
+    # 记录变动的条目，在下一次保存时写入增量日志
+    def append_journal_items(self, items: list[CacheItem]) -> None:
+        with self.dirty_lock:
+            for item in items:
+                self.dirty_items[item.text_index] = item
+
+    # 条目增删或增量日志不记录的属性变化时，下次保存需要写入完整数据
+    def require_full_save(self) -> None:
+        self.snapshot_required = True
+
+    # 获取快照对应的增量日志路径
+    @staticmethod
+    def get_journal_path(cache_path: str) -> str:
+        return os.path.splitext(cache_path)[0] + ".journal"
+
     # 保存缓存到文件的定时任务
     def save_to_file_tick(self) -> None:
         """定时保存任务"""
@@ -94,29 +188,82 @@ class CacheManager(Base):
 
     # 从项目中加载
     def load_from_project(self, data: CacheProject):
-        self.project = data
+        with self.file_lock:
+            self.project = data
+            self.require_full_save()
 
     # 从缓存文件读取数据
     def load_from_file(self, output_path: str) -> None:
         """从文件加载数据"""
         path = os.path.join(output_path, "cache", "AinieeCacheData.json")
         with self.file_lock:
+            with self.dirty_lock:
+                self.dirty_items.clear()
             if os.path.isfile(path):
-                self.project = self.read_from_file(path)
+                self.project, self.snapshot_crc32 = self._read_project(path)
+                self.snapshot_path = path
+                # 回放过增量日志时（末尾可能有崩溃残留的半行），下次保存时写入完整快照
+                self.snapshot_required = os.path.isfile(self.get_journal_path(path))
 
     @classmethod
     def read_from_file(cls, cache_path) -> CacheProject:
+        return cls._read_project(cache_path)[0]
+
+    @classmethod
+    def _read_project(cls, cache_path) -> tuple[CacheProject, int]:
+        """读取快照并回放增量日志，返回项目与快照内容的校验值"""
         with open(cache_path, "rb") as reader:
             content_bytes = reader.read()
         try:
             # 反序列化严格按照dataclass定义，如source_text这种非optional类型不能为None，否则反序列化失败
-            return msgspec.json.decode(content_bytes, type=CacheProject)
+            project = msgspec.json.decode(content_bytes, type=CacheProject)
         except msgspec.ValidationError:
             content = json.loads(content_bytes.decode('utf-8'))
             if isinstance(content, dict):
-                return CacheProject.from_dict(content)
+                project = CacheProject.from_dict(content)
             else:
-                return cls._read_from_old_content(content)
+                project = cls._read_from_old_content(content)
+
+        # 回放快照之后的增量日志
+        snapshot_crc32 = zlib.crc32(content_bytes)
+        journal_path = cls.get_journal_path(cache_path)
+        if os.path.isfile(journal_path):
+            cls._replay_journal(project, journal_path, snapshot_crc32)
+        return project, snapshot_crc32
+
+    @classmethod
+    def _replay_journal(cls, project: CacheProject, journal_path: str, snapshot_crc32: int) -> None:
+        with open(journal_path, "rb") as reader:
+            lines = reader.read().splitlines()
+        if not lines:
+            return None
+
+        # 日志不属于当前快照时（快照已合并但日志未删除），直接忽略
+        try:
+            header = msgspec.json.decode(lines[0])
+        except msgspec.DecodeError:
+            return None
+        if not isinstance(header, dict) or header.get("snapshot_crc32") != snapshot_crc32:
+            return None
+
+        items_dict = {item.text_index: item for item in project.items_iter()}
+        for line in lines[1:]:
+            try:
+                record = msgspec.json.decode(line)
+            except msgspec.DecodeError:
+                # 崩溃时最后一行可能只写入了一半，之后的内容都不可信
+                break
+
+            if "stats_data" in record:
+                project.stats_data = CacheProjectStatistics.from_dict(record["stats_data"])
+                continue
+
+            item = items_dict.get(record.get("text_index"))
+            if item is None:
+                continue
+            for name in cls.JOURNAL_ITEM_FIELDS:
+                if name in record:
+                    setattr(item, name, record[name])
 
     @classmethod
     def _read_from_old_content(cls, content: list) -> CacheProject:
@@ -174,21 +321,17 @@ class CacheManager(Base):
 
     # 获取某翻译状态的条目数量
     def get_item_count_by_status(self, status: int) -> int:
+        # 调试模式下校验增量维护的状态计数
+        if self.is_debug():
+            for error in self.project.check_status_counts():
+                self.error(f"缓存状态计数与实际条目不一致 - {error}")
         return self.project.count_items(status)
 
     # 检测是否存在需要翻译的条目
     def get_continue_status(self) -> bool:
         """检查是否存在可继续翻译的状态"""
-        has_translated = False
-        has_untranslated = False
-        for item in self.project.items_iter():
-            status = item.translation_status
-            if status == TranslationStatus.TRANSLATED:
-                has_translated = True
-            elif status == TranslationStatus.UNTRANSLATED:
-                has_untranslated = True
-            if has_translated and has_untranslated:
-                return True
+        has_translated = self.get_item_count_by_status(TranslationStatus.TRANSLATED) > 0
+        has_untranslated = self.get_item_count_by_status(TranslationStatus.UNTRANSLATED) > 0
         return has_translated and has_untranslated
 
     # 生成上文数据条目片段
@@ -213,66 +356,128 @@ class CacheManager(Base):
 
         return collected
 
+    # 按文件获取某翻译状态的条目
+    def get_items_of_file_by_status(self, status: int) -> dict[str, list[CacheItem]]:
+        return {
+            file.storage_path: [item for item in file.items if item.translation_status == status]
+            for file in self.project.files.values()
+        }
+
     # 生成待翻译片段
-    def generate_item_chunks(self, limit_type: str, limit_count: int, previous_line_count: int, task_mode) -> \
+    def generate_item_chunks(self, limit_type: str, limit_count: int, previous_line_count: int, task_mode,
+                             strategy: str = ChunkPlanner.STRATEGY_GREEDY, deduplicate: bool = False) -> \
             Tuple[List[List[CacheItem]], List[List[CacheItem]], List[str]]:
         chunks, previous_chunks, file_paths = [], [], []  # 添加 file_paths 初始化
 
+        # 根据任务模式筛选条目
+        if task_mode == TaskType.TRANSLATION : # 选取未翻译条目
+            status = TranslationStatus.UNTRANSLATED
+        elif task_mode == TaskType.POLISH: # 选取已翻译条目
+            status = TranslationStatus.TRANSLATED
+        items_of_file = self.get_items_of_file_by_status(status)
+
+        # 去重：相同原文只发送首次出现的条目，上文仍从去重前的条目中选取
+        unique_items_of_file = items_of_file
+        if deduplicate == True and task_mode == TaskType.TRANSLATION:
+            unique_items_of_file = self.deduplicate_items(items_of_file)
+        elif task_mode == TaskType.TRANSLATION:
+            with self.duplicate_lock:
+                self.duplicate_groups = {}
+            self.dedup_stats = {}
+
+        # Token 模式下一次性批量计算全部待处理条目的 Token 数
+        if limit_type == "token":
+            ChunkPlanner.prepare_token_counts([item for items in unique_items_of_file.values() for item in items])
+
         # 遍历所有文件
         for file in self.project.files.values():
-
-            # 根据任务模式筛选条目
-            if task_mode == TaskType.TRANSLATION : # 选取未翻译条目
-                items = [item for item in file.items if item.translation_status == TranslationStatus.UNTRANSLATED]
-            elif task_mode == TaskType.POLISH: # 选取已翻译条目
-                items = [item for item in file.items if item.translation_status == TranslationStatus.TRANSLATED]
+            items = unique_items_of_file.get(file.storage_path)
 
             # 如果没有需要翻译的条目，则跳过
             if not items:
                 continue
 
-            current_chunk, current_length = [], 0
+            # 按文件切分片段，并生成对应的上文数据片段
+            for chunk in ChunkPlanner.plan(items, limit_type, limit_count, strategy):
+                chunks.append(chunk)
+                previous_chunks.append(
+                    self.generate_previous_chunks(items_of_file.get(file.storage_path), previous_line_count, file.index_of(chunk[0].text_index))
+                )
+                file_paths.append(file.storage_path)
 
-            # 遍历该文件的所有条目
-            for item in items:
-                # 计算当前条目的长度
-                item_length = item.get_token_count(item.source_text) if limit_type == "token" else 1
+        # 统计去重减少的请求数与 Token 数
+        if unique_items_of_file is not items_of_file:
+            self.dedup_stats = self.get_dedup_stats(items_of_file, limit_type, limit_count, len(chunks))
 
-                # 如果当前片段长度加上当前条目长度超过限制，则将当前片段添加到结果列表中，并重置当前片段
-                if current_chunk and (current_length + item_length > limit_count):
-                    # 添加到原文片段列表
-                    chunks.append(current_chunk)
+        # 返回结果列表
+        return chunks, previous_chunks, file_paths
 
-                    # 生成上文数据片段
-                    previous_chunks.append(
-                        self.generate_previous_chunks(items, previous_line_count, file.index_of(current_chunk[0].text_index))
-                    )
+    # 去重使用的原文键：只统一兼容字符并去除首尾空白，行内的空白与换行必须完全一致
+    @staticmethod
+    def get_duplicate_key(source_text: str) -> str:
+        return unicodedata.normalize("NFKC", source_text).strip()
 
-                    # 添加chunk对应的文件路径
-                    file_paths.append(file.storage_path)  # 添加文件路径记录
+    # 按去重键对待翻译条目分组，每组只保留首次出现的条目作为代表
+    def deduplicate_items(self, items_of_file: dict[str, list[CacheItem]]) -> dict[str, list[CacheItem]]:
+        groups: dict[str, list[CacheItem]] = {}
+        unique_items_of_file = defaultdict(list)
 
-                    # 重置片段暂存容器
-                    current_chunk, current_length = [], 0
+        # 按文件顺序遍历，保证代表条目的选取稳定
+        for file in self.project.files.values():
+            for item in items_of_file.get(file.storage_path, ()):
+                key = self.get_duplicate_key(item.source_text)
+                if key != "" and key in groups:
+                    groups[key].append(item)
+                else:
+                    groups[key if key != "" else f"\0{item.text_index}"] = [item]
+                    unique_items_of_file[file.storage_path].append(item)
+
+        with self.duplicate_lock:
+            self.duplicate_groups = {members[0].text_index: members[1:] for members in groups.values() if len(members) > 1}
+
+        return unique_items_of_file
+
+    # 计算去重的效果，请求数按顺序装箱估算
+    def get_dedup_stats(self, items_of_file: dict[str, list[CacheItem]], limit_type: str, limit_count: int, chunk_count: int) -> dict:
+        with self.duplicate_lock:
+            duplicates = [item for members in self.duplicate_groups.values() for item in members]
+
+        ChunkPlanner.prepare_token_counts(duplicates)
+        return {
+            "items": sum(len(items) for items in items_of_file.values()),
+            "duplicate_items": len(duplicates),
+            "requests": chunk_count,
+            "requests_saved": max(0, sum(ChunkPlanner.count_chunks(items, limit_type, limit_count) for items in items_of_file.values()) - chunk_count),
+            "tokens_saved": sum(item.token_count for item in duplicates),
+        }
 
-                # 添加当前条目
-                current_chunk.append(item)
-                current_length += item_length
+    # 将代表条目的译文同步到相同原文的其余条目，返回被同步的条目
+    def propagate_duplicates(self, items: list[CacheItem]) -> list[CacheItem]:
+        updated = []
+        with self.duplicate_lock:
+            for item in items:
+                if item.translation_status != TranslationStatus.TRANSLATED:
+                    continue
 
-            # 处理最后一个未添加到 chunks 的片段
-            if current_chunk:
-                # 添加到原文片段列表
-                chunks.append(current_chunk)
+                for duplicate in self.duplicate_groups.pop(item.text_index, ()):
+                    if duplicate.translation_status != TranslationStatus.UNTRANSLATED:
+                        continue
 
-                # 生成上文数据片段
-                previous_chunks.append(
-                    self.generate_previous_chunks(items, previous_line_count, file.index_of(current_chunk[0].text_index))
-                )
+                    # 原文仅首尾空白或兼容字符不同时，保留该条目自身首尾的空白
+                    with duplicate.atomic_scope():
+                        if duplicate.source_text == item.source_text:
+                            duplicate.translated_text = item.translated_text
+                        else:
+                            duplicate.translated_text = TranslationMemory.restore_whitespace(duplicate.source_text, item.translated_text)
+                        duplicate.model = item.model
+                        duplicate.translation_status = TranslationStatus.TRANSLATED
+                    updated.append(duplicate)
 
-                # 添加chunk对应的文件路径
-                file_paths.append(file.storage_path)  # 添加文件路径记录
+        # 记录变动条目到增量缓存日志
+        if updated:
+            self.append_journal_items(updated)
 
-        # 返回结果列表
-        return chunks, previous_chunks, file_paths 
+        return updated
 
 
     # 获取文件层级结构
@@ -317,6 +522,8 @@ class CacheManager(Base):
                 if new_text and new_text.strip():
                     if item_to_update.source_text != new_text:
                         item_to_update.source_text = new_text
+                        # 增量日志不记录原文，需要写入完整快照
+                        self.require_full_save()
 
             # 修改译文
             elif field_name == 'translated_text':
@@ -336,6 +543,9 @@ class CacheManager(Base):
                 print(f"Error: 不支持更新字段 {field_name}")
                 return
 
+            # 记录到增量日志，开启数据库存储时在下次保存或查询时写入数据库
+            self.append_journal_items([item_to_update])
+
     # 缓存重编排方法
     def reformat_and_splice_cache(self, file_path: str, formatted_data: dict, selected_item_indices: list[int]) -> list[CacheItem] | None:
         """
@@ -403,6 +613,9 @@ class CacheManager(Base):
             if hasattr(cache_file, "items_index_dict"):
                 del cache_file.items_index_dict # 清除旧缓存，以便重新计算
 
+            # 条目结构发生了变化，下次保存时写入完整快照
+            self.require_full_save()
+
             return final_items
 
     # 缓存全搜索方法
@@ -1,10 +1,12 @@
 import time
+from collections import Counter
 from dataclasses import dataclass, field
 from functools import cached_property
 from typing import Any
 
 from ModuleFolders.Cache.BaseCache import ExtraMixin, ThreadSafeCache
 from ModuleFolders.Cache.CacheFile import CacheFile
+from ModuleFolders.Cache.CacheItem import CacheItem
 
 
 class ProjectType:
@@ -39,6 +41,10 @@ class CacheProjectStatistics(ThreadSafeCache):
     token: int = 0
     total_completion_tokens: int = 0
     time: float = 0.0
+    stream_requests: int = 0  # 流式请求数
+    total_ttft: float = 0.0  # 流式请求首个 Token 耗时之和
+    aborted_requests: int = 0  # 流式检查不通过而提前中止的请求数
+    aborted_tokens: int = 0  # 提前中止时已产生的补全 Token 数
 
 
 @dataclass(repr=False)
@@ -52,12 +58,29 @@ class CacheProject(ThreadSafeCache, ExtraMixin):
     detected_line_ending: str = "\n"
     extra: dict[str, Any] = field(default_factory=dict)
 
+    def __post_init__(self):
+        # msgspec 反序列化时不会经过 __setattr__，需要在这里建立状态计数
+        if "_status_counts" not in self.__dict__:
+            self._attach_files()
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name == "files":
+            self._attach_files()
+
     # 添加文件
     def add_file(self, file: CacheFile) -> None:
         """线程安全添加文件"""
         with self._lock:
             if hasattr(self, "file_project_types"):
                 del self.file_project_types  # 清除缓存
+            with CacheItem._STATUS_COUNT_LOCK:
+                old_file = self.files.get(file.storage_path)
+                if old_file is not None:
+                    old_file._owner_project = None
+                    self._status_counts.subtract(old_file._status_counts)
+                file._owner_project = self
+                self._status_counts.update(file._status_counts)
             self.files[file.storage_path] = file
 
     # 根据相对路径获取文件
@@ -76,13 +99,35 @@ class CacheProject(ThreadSafeCache, ExtraMixin):
                         yield item
 
     def count_items(self, status=None):
-        with self._lock:
-            if status is None:
+        if status is None:
+            with self._lock:
                 return sum(len(file.items) for file in self.files.values())
-            else:
-                return sum(
-                    1 for item in self.items_iter() if item.translation_status == status
-                )
+        else:
+            # 状态计数在条目的翻译状态变化时增量维护，无需遍历条目与持有项目锁
+            return self._status_counts[status]
+
+    def check_status_counts(self) -> list[str]:
+        """校验维护的状态计数与实际遍历结果是否一致，返回不一致的描述列表，用于调试模式"""
+        errors = []
+        with self._lock:
+            project_counts = Counter()
+            for file in self.files.values():
+                file_counts = Counter(item.translation_status for item in file.items)
+                project_counts.update(file_counts)
+                if +file._status_counts != file_counts:
+                    errors.append(f"{file.storage_path}: {dict(+file._status_counts)} != {dict(file_counts)}")
+            if +self._status_counts != project_counts:
+                errors.append(f"project: {dict(+self._status_counts)} != {dict(project_counts)}")
+        return errors
+
+    def _attach_files(self) -> None:
+        """绑定文件的所属项目，并汇总各翻译状态的条目数量"""
+        with CacheItem._STATUS_COUNT_LOCK:
+            status_counts = Counter()
+            for file in self.files.values():
+                file._owner_project = self
+                status_counts.update(file._status_counts)
+            object.__setattr__(self, "_status_counts", status_counts)
 
     @cached_property
     def file_project_types(self) -> frozenset[str]:
@@ -0,0 +1,97 @@
+from ModuleFolders.Cache.CacheItem import CacheItem
+from ModuleFolders.TokenCounter.TokenCounter import TokenCounter
+
+
+class ChunkPlanner:
+    """任务切分规划器
+
+    负责把同一文件内的待处理条目切分为连续片段：
+    - Token 模式下先批量计算所有缺少 Token 数的条目，结果保存在条目上，后续对半切分的轮次直接复用
+    - greedy 策略按顺序装满一个片段再开启下一个，与以往的切分结果一致
+    - balanced 策略在不增加片段数量的前提下，让各片段大小尽量接近，避免文件末尾出现过小的片段
+    """
+
+    STRATEGY_GREEDY = "greedy"
+    STRATEGY_BALANCED = "balanced"
+
+    # 批量计算并记录条目的 Token 数，返回各条目的 Token 数
+    @classmethod
+    def prepare_token_counts(cls, items: list[CacheItem]) -> list[int]:
+        token_counter = TokenCounter.get_singleton()
+        mode = token_counter.mode
+
+        # 已记录的 Token 数直接使用，缺少的一次性批量计算
+        token_counts = CacheItem.get_token_counts(items, mode)
+        if None not in token_counts:
+            return token_counts
+
+        pending = [i for i, token_count in enumerate(token_counts) if token_count is None]
+        pending_items = [items[i] for i in pending]
+        counted = token_counter.count_batch([item.source_text for item in pending_items])
+        CacheItem.set_token_counts(pending_items, mode, counted)
+        for i, token_count in zip(pending, counted):
+            token_counts[i] = token_count
+
+        return token_counts
+
+    # 将条目切分为连续片段
+    @classmethod
+    def plan(cls, items: list[CacheItem], limit_type: str, limit_count: int, strategy: str = STRATEGY_GREEDY) -> list[list[CacheItem]]:
+        if not items:
+            return []
+
+        # 计算各条目的长度
+        weights = cls.prepare_token_counts(items) if limit_type == "token" else [1] * len(items)
+
+        limit_count = max(1, limit_count)
+        bounds = cls._split_greedy(weights, limit_count)
+
+        # 均衡策略：在片段数量不变的前提下，二分查找能容纳全部条目的最小片段上限
+        # 存在单个超限的条目时，平均值可能大于上限，下界不能超过上限，否则其余片段会被装得超过上限
+        if strategy == cls.STRATEGY_BALANCED and len(bounds) > 1:
+            low, high = min(max(1, -(-sum(weights) // len(bounds))), limit_count), limit_count
+            while low < high:
+                middle = (low + high) // 2
+                if cls._count_greedy(weights, middle) <= len(bounds):
+                    high = middle
+                else:
+                    low = middle + 1
+            bounds = cls._split_greedy(weights, low)
+
+        return [items[start:end] for start, end in bounds]
+
+    # 按顺序装箱时的片段数量，用于估算请求数
+    @classmethod
+    def count_chunks(cls, items: list[CacheItem], limit_type: str, limit_count: int) -> int:
+        if not items:
+            return 0
+
+        weights = cls.prepare_token_counts(items) if limit_type == "token" else [1] * len(items)
+
+        return cls._count_greedy(weights, max(1, limit_count))
+
+    # 按上限顺序装箱，返回各片段的起止位置
+    @staticmethod
+    def _split_greedy(weights: list[int], limit_count: int) -> list[tuple[int, int]]:
+        bounds = []
+        start, current_length = 0, 0
+        for i, weight in enumerate(weights):
+            # 超出上限时结束当前片段，单个超限的条目独占一个片段
+            if i > start and current_length + weight > limit_count:
+                bounds.append((start, i))
+                start, current_length = i, 0
+            current_length += weight
+        bounds.append((start, len(weights)))
+        return bounds
+
+    # 按上限顺序装箱时的片段数量
+    @staticmethod
+    def _count_greedy(weights: list[int], limit_count: int) -> int:
+        count, current_length, empty = 1, 0, True
+        for weight in weights:
+            if not empty and current_length + weight > limit_count:
+                count += 1
+                current_length = 0
+            current_length += weight
+            empty = False
+        return count
@@ -1,6 +1,7 @@
 import posixpath
 import zipfile
 from pathlib import Path
+from typing import Iterator
 
 from bs4 import BeautifulSoup
 
@@ -10,6 +11,10 @@ from ModuleFolders.FileAccessor import ZipUtil
 class EpubAccessor:
 
     def read_content(self, source_file_path: Path):
+        return list(self.iter_content(source_file_path))
+
+    # 按清单顺序逐个读取文本文档，每次只解压一个文档
+    def iter_content(self, source_file_path: Path) -> Iterator[tuple[str, str, str]]:
         with zipfile.ZipFile(source_file_path, 'r') as zipf:
             meta_content = zipf.read("META-INF/container.xml")
             meta_soup = BeautifulSoup(meta_content, "xml")
@@ -19,8 +24,7 @@ class EpubAccessor:
                 if root_file.get("media-type") == "application/oebps-package+xml":
                     opf_file = root_file.get("full-path")
             if opf_file is None:
-                return []
-            items = []
+                return
             opf_soup = BeautifulSoup(zipf.read(opf_file), "xml")
             files = {x.filename: x for x in zipf.infolist()}
             for item in opf_soup.select("manifest item"):
@@ -28,8 +32,7 @@ class EpubAccessor:
                 filename = posixpath.join(posixpath.dirname(opf_file), item["href"])
                 if item.get("media-type") == "application/xhtml+xml" and filename in files:
                     content = zipf.read(files[filename]).decode("utf-8")
-                    items.append((item["id"], filename, content))
-            return items
+                    yield item["id"], filename, content
 
     def write_content(
         self, content: dict[str, str], write_file_path: Path,
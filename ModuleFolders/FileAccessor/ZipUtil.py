@@ -1,7 +1,19 @@
+import copy
+import struct
 import zipfile
 from pathlib import Path
 
 
+# EPUB 的 mimetype 文件，必须为压缩包中的第一个文件且不压缩
+MIMETYPE_FILENAME = "mimetype"
+
+# 本地文件头中表示使用数据描述符的标志位
+DATA_DESCRIPTOR_FLAG = 0x08
+
+# 原样复制压缩数据时每次读取的字节数
+COPY_CHUNK_SIZE = 1 << 20
+
+
 def decompress_zip_to_path(zip_file_path: Path, decompress_path: Path):
     decompress_path.mkdir(exist_ok=True)
     # 解压docx文件到暂存文件夹中
@@ -32,12 +44,49 @@ def replace_in_zip_file(
 ):
     with (
         zipfile.ZipFile(src_zip_file_path, 'r') as zin,
+        open(src_zip_file_path, 'rb') as src_fp,
         zipfile.ZipFile(dst_zip_file_path, 'w') as zout,
     ):
+        # mimetype 排在最前面，其余文件保持原有顺序
+        items = sorted(zin.infolist(), key=lambda item: item.filename != MIMETYPE_FILENAME)
+
         # 遍历原始 ZIP 中的所有文件
-        for item in zin.infolist():
-            # 如果是目标文件，替换为新内容
+        for item in items:
+            # 如果是目标文件，替换为新内容并重新压缩
             if item.filename in content:
                 zout.writestr(item, content[item.filename])
-            else:  # 否则直接复制
-                zout.writestr(item, zin.read(item.filename))
+            # mimetype 始终以不压缩、无扩展字段的形式写入
+            elif item.filename == MIMETYPE_FILENAME:
+                zout.writestr(zipfile.ZipInfo(item.filename, item.date_time), zin.read(item.filename))
+            else:  # 否则直接复制压缩后的数据
+                copy_raw_member(src_fp, zout, item)
+
+
+# 原样复制压缩包成员的压缩数据，不经过解压与重新压缩
+def copy_raw_member(src_fp, zout: zipfile.ZipFile, info: zipfile.ZipInfo):
+    # 本地文件头中的扩展字段长度可能与中央目录中的不同，需要读取本地文件头定位数据
+    src_fp.seek(info.header_offset)
+    local_header = src_fp.read(zipfile.sizeFileHeader)
+    if len(local_header) != zipfile.sizeFileHeader or local_header[:4] != zipfile.stringFileHeader:
+        raise zipfile.BadZipFile(f"Bad local file header: {info.filename}")
+    filename_length, extra_length = struct.unpack("<2H", local_header[26:30])
+    src_fp.seek(info.header_offset + zipfile.sizeFileHeader + filename_length + extra_length)
+
+    # 不复制数据描述符，校验值与大小直接写入本地文件头
+    zinfo = copy.copy(info)
+    zinfo.flag_bits &= ~DATA_DESCRIPTOR_FLAG
+    zinfo.header_offset = zout.fp.tell()
+    zout.fp.write(zinfo.FileHeader())
+
+    remaining = info.compress_size
+    while remaining > 0:
+        chunk = src_fp.read(min(remaining, COPY_CHUNK_SIZE))
+        if not chunk:
+            raise zipfile.BadZipFile(f"Truncated file: {info.filename}")
+        zout.fp.write(chunk)
+        remaining -= len(chunk)
+
+    # 登记到中央目录，关闭时与其他文件一同写入
+    zout.filelist.append(zinfo)
+    zout.NameToInfo[zinfo.filename] = zinfo
+    zout.start_dir = zout.fp.tell()
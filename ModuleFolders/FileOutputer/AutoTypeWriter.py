@@ -45,6 +45,11 @@ class AutoTypeWriter(BaseBilingualWriter, BaseTranslatedWriter):
         else:
             raise ValueError(f"不支持的writer工厂`{writer_factory}`")
 
+    def can_write_parallel(self, cache_file: CacheFile) -> bool:
+        # 由文件实际对应的writer决定
+        writer = self._writers.get(cache_file.file_project_type)
+        return writer is None or writer.can_write_parallel(cache_file)
+
     def __exit__(self, exc_type, exc, exc_tb):
         errors = []
         for project_type in list(self._active_writers):
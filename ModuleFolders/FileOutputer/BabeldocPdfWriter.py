@@ -13,6 +13,10 @@ from ModuleFolders.FileOutputer.BaseWriter import (
 
 
 class BabeldocPdfWriter(BaseBilingualWriter, BaseTranslatedWriter):
+
+    # 临时目录由所有实例共用，且转换过程本身已占用大量资源
+    parallel_write = False
+
     def __init__(self, output_config: OutputConfig, tmp_directory='babeldoc_cache'):
         super().__init__(output_config)
         self.tmp_directory = tmp_directory
@@ -58,6 +58,10 @@ class PreWriteMetadata:
 
 class BaseTranslationWriter(ABC):
     """Writer基类，在其生命周期内可以输出多个文件"""
+
+    # 是否可以在多个线程中各自创建实例，同时输出不同的文件
+    parallel_write = True
+
     def __init__(self, output_config: OutputConfig) -> None:
         self.output_config = output_config
 
@@ -77,6 +81,10 @@ class BaseTranslationWriter(ABC):
             return isinstance(self, BaseBilingualWriter) and self.output_config.bilingual_config.enabled
         return False
 
+    def can_write_parallel(self, cache_file: CacheFile) -> bool:
+        """判断该文件能否与其他文件并行输出"""
+        return self.parallel_write
+
     def __enter__(self):
         """申请整个Writer生命周期用到的耗时资源，单个文件的资源则在write_xxx_file方法中申请释放"""
         return self
@@ -1,8 +1,12 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Callable
 
 import rich
+from rich.progress import Progress, TextColumn, BarColumn, TaskProgressColumn, MofNCompleteColumn, TimeRemainingColumn
 
+from ModuleFolders.Cache.CacheFile import CacheFile
 from ModuleFolders.Cache.CacheProject import CacheProject
 from ModuleFolders.FileOutputer import WriterUtil
 from ModuleFolders.FileOutputer.BaseWriter import (
@@ -11,11 +15,24 @@ from ModuleFolders.FileOutputer.BaseWriter import (
     BaseTranslationWriter,
     TranslationOutputConfig
 )
+from ModuleFolders.FileOutputer.ExportManifest import ExportManifest
+
+
+# 单个文件的写入任务：缓存文件、原文路径、各输出方式的(写入方法名, 输出路径, 输出指纹)
+WriteJob = tuple[CacheFile, Path, list[tuple[str, Path, str | None]]]
 
 
 class DirectoryWriter:
-    def __init__(self, create_writer: Callable[[], BaseTranslationWriter]):
+    def __init__(
+        self, create_writer: Callable[[], BaseTranslationWriter],
+        max_workers: int = 1, on_progress: Callable[[int, int], None] = None,
+        manifest_path: Path = None,
+    ):
+        """manifest_path 不为 None 时只输出内容有变动的文件"""
         self.create_writer = create_writer
+        self.max_workers = max_workers
+        self.on_progress = on_progress
+        self.manifest_path = manifest_path
 
     WRITER_TYPE_CONFIG = {
         BaseTranslatedWriter: ("translated_config", "write_translated_file"),
@@ -27,28 +44,157 @@ class DirectoryWriter:
         translation_directory: Path = None,
     ):
         """translation_directory 用于覆盖配置"""
+        manifest = ExportManifest(self.manifest_path).load() if self.manifest_path is not None else None
         with self.create_writer() as writer:
-            # 把翻译片段按文件名分组
-            for storage_path, file_items in project.files.items():
-                source_file_path = source_directory / storage_path
-                for translation_mode in BaseTranslationWriter.TranslationMode:
-                    if writer.can_write(translation_mode):
-                        translation_config: TranslationOutputConfig = getattr(
-                            writer.output_config, translation_mode.config_attr
-                        )
-                        # 替换文件后缀
-                        new_storage_path = self.with_file_suffix(storage_path, translation_config.name_suffix)
-                        output_root = translation_directory or translation_config.output_root
-                        translation_file_path = output_root / new_storage_path
-                        if not translation_file_path.parent.exists():
-                            translation_file_path.parent.mkdir(parents=True, exist_ok=True)
-                        write_translation_file = getattr(writer, translation_mode.write_method)
-
-                        # 执行写入
-                        write_translation_file(translation_file_path, file_items, source_file_path)
+            jobs = self.collect_write_jobs(writer, project, source_directory, translation_directory, manifest)
+
+            # 一次性创建所有输出目录
+            for parent in {path.parent for _, _, outputs in jobs for _, path, _ in outputs}:
+                parent.mkdir(parents=True, exist_ok=True)
+
+            # 不支持并行的文件在当前线程中使用同一个writer输出
+            parallel_jobs, sequential_jobs = [], []
+            for job in jobs:
+                if self.max_workers > 1 and writer.can_write_parallel(job[0]):
+                    parallel_jobs.append(job)
+                else:
+                    sequential_jobs.append(job)
+            if len(parallel_jobs) <= 1:
+                parallel_jobs, sequential_jobs = [], jobs
+
+            with Progress(
+                    TextColumn("[bold blue]{task.description}"),
+                    BarColumn(),
+                    TaskProgressColumn(),
+                    MofNCompleteColumn(),
+                    "•",
+                    TimeRemainingColumn(),
+                    expand=True
+            ) as progress:
+                main_task = progress.add_task("输出翻译文件中...", total=len(jobs))
+                completed = 0
+
+                def advance(job: WriteJob) -> None:
+                    nonlocal completed
+                    completed = completed + 1
+                    progress.update(main_task, advance=1)
+                    if self.on_progress is not None:
+                        self.on_progress(completed, len(jobs))
+
+                    # 记录本次的输出结果
+                    if manifest is not None:
+                        for _, translation_file_path, fingerprint in job[2]:
+                            manifest.record(translation_file_path, fingerprint)
+
+                try:
+                    if parallel_jobs:
+                        self._write_jobs_parallel(parallel_jobs, advance)
+                    for job in sequential_jobs:
+                        self._write_job(writer, job)
+                        advance(job)
+                finally:
+                    # 中途出错时也保存已完成的部分
+                    if manifest is not None:
+                        manifest.save()
         # 释放Ainiee配置实例
         WriterUtil.release_ainiee_config()
 
+    # 收集每个文件需要执行的写入，提供导出清单时跳过未变动的输出
+    def collect_write_jobs(
+        self, writer: BaseTranslationWriter, project: CacheProject,
+        source_directory: Path, translation_directory: Path = None,
+        manifest: ExportManifest = None,
+    ) -> list[WriteJob]:
+        jobs = []
+        skipped = 0
+        output_settings = self.get_output_settings(writer) if manifest is not None else None
+        # 把翻译片段按文件名分组
+        for storage_path, file_items in project.files.items():
+            source_file_path = source_directory / storage_path
+            outputs = []
+            for translation_mode in BaseTranslationWriter.TranslationMode:
+                if writer.can_write(translation_mode):
+                    translation_config: TranslationOutputConfig = getattr(
+                        writer.output_config, translation_mode.config_attr
+                    )
+                    # 替换文件后缀
+                    new_storage_path = self.with_file_suffix(storage_path, translation_config.name_suffix)
+                    output_root = translation_directory or translation_config.output_root
+                    translation_file_path = output_root / new_storage_path
+
+                    # 内容、原文文件与输出配置都未变化，且输出文件未被改动时不再输出
+                    fingerprint = None
+                    if manifest is not None:
+                        fingerprint = ExportManifest.get_fingerprint(
+                            output_settings, translation_mode.write_method, file_items.get_content_hash(),
+                            ExportManifest.get_file_state(source_file_path),
+                        )
+                        if manifest.is_up_to_date(translation_file_path, fingerprint):
+                            skipped = skipped + 1
+                            continue
+                    outputs.append((translation_mode.write_method, translation_file_path, fingerprint))
+            if outputs:
+                jobs.append((file_items, source_file_path, outputs))
+
+        if skipped > 0:
+            rich.print(f"[[green]INFO[/]] 增量导出 - 跳过 {skipped} 个内容未变动的输出文件 ...")
+        return jobs
+
+    # 影响输出结果的writer配置
+    def get_output_settings(self, writer: BaseTranslationWriter) -> tuple:
+        return (
+            type(writer).__qualname__,
+            repr(writer.output_config),
+            WriterUtil.get_ainiee_config().keep_original_encoding,
+        )
+
+    # 按顺序执行单个文件的各种输出
+    def _write_job(self, writer: BaseTranslationWriter, job: WriteJob) -> None:
+        file_items, source_file_path, outputs = job
+        for write_method, translation_file_path, _ in outputs:
+            write_translation_file = getattr(writer, write_method)
+
+            # 执行写入
+            write_translation_file(translation_file_path, file_items, source_file_path)
+
+    # 使用线程池输出，每个线程各自创建并持有一个writer
+    def _write_jobs_parallel(self, jobs: list[WriteJob], advance: Callable[[WriteJob], None]) -> None:
+        max_workers = min(self.max_workers, len(jobs))
+        rich.print(f"[[green]INFO[/]] 使用 {max_workers} 个线程输出 {len(jobs)} 个文件 ...")
+
+        local = threading.local()
+        writers: list[BaseTranslationWriter] = []
+        writers_lock = threading.Lock()
+
+        def write(job: WriteJob) -> None:
+            writer = getattr(local, "writer", None)
+            if writer is None:
+                writer = self.create_writer().__enter__()
+                local.writer = writer
+                with writers_lock:
+                    writers.append(writer)
+            self._write_job(writer, job)
+
+        exc_info = (None, None, None)
+        try:
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                futures = {executor.submit(write, job): job for job in jobs}
+                try:
+                    for future in as_completed(futures):
+                        future.result()
+                        advance(futures[future])
+                except BaseException:
+                    # 出错时不再开始剩余的文件
+                    executor.shutdown(cancel_futures=True)
+                    raise
+        except BaseException as e:
+            exc_info = (type(e), e, e.__traceback__)
+            raise
+        finally:
+            # 全部文件输出完毕后再统一释放，避免共用的资源被提前清理
+            for writer in writers:
+                writer.__exit__(*exc_info)
+
     @classmethod
     def with_file_suffix(self, file_path: str, name_suffix: str) -> Path:
         parts = file_path.rsplit(".", 1)
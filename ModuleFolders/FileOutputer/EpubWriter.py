@@ -1,3 +1,4 @@
+import html
 import re
 from itertools import groupby
 from pathlib import Path
@@ -19,6 +20,25 @@ from ModuleFolders.FileOutputer.BaseWriter import (
 
 
 class EpubWriter(BaseBilingualWriter, BaseTranslatedWriter):
+
+    # 双语版本中原文标签附加的样式
+    ORIGINAL_STYLE = {
+        'opacity': '0.8',
+        'color': '#888',
+        'font-size': '0.85em',
+        'font-style': 'italic',
+        'margin-top': '0.2em',
+    }
+
+    # 完整的成对标签，分组为标签名、属性、内容
+    PAIRED_TAG_PATTERN = re.compile(r"^\s*<([a-zA-Z][^\s/>]*)([^>]*)>(.*)</\1\s*>\s*$", re.DOTALL | re.IGNORECASE)
+
+    # 开始标签中的单个属性，分组为属性名、带引号的属性值
+    ATTRIBUTE_PATTERN = re.compile(r"""\s*([^\s=/>]+)(?:\s*=\s*("[^"]*"|'[^']*'|[^\s"'>]+))?""")
+
+    # 任意标签
+    TAG_PATTERN = re.compile(r"<[^>]*>")
+
     def __init__(self, output_config: OutputConfig):
         super().__init__(output_config)
         self.file_accessor = EpubAccessor()
@@ -47,32 +67,114 @@ class EpubWriter(BaseBilingualWriter, BaseTranslatedWriter):
         self, translation_file_path: Path, cache_file: CacheFile,
         source_file_path: Path, translate_html_tag: Callable[[str, str], str]
     ):
-        content = self.file_accessor.read_content(source_file_path)
-
         translated_item_dict = {
             k: list(v)
             for k, v in groupby(cache_file.items, key=lambda x: x.require_extra("item_id"))
         }
         translation_content = {}
-        for item_id, item_filename, html_content in content:
+        for item_id, item_filename, html_content in self.file_accessor.iter_content(source_file_path):
+            # 没有改动的章节不写入，由压缩包原样复制
             if item_id not in translated_item_dict:
-                translation_content[item_filename] = html_content
                 continue
-            
-            modified_html_content = html_content
-            for item in translated_item_dict[item_id]:
-                if item.translation_status == TranslationStatus.TRANSLATED:
-                    original_html = item.require_extra("original_html")
-                    translated_text = item.final_text
-                    new_html = translate_html_tag(original_html, translated_text)
-                    modified_html_content = modified_html_content.replace(original_html, new_html, 1)
-            translation_content[item_filename] = modified_html_content
+
+            modified_html_content = self._rebuild_html_content(
+                html_content, translated_item_dict[item_id], translate_html_tag
+            )
+            if modified_html_content != html_content:
+                translation_content[item_filename] = modified_html_content
         self.file_accessor.write_content(
             translation_content, translation_file_path, source_file_path
         )
 
+    # 按原文位置一次性拼接整个章节的译文
+    def _rebuild_html_content(
+        self, html_content: str, items: list, translate_html_tag: Callable[[str, str], str]
+    ) -> str:
+        spliced_items = []
+        replaced_items = []
+        for item in items:
+            if item.translation_status != TranslationStatus.TRANSLATED:
+                continue
+            original_html = item.require_extra("original_html")
+            html_offset = item.get_extra("html_offset")
+
+            # 旧版本缓存没有位置信息，或位置与原文对不上时，退回查找替换
+            if html_offset is not None and html_content.startswith(original_html, html_offset):
+                spliced_items.append((html_offset, original_html, item))
+            else:
+                replaced_items.append((original_html, item))
+
+        parts = []
+        cursor = 0
+        for html_offset, original_html, item in sorted(spliced_items, key=lambda x: x[0]):
+            # 同一段落被多个规则提取时只替换第一次
+            if html_offset < cursor:
+                continue
+            parts.append(html_content[cursor:html_offset])
+            parts.append(translate_html_tag(original_html, item.final_text))
+            cursor = html_offset + len(original_html)
+        parts.append(html_content[cursor:])
+        modified_html_content = "".join(parts)
+
+        for original_html, item in replaced_items:
+            new_html = translate_html_tag(original_html, item.final_text)
+            modified_html_content = modified_html_content.replace(original_html, new_html, 1)
+        return modified_html_content
+
+    # 拆分成对标签，无法可靠拆分时返回 None
+    def _split_paired_tag(self, original_html: str) -> tuple[str, str, str] | None:
+        match = self.PAIRED_TAG_PATTERN.match(original_html)
+        if match is None:
+            return None
+        tag_name, attrs, inner_html = match.groups()
+
+        # 属性值中含有 > 时正则无法正确拆分
+        if attrs.count('"') % 2 != 0 or attrs.count("'") % 2 != 0:
+            return None
+        return tag_name, attrs, inner_html
+
+    # 获取标签内容的纯文本
+    def _get_inner_text(self, inner_html: str) -> str:
+        return html.unescape(self.TAG_PATTERN.sub("", inner_html))
+
+    # 删除 id 属性，并在样式中追加原文样式
+    def _style_original_attrs(self, attrs: str) -> str:
+        new_style = '; '.join([f"{k}:{v}" for k, v in self.ORIGINAL_STYLE.items()])
+        parts = []
+        has_style = False
+        for match in self.ATTRIBUTE_PATTERN.finditer(attrs):
+            name, value = match.groups()
+            if name.lower() == "id":
+                continue
+            if name.lower() == "style":
+                existing_style = html.unescape(value[1:-1] if value and value[0] in "\"'" else value or "")
+
+                # 确保现有样式末尾有分号（如果存在）
+                if existing_style and not existing_style.strip().endswith(';'):
+                    existing_style += '; '
+                parts.append(f' {name}="{html.escape(existing_style + new_style)}"')
+                has_style = True
+            elif value is None:
+                parts.append(f" {name}")
+            else:
+                parts.append(f" {name}={value}")
+
+        if not has_style:
+            parts.append(f' style="{new_style}"')
+        return "".join(parts)
+
     # 译文版本
     def _rebuild_translated_tag(self, original_html, translated_text):
+        paired_tag = self._split_paired_tag(original_html)
+        if paired_tag is None:
+            return self._rebuild_translated_tag_by_soup(original_html, translated_text)
+
+        # 保留原始的开始标签，只替换标签内容
+        tag_name, attrs, inner_html = paired_tag
+        processed_translated = self._copy_leading_spaces(self._get_inner_text(inner_html), translated_text)
+        return f"<{tag_name}{attrs}>{html.escape(processed_translated, quote=False)}</{tag_name}>"
+
+    def _rebuild_translated_tag_by_soup(self, original_html, translated_text):
         soup = BeautifulSoup(original_html, 'html.parser')
         original_tag = soup.find()
         if not original_tag:
@@ -92,13 +194,23 @@ class EpubWriter(BaseBilingualWriter, BaseTranslatedWriter):
 
     # 双语版本
     def _rebuild_bilingual_tag(self, original_html, translated_text):
-        ORIGINAL_STYLE = {
-            'opacity': '0.8',
-            'color': '#888',
-            'font-size': '0.85em',
-            'font-style': 'italic',
-            'margin-top': '0.2em',
-        }
+        paired_tag = self._split_paired_tag(original_html)
+        if paired_tag is None:
+            return self._rebuild_bilingual_tag_by_soup(original_html, translated_text)
+
+        # 译文标签使用原始的开始标签，原文标签保留原始内容
+        tag_name, attrs, inner_html = paired_tag
+        processed_trans = self._copy_leading_spaces(self._get_inner_text(inner_html), translated_text)
+        trans_html = f"<{tag_name}{attrs}>{html.escape(processed_trans, quote=False)}</{tag_name}>"
+        orig_html_styled = f"<{tag_name}{self._style_original_attrs(attrs)}>{inner_html}</{tag_name}>"
+
+        if self.output_config.bilingual_order == BilingualOrder.SOURCE_FIRST:
+            return f"{orig_html_styled}\n  {trans_html}"
+        else:  # 默认为译文在前
+            return f"{trans_html}\n  {orig_html_styled}"
+
+    def _rebuild_bilingual_tag_by_soup(self, original_html, translated_text):
+        ORIGINAL_STYLE = self.ORIGINAL_STYLE
 
         soup = BeautifulSoup(original_html, 'html.parser')
         original_tag = soup.find()
@@ -112,7 +224,7 @@ class EpubWriter(BaseBilingualWriter, BaseTranslatedWriter):
             trans_div = f'<div>{processed_trans}</div>'
             orig_div = f'<div style="{style_str}">{original_html}</div>'
 
-            if self.output_config.bilingual_order == BilingualOrder.SOURCE_FIRSTT:
+            if self.output_config.bilingual_order == BilingualOrder.SOURCE_FIRST:
                 return f"{orig_div}\n  {trans_div}"
             else:  # 默认为译文在前
                 return f"{trans_div}\n  {orig_div}"
@@ -0,0 +1,82 @@
+import hashlib
+import json
+import os
+import threading
+from pathlib import Path
+
+import rich
+
+
+class ExportManifest:
+    """导出清单
+
+    记录每个输出文件上次导出时的内容指纹与文件状态：
+    - 指纹由文件内容哈希、输出方式与输出配置等计算得到，任意一项变化都会重新输出
+    - 输出文件被删除或修改（大小、修改时间不同）时也会重新输出
+    """
+
+    # 清单格式版本，输出逻辑不兼容地变化时递增，使旧的记录全部失效
+    VERSION = 1
+
+    def __init__(self, path: Path) -> None:
+        self.path = Path(path)
+        self.lock = threading.Lock()
+        self.entries: dict[str, dict] = {}
+
+    # 获取项目的清单路径
+    def get_project_path(output_path: str) -> Path:
+        return Path(output_path) / "cache" / "ExportManifest.json"
+
+    # 计算输出指纹
+    def get_fingerprint(*parts) -> str:
+        return hashlib.blake2b(repr((ExportManifest.VERSION, *parts)).encode("utf-8", "surrogatepass"), digest_size = 16).hexdigest()
+
+    # 获取文件状态，文件不存在时返回 None
+    def get_file_state(path: Path) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    # 读取清单，文件损坏或版本不一致时视为空清单
+    def load(self) -> "ExportManifest":
+        try:
+            with open(self.path, "r", encoding = "utf-8") as reader:
+                data = json.load(reader)
+            if data.get("version") == __class__.VERSION:
+                self.entries = data.get("entries", {})
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            rich.print(f"[[red]WARNING[/]] 导出清单读取失败，将重新输出全部文件: {e}")
+        return self
+
+    # 保存清单，先写入临时文件再替换，避免中途退出时损坏
+    def save(self) -> None:
+        with self.lock:
+            data = {"version": __class__.VERSION, "entries": self.entries}
+            os.makedirs(self.path.parent, exist_ok = True)
+            temp_path = self.path.with_name(self.path.name + ".tmp")
+            with open(temp_path, "w", encoding = "utf-8") as writer:
+                json.dump(data, writer, ensure_ascii = False)
+            os.replace(temp_path, self.path)
+
+    # 输出文件是否仍是该指纹对应的结果
+    def is_up_to_date(self, output_path: Path, fingerprint: str) -> bool:
+        with self.lock:
+            entry = self.entries.get(os.path.abspath(output_path))
+        if entry is None or entry.get("fingerprint") != fingerprint:
+            return False
+        state = __class__.get_file_state(output_path)
+        return state is not None and list(state) == entry.get("state")
+
+    # 记录输出结果，输出文件不存在时删除记录
+    def record(self, output_path: Path, fingerprint: str) -> None:
+        key = os.path.abspath(output_path)
+        state = __class__.get_file_state(output_path)
+        with self.lock:
+            if state is None:
+                self.entries.pop(key, None)
+            else:
+                self.entries[key] = {"fingerprint": fingerprint, "state": list(state)}
@@ -1,11 +1,13 @@
+import os
 from functools import partial
 from pathlib import Path
-from typing import Type
+from typing import Callable, Type
 
 from ModuleFolders.Cache.CacheProject import CacheProject
 from ModuleFolders.FileOutputer.AutoTypeWriter import AutoTypeWriter
 from ModuleFolders.FileOutputer.BaseWriter import BaseTranslationWriter, OutputConfig, TranslationOutputConfig, WriterInitParams, BilingualOrder
 from ModuleFolders.FileOutputer.DirectoryWriter import DirectoryWriter
+from ModuleFolders.FileOutputer.ExportManifest import ExportManifest
 from ModuleFolders.FileOutputer.MToolWriter import MToolWriter
 from ModuleFolders.FileOutputer.OfficeConversionWriter import OfficeConversionDocWriter
 from ModuleFolders.FileOutputer.ParatranzWriter import ParatranzWriter
@@ -65,7 +67,10 @@ class FileOutputer:
         self.register_writer(AutoTypeWriter, writer_factories=self.writer_factory_dict.values())
 
     # 输出已经翻译文件
-    def output_translated_content(self, cache_data: CacheProject, output_path, input_path, config: dict) -> None:
+    def output_translated_content(
+        self, cache_data: CacheProject, output_path, input_path, config: dict,
+        on_progress: Callable[[int, int], None] = None,
+    ) -> None:
         # cache_data_iter = iter(cache_data)
         # base_info = next(cache_data_iter)
         project_type = cache_data.project_type
@@ -76,7 +81,11 @@ class FileOutputer:
             # 绑定配置，使工厂变成无参
             writer_factory = partial(self.writer_factory_dict[project_type], **writer_iinit_params)
             source_directory = Path(input_path)
-            writer = DirectoryWriter(writer_factory)
+            # 开启多线程输出时，不同的文件由各自线程中的writer同时输出
+            max_workers = (os.cpu_count() or 1) if config.get("parallel_write_switch", True) else 1
+            # 只输出自上次导出以来内容有变动的文件
+            manifest_path = ExportManifest.get_project_path(output_path)
+            writer = DirectoryWriter(writer_factory, max_workers, on_progress, manifest_path)
             # 为防止双语输出路径被覆盖，这里不传translation_directory
             writer.write_translation_directory(cache_data, source_directory)
 
@@ -14,6 +14,10 @@ from ModuleFolders.FileOutputer.DocxWriter import DocxWriter
 
 
 class OfficeConversionWriter(BaseTranslatedWriter):
+
+    # Office 程序只能在创建它的线程中调用，且临时目录由所有实例共用
+    parallel_write = False
+
     def __init__(self, output_config: OutputConfig, tmp_directory='office_cache'):
         super().__init__(output_config)
         self.tmp_directory = tmp_directory
@@ -1,16 +1,23 @@
+import threading
+
 from ModuleFolders.TaskConfig.TaskConfig import TaskConfig
 
 _AINIEE_CONFIG_INSTANCE: TaskConfig | None = None
 """Ainiee配置类单例实现"""
 
+_AINIEE_CONFIG_LOCK = threading.Lock()
+"""多线程输出时保证配置只加载一次"""
+
 
 def get_ainiee_config():
     """获取Ainiee配置的全局单例实例"""
     global _AINIEE_CONFIG_INSTANCE
-    if _AINIEE_CONFIG_INSTANCE is None:
-        _AINIEE_CONFIG_INSTANCE = TaskConfig()
-        # 加载配置文件
-        _AINIEE_CONFIG_INSTANCE.initialize()
+    with _AINIEE_CONFIG_LOCK:
+        if _AINIEE_CONFIG_INSTANCE is None:
+            config = TaskConfig()
+            # 加载配置文件
+            config.initialize()
+            _AINIEE_CONFIG_INSTANCE = config
     return _AINIEE_CONFIG_INSTANCE
 
 
@@ -1,13 +1,14 @@
+import os
 from abc import ABC, abstractmethod
 from dataclasses import dataclass
 from pathlib import Path
-from typing import TypedDict
+from typing import Iterator, TypedDict
 
 from rich.progress import Progress, TextColumn, BarColumn, TaskProgressColumn, MofNCompleteColumn, TimeRemainingColumn
 
 from ModuleFolders.Cache.CacheFile import CacheFile
-from ModuleFolders.Cache.CacheItem import TranslationStatus
-from ModuleFolders.FileReader.ReaderUtil import detect_file_encoding, detect_language_with_mediapipe
+from ModuleFolders.Cache.CacheItem import CacheItem, TranslationStatus
+from ModuleFolders.FileReader.ReaderUtil import DETECT_MODE_HYBRID, detect_file_encoding, detect_languages
 
 
 @dataclass
@@ -28,6 +29,15 @@ class ReaderInitParams(TypedDict):
 class BaseSourceReader(ABC):
     """Reader基类，在其生命周期内可以输入多个文件"""
 
+    # 是否显示单个文件的语言检测进度，多进程读取时由主进程统一显示
+    show_progress = True
+
+    # 语言检测使用的进程数，多进程读取时各子进程内不再分发
+    detect_workers = os.cpu_count() or 1
+
+    # 语言检测模式，见 ReaderUtil.DETECT_MODE_*
+    detect_mode = DETECT_MODE_HYBRID
+
     def __init__(self, input_config: InputConfig) -> None:
         self.input_config = input_config
 
@@ -85,15 +95,10 @@ class BaseSourceReader(ABC):
 
     # 读取文件之后的操作
     def post_read_source(self, file_data: CacheFile) -> CacheFile:
-        """对原文(译文)片段做统一处理，使用批处理方式"""
-        batch_size = 128
+        """对原文(译文)片段做统一处理，整个文件的原文一次性送入批量语言检测"""
         items = file_data.items
-        total_items = len(items)
-        _num_batches = (total_items + batch_size - 1) // batch_size
 
-        # 保存需要使用cld2再次检查的文本
-        # items_for_cld2 = []
-        # 使用Rich显示双层进度条
+        # 使用Rich显示进度条
         with Progress(
                 TextColumn("[bold blue]{task.description}"),
                 BarColumn(),
@@ -101,61 +106,35 @@ class BaseSourceReader(ABC):
                 MofNCompleteColumn(),
                 "•",
                 TimeRemainingColumn(),
-                expand=True
+                expand=True,
+                disable=not self.show_progress
         ) as progress:
 
             # 总体进度
             main_task = progress.add_task(
                 f"MediaPipe语言检测中...\n目标文件 -> {file_data.file_name}\n",
-                total=total_items
+                total=len(items)
             )
 
-            # 批次进度
-            # batch_task = progress.add_task(
-            #     "批次进度",
-            #     total=num_batches
-            # )
-
-            processed_items = 0
-
-            for batch_idx, batch_start in enumerate(range(0, total_items, batch_size)):
-                batch_end = min(batch_start + batch_size, total_items)
-                batch_items = items[batch_start:batch_end]
-                # end_index = min(batch_start + batch_size, total_items)
-
-                # 更新批次描述
-                # progress.update(
-                #     batch_task,
-                #     description=f"批次 {batch_idx + 1}/{num_batches} - 项目: {batch_start + 1}-{end_index}",
-                #     advance=0
-                # )
-
-                # 批量检测语言
-                batch_results = detect_language_with_mediapipe(batch_items, batch_start, file_data)
-                # batch_results = detect_language_with_onnx(batch_items, batch_start, file_data)
-                # batch_results = detect_language_with_pycld2(batch_items, batch_start, file_data)
-
-                # 将检测结果保存回对应的item
-                for i, (mp_langs, mp_score, _) in enumerate(batch_results):
-                    cur_item = items[batch_start + i]
-
-                    # 初始化使用mediapipe结果（如果有效）
-                    if mp_score > 0.0:
-                        # 创建除了主要语言外的其他语言列表
-                        other_langs = mp_langs[1:] if len(mp_langs) > 1 else []
-
-                        cur_item.lang_code = (mp_langs[0], mp_score, other_langs)
-                    else:
-                        # 低于0分的直接标记为排除翻译
-                        cur_item.translation_status = TranslationStatus.EXCLUDED
-
-                    processed_items += 1
+            # 批量检测语言，相同的文本只检测一次
+            results = detect_languages(
+                [item.source_text for item in items],
+                self.detect_workers,
+                lambda advance: progress.update(main_task, advance=advance),
+                self.detect_mode,
+            )
 
-                    # 更新主进度
-                    progress.update(main_task, completed=processed_items)
+        # 将检测结果保存回对应的item
+        for cur_item, (mp_langs, mp_score, _) in zip(items, results):
+            # 初始化使用mediapipe结果（如果有效）
+            if mp_score > 0.0:
+                # 创建除了主要语言外的其他语言列表
+                other_langs = mp_langs[1:] if len(mp_langs) > 1 else []
 
-                # 完成一个批次
-                # progress.update(batch_task, advance=1)
+                cur_item.lang_code = (mp_langs[0], mp_score, other_langs)
+            else:
+                # 低于0分的直接标记为排除翻译
+                cur_item.translation_status = TranslationStatus.EXCLUDED
 
         return file_data
 
@@ -191,3 +170,18 @@ class BaseSourceReader(ABC):
     def exclude_rules(self) -> list[str]:
         """用于排除缓存文件/目录"""
         return []
+
+
+class StreamSourceReader(BaseSourceReader):
+    """流式读取的Reader基类，由iter_source_items逐条产出原文(译文)片段，不需要一次性载入整个文件"""
+
+    def on_read_source(self, file_path: Path, pre_read_metadata: PreReadMetadata) -> CacheFile:
+        file_data = CacheFile()
+        file_data.items = list(self.iter_source_items(file_path, pre_read_metadata, file_data))
+        return file_data
+
+    # 逐条读取文件原文，由各个reader实现方法
+    @abstractmethod
+    def iter_source_items(self, file_path: Path, pre_read_metadata: PreReadMetadata, file_data: CacheFile) -> Iterator[CacheItem]:
+        """逐条产出原文(译文)片段，文件级别的元数据直接写入file_data"""
+        pass
@@ -1,8 +1,17 @@
+import math
+import pickle
 import fnmatch
+import multiprocessing
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from pathlib import Path
 from typing import Callable
 
+import rich
+from rich.progress import Progress, TextColumn, BarColumn, TaskProgressColumn, MofNCompleteColumn, TimeRemainingColumn
+
+from ModuleFolders.Cache.CacheFile import CacheFile
 from ModuleFolders.Cache.CacheItem import CacheItem
 from ModuleFolders.Cache.CacheProject import CacheProject
 from ModuleFolders.FileReader import ReaderUtil
@@ -10,9 +19,40 @@ from ModuleFolders.FileReader.BaseReader import BaseSourceReader
 from ModuleFolders.FileReader.ReaderUtil import make_final_detect_text
 
 
+# 读取单个文件，并补充相对路径与文件项目类型
+def read_one_file(reader: BaseSourceReader, file_path: Path, source_directory: Path) -> CacheFile:
+    cache_file = reader.read_source_file(file_path)
+    cache_file.storage_path = str(file_path.relative_to(source_directory))
+    cache_file.file_project_type = reader.get_file_project_type(file_path)
+    return cache_file
+
+
+# 子进程中读取一批文件，每个子进程持有各自的读取器与语言检测器，返回读取结果与语言检测统计
+def read_file_batch(create_reader: Callable[[], BaseSourceReader], file_paths: list[Path], source_directory: Path,
+                    detect_mode: str) -> tuple[list[CacheFile], dict[str, int]]:
+    # 进度由主进程按文件汇总显示，子进程内不再显示单个文件的语言检测进度，也不再分发语言检测
+    BaseSourceReader.show_progress = False
+    BaseSourceReader.detect_workers = 1
+    BaseSourceReader.detect_mode = detect_mode
+
+    ReaderUtil.reset_detect_stats()
+    with create_reader() as reader:
+        cache_files = [read_one_file(reader, file_path, source_directory) for file_path in file_paths]
+    return cache_files, ReaderUtil.get_detect_stats()
+
+
 class DirectoryReader:
-    def __init__(self, create_reader: Callable[[], BaseSourceReader], exclude_rules: list[str]):
-        self.create_reader = create_reader  # 工厂函数
+    # 每个子进程平均分到的批次数，批次越多进度显示越平滑，但读取器的创建次数也越多
+    BATCHES_PER_WORKER = 4
+
+    # 单个批次的最大文件数
+    MAX_BATCH_SIZE = 32
+
+    def __init__(self, create_reader: Callable[[], BaseSourceReader], exclude_rules: list[str], max_workers: int = 1,
+                 detect_mode: str = ReaderUtil.DETECT_MODE_HYBRID):
+        self.create_reader = create_reader  # 工厂函数，并行读取时需要能够被序列化
+        self.max_workers = max_workers  # 读取文件的进程数，为 1 时在当前进程中顺序读取
+        self.detect_mode = detect_mode  # 语言检测模式
 
         self.exclude_files = set()
         self.exclude_paths = set()
@@ -52,48 +92,61 @@ class DirectoryReader:
         # 按文件分组源文字
         source_texts = defaultdict(list[str])
 
+        ReaderUtil.reset_detect_stats()
+        BaseSourceReader.detect_mode = self.detect_mode
         with self.create_reader() as reader:
             self._update_exclude_rules(reader.exclude_rules)
             cache_project.project_type = reader.get_project_type()
 
+            # 收集需要读取的文件
+            file_paths = []
             for root, _, files in source_directory.walk():  # 递归遍历文件夹
                 for file in files:
                     file_path = root / file
                     # 检查是否被排除，以及是否是目标类型文件
                     if not self.is_exclude(file_path, source_directory) and reader.can_read(file_path):
-
-                        # 读取单个文件的文本信息，并添加其他信息
-                        cache_file = reader.read_source_file(file_path)
-                        cache_file.storage_path = str(file_path.relative_to(source_directory))
-                        cache_file.file_project_type = reader.get_file_project_type(file_path)
-                        for item in cache_file.items:
-                            item.text_index = text_index
-                            item.model = 'none'
-                            text_index += 1
-
-                            # 统计每行的语言信息
-                            lang_code = item.lang_code
-                            # 只统计检测到有效语言代码的item行
-                            if lang_code:
-                                lang_confidence = lang_code[1]
-                                # 更新语言统计：[计数, 累计置信度]
-                                stats = language_stats[cache_file.storage_path][lang_code[0]]
-                                stats[0] += 1  # 增加计数
-                                stats[1] += lang_confidence  # 累加置信度
-                                # 累计有效项目总数
-                                file_valid_items_count[cache_file.storage_path] += 1
-
-                                # 添加行至后续使用
-                                final_detect_text = make_final_detect_text(item)
-                                if final_detect_text:
-                                    source_texts[cache_file.storage_path].append(final_detect_text)
-
-                        # 补充缺失的字典项
-                        if not language_stats[cache_file.storage_path]:
-                            language_stats[cache_file.storage_path] = defaultdict(lambda: [0, 0.0])
-
-                        if cache_file.items:
-                            cache_project.add_file(cache_file)
+                        file_paths.append(file_path)
+
+            # 读取各个文件的文本信息，结果按遍历顺序排列
+            cache_files = None
+            if self._can_read_parallel(file_paths):
+                try:
+                    cache_files = self._read_files_parallel(file_paths, source_directory)
+                except BrokenProcessPool as e:
+                    rich.print(f"[[red]WARNING[/]] 子进程异常退出，将使用单进程重新读取: {e}")
+            if cache_files is None:
+                cache_files = [read_one_file(reader, file_path, source_directory) for file_path in file_paths]
+
+        # 按遍历顺序分配文本索引，保证与顺序读取时的结果一致
+        for cache_file in cache_files:
+            for item in cache_file.items:
+                item.text_index = text_index
+                item.model = 'none'
+                text_index += 1
+
+                # 统计每行的语言信息
+                lang_code = item.lang_code
+                # 只统计检测到有效语言代码的item行
+                if lang_code:
+                    lang_confidence = lang_code[1]
+                    # 更新语言统计：[计数, 累计置信度]
+                    stats = language_stats[cache_file.storage_path][lang_code[0]]
+                    stats[0] += 1  # 增加计数
+                    stats[1] += lang_confidence  # 累加置信度
+                    # 累计有效项目总数
+                    file_valid_items_count[cache_file.storage_path] += 1
+
+                    # 添加行至后续使用
+                    final_detect_text = make_final_detect_text(item)
+                    if final_detect_text:
+                        source_texts[cache_file.storage_path].append(final_detect_text)
+
+            # 补充缺失的字典项
+            if not language_stats[cache_file.storage_path]:
+                language_stats[cache_file.storage_path] = defaultdict(lambda: [0, 0.0])
+
+            if cache_file.items:
+                cache_project.add_file(cache_file)
 
         # 处理语言统计结果
         language_counter = defaultdict(list)
@@ -174,6 +227,9 @@ class DirectoryReader:
         for file_path, langs in low_confidence_language_counter.items():
             cache_project.get_file(file_path).lc_language_stats = langs
 
+        # 输出语言检测统计
+        self._print_detect_stats()
+
         # 释放语言检测器
         ReaderUtil.close_lang_detector()
 
@@ -183,6 +239,68 @@ class DirectoryReader:
         return cache_project
 
 
+    # 判断是否使用多进程读取
+    def _can_read_parallel(self, file_paths: list[Path]) -> bool:
+        if self.max_workers <= 1 or len(file_paths) <= 1:
+            return False
+
+        # 插件等自定义读取器的工厂函数可能无法传递给子进程，此时回退到顺序读取
+        try:
+            pickle.dumps(self.create_reader)
+        except Exception as e:
+            rich.print(f"[[red]WARNING[/]] 读取器无法在子进程中创建，将使用单进程读取: {e}")
+            return False
+
+        return True
+
+    # 使用多进程读取文件，每个进程各自完成解析、编码检测与语言检测
+    def _read_files_parallel(self, file_paths: list[Path], source_directory: Path) -> list[CacheFile]:
+        max_workers = min(self.max_workers, len(file_paths))
+        batch_size = max(1, min(__class__.MAX_BATCH_SIZE, math.ceil(len(file_paths) / (max_workers * __class__.BATCHES_PER_WORKER))))
+        batches = [file_paths[i : i + batch_size] for i in range(0, len(file_paths), batch_size)]
+        results: list[list[CacheFile]] = [None] * len(batches)
+
+        rich.print(f"[[green]INFO[/]] 使用 {max_workers} 个进程读取 {len(file_paths)} 个文件 ...")
+
+        # 统一使用 spawn 方式创建子进程，避免在多线程的界面进程中 fork
+        with Progress(
+                TextColumn("[bold blue]{task.description}"),
+                BarColumn(),
+                TaskProgressColumn(),
+                MofNCompleteColumn(),
+                "•",
+                TimeRemainingColumn(),
+                expand=True
+        ) as progress, ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context("spawn")) as executor:
+            main_task = progress.add_task("读取文件与语言检测中...", total=len(file_paths))
+
+            futures = {
+                executor.submit(read_file_batch, self.create_reader, batch, source_directory, self.detect_mode): i
+                for i, batch in enumerate(batches)
+            }
+            for future in as_completed(futures):
+                i = futures[future]
+                results[i], detect_stats = future.result()
+                ReaderUtil.merge_detect_stats(detect_stats)
+                progress.update(main_task, advance=len(batches[i]))
+
+        return [cache_file for batch_result in results for cache_file in batch_result]
+
+    # 输出语言检测统计
+    def _print_detect_stats(self):
+        stats = ReaderUtil.get_detect_stats()
+        lines = stats.get("lines", 0)
+        if lines == 0:
+            return
+
+        # 以往除预筛选外的每一行都要调用一次模型
+        avoided = lines - stats.get("prefiltered", 0) - stats.get("model_texts", 0)
+        rich.print(
+            f"[[green]INFO[/]] 语言检测 - 共 {lines} 行，预筛选 {stats.get("prefiltered", 0)} 行，"
+            f"重复或缓存命中 {stats.get("deduplicated", 0)} 行，按文字判断 {stats.get("script_texts", 0)} 条文本，"
+            f"模型检测 {stats.get("model_texts", 0)} 条文本，共减少 {avoided} 次模型调用"
+        )
+
     # 自动生成工程名字方法
     def _generate_project_name(self, cache_project: CacheProject):
         """
@@ -1,5 +1,6 @@
 import re
 from pathlib import Path
+from typing import Iterator
 
 from bs4 import BeautifulSoup, Tag, NavigableString
 
@@ -9,13 +10,13 @@ from ModuleFolders.Cache.CacheItem import CacheItem
 from ModuleFolders.Cache.CacheProject import ProjectType
 from ModuleFolders.FileAccessor.EpubAccessor import EpubAccessor
 from ModuleFolders.FileReader.BaseReader import (
-    BaseSourceReader,
     InputConfig,
-    PreReadMetadata
+    PreReadMetadata,
+    StreamSourceReader
 )
 
 
-class EpubReader(BaseSourceReader):
+class EpubReader(StreamSourceReader):
     def __init__(self, input_config: InputConfig):
         super().__init__(input_config)
         self.file_accessor = EpubAccessor()
@@ -42,10 +43,10 @@ class EpubReader(BaseSourceReader):
         ("div", r"<div\b[^>]*>(.*?)</div>", ['p', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'h7', 'li', 'text', 'blockquote', 'td']),
     ]
 
-    def on_read_source(self, file_path: Path, pre_read_metadata: PreReadMetadata) -> CacheFile:
+    def iter_source_items(self, file_path: Path, pre_read_metadata: PreReadMetadata, file_data: CacheFile) -> Iterator[CacheItem]:
 
-        items = []
-        for item_id, _, html_content in self.file_accessor.read_content(file_path):
+        # 逐个章节读取，处理完的章节内容不再保留
+        for item_id, _, html_content in self.file_accessor.iter_content(file_path):
             for tag_type, pattern, forbidden_tags in self.TAG_PATTERNS_LIST:
                 # 使用 finditer 查找所有匹配项，可以迭代处理
                 for match in re.finditer(pattern, html_content, re.DOTALL):
@@ -77,8 +78,13 @@ class EpubReader(BaseSourceReader):
                         "tag_type": tag_type,
                         "item_id": item_id,
                     }
-                    items.append(CacheItem(source_text=text_content, extra=extra))
-        return CacheFile(items=items)
+
+                    # 记录在章节中的位置，写入时按位置一次性拼接译文
+                    html_offset = html_content.find(html_text_C, match.start(), match.end())
+                    if html_offset >= 0:
+                        extra["html_offset"] = html_offset
+
+                    yield CacheItem(source_text=text_content, extra=extra)
 
     # 提取最内层包含文本的标签及其内容（改进点：可以考虑保留部分标签的内容，比如span）
     def extract_epub_content_refined(self,html_string: str) :
@@ -27,6 +27,13 @@ from ModuleFolders.FileReader.BabeldocPdfReader import BabeldocPdfReader
 from PluginScripts.IOPlugins.CustomRegistry import CustomReader
 
 
+# 创建指定项目类型的读取器，供多进程读取时在子进程中调用
+def create_reader(translation_project: str, label_input_path: str) -> BaseSourceReader:
+    file_reader = FileReader()
+    reader_init_params = file_reader._get_reader_init_params(translation_project, label_input_path)
+    return file_reader.reader_factory_dict[translation_project](**reader_init_params)
+
+
 # 文件读取器(分发入口)
 class FileReader():
     def __init__(self):
@@ -75,15 +82,21 @@ class FileReader():
         return ReaderInitParams(input_config=input_config)
 
     # 根据文件类型读取文件，并返回缓存对象
-    def read_files (self,translation_project,label_input_path, exclude_rule_str):
+    def read_files (self,translation_project,label_input_path, exclude_rule_str, parallel: bool = False, detect_mode: str = "hybrid"):
         # 检查传入的项目类型是否已经被注册。
         if translation_project in self.reader_factory_dict:
-            # 获取初始化参数
-            reader_init_params = self._get_reader_init_params(translation_project, label_input_path)
-            # 绑定配置，使工厂变成无参
-            reader_factory = partial(self.reader_factory_dict[translation_project], **reader_init_params)
+            if parallel:
+                # 多进程读取时，工厂需要能够传递给子进程，由子进程各自重新注册并创建读取器
+                reader_factory = partial(create_reader, translation_project, label_input_path)
+                max_workers = os.cpu_count() or 1
+            else:
+                # 获取初始化参数
+                reader_init_params = self._get_reader_init_params(translation_project, label_input_path)
+                # 绑定配置，使工厂变成无参
+                reader_factory = partial(self.reader_factory_dict[translation_project], **reader_init_params)
+                max_workers = 1
             # 创建对象，接收配置好、无参数的 reader_factory
-            reader = DirectoryReader(reader_factory, exclude_rule_str.split(','))
+            reader = DirectoryReader(reader_factory, exclude_rule_str.split(','), max_workers, detect_mode)
             # 再次获取路径对象
             source_directory = Path(label_input_path)
             # 读取整个输入目录,生成缓存对象
@@ -0,0 +1,143 @@
+import json
+from typing import IO, Any, Iterator
+
+
+class JsonStream:
+    """增量 JSON 解析器
+
+    按需从文件中分块读取内容，逐个解析数组元素或对象的键值，
+    内存中只保留当前正在解析的值，用于读取体积巨大的 JSON 工程文件。
+    """
+
+    # 每次从文件读取的最少字符数
+    CHUNK_SIZE = 1 << 20
+
+    # JSON 空白字符
+    WHITESPACE = " \t\n\r"
+
+    # 可以出现在值之后的字符
+    DELIMITERS = WHITESPACE + ",]}:"
+
+    # 数字被截断时缓冲区末尾剩余部分的最大长度，超过时视为格式错误
+    NUMBER_TAIL_MAX_LENGTH = 64
+
+    def __init__(self, file: IO[str]) -> None:
+        self.file = file
+        self.buffer = ""
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    # 读取更多内容，同时丢弃已经解析过的部分，到达文件末尾时返回 False
+    def _fill(self, size: int) -> bool:
+        if self.eof:
+            return False
+
+        chunk = self.file.read(max(size, __class__.CHUNK_SIZE))
+        if not chunk:
+            self.eof = True
+            return False
+
+        # 去除文件开头的 BOM
+        if self.pos == 0 and self.buffer == "":
+            chunk = chunk.removeprefix("﻿")
+
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    # 跳过空白并返回下一个字符，到达文件末尾时返回空字符串
+    def peek(self) -> str:
+        while True:
+            while self.pos < len(self.buffer) and self.buffer[self.pos] in __class__.WHITESPACE:
+                self.pos += 1
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill(0):
+                return ""
+
+    # 读取指定的结构字符
+    def _expect(self, char: str) -> None:
+        if self.peek() != char:
+            raise json.JSONDecodeError(f"Expecting '{char}'", self.buffer, self.pos)
+        self.pos += 1
+
+    # 读取下一个值的分隔符，返回是否已到达容器末尾
+    def _next_separator(self, end_char: str) -> bool:
+        char = self.peek()
+        if char == end_char:
+            self.pos += 1
+            return True
+        if char != ",":
+            raise json.JSONDecodeError(f"Expecting ',' or '{end_char}'", self.buffer, self.pos)
+        self.pos += 1
+        return False
+
+    # 完整解析下一个值
+    def read_value(self) -> Any:
+        self.peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # 值不完整时成倍扩大缓冲区后重新解析，到达文件末尾仍失败则为格式错误
+                if self._fill(len(self.buffer) - self.pos):
+                    continue
+                raise
+
+            # 数字等没有结束符的值可能被截断在缓冲区末尾，如 1.|5 会被解析为 1，
+            # 数字之后到缓冲区末尾都没有分隔符时，读取更多内容后重新解析
+            if __class__._may_be_truncated(value, self.buffer, end) and self._fill(0):
+                continue
+
+            self.pos = end
+            return value
+
+    # 解析出的值是否可能只是完整值的一部分
+    def _may_be_truncated(value: Any, buffer: str, end: int) -> bool:
+        if end == len(buffer):
+            return True
+        if not isinstance(value, (int, float)) or isinstance(value, bool):
+            return False
+
+        # 数字被截断时，缓冲区中剩余的只有该数字的后半部分，不含任何分隔符
+        tail = buffer[end:end + __class__.NUMBER_TAIL_MAX_LENGTH + 1]
+        return len(tail) <= __class__.NUMBER_TAIL_MAX_LENGTH and not any(char in __class__.DELIMITERS for char in tail)
+
+    # 逐个定位数组元素，每次产出后调用方需要读取该元素
+    def iter_array(self) -> Iterator[None]:
+        self._expect("[")
+        if self.peek() == "]":
+            self.pos += 1
+            return
+
+        while True:
+            yield
+            if self._next_separator("]"):
+                return
+
+    # 逐个产出对象的键，每次产出后调用方需要读取对应的值
+    def iter_object(self) -> Iterator[str]:
+        self._expect("{")
+        if self.peek() == "}":
+            self.pos += 1
+            return
+
+        while True:
+            if self.peek() != '"':
+                raise json.JSONDecodeError("Expecting property name enclosed in double quotes", self.buffer, self.pos)
+            key = self.read_value()
+            self._expect(":")
+            yield key
+            if self._next_separator("}"):
+                return
+
+    # 逐个产出数组元素
+    def iter_array_values(self) -> Iterator[Any]:
+        for _ in self.iter_array():
+            yield self.read_value()
+
+    # 逐个产出对象的键值对
+    def iter_object_items(self) -> Iterator[tuple[str, Any]]:
+        for key in self.iter_object():
+            yield key, self.read_value()
@@ -1,17 +1,18 @@
-import json
 from pathlib import Path
+from typing import Iterator
 
 from ModuleFolders.Cache.CacheFile import CacheFile
 from ModuleFolders.Cache.CacheItem import CacheItem, TranslationStatus
 from ModuleFolders.Cache.CacheProject import ProjectType
 from ModuleFolders.FileReader.BaseReader import (
-    BaseSourceReader,
     InputConfig,
-    PreReadMetadata
+    PreReadMetadata,
+    StreamSourceReader
 )
+from ModuleFolders.FileReader.JsonStream import JsonStream
 
 
-class ParatranzReader(BaseSourceReader):
+class ParatranzReader(StreamSourceReader):
     """读取文件夹中树形结构Paratranz json 文件
         待处理的json接口例
         [
@@ -48,36 +49,32 @@ class ParatranzReader(BaseSourceReader):
     def support_file(self):
         return "json"
 
-    def on_read_source(self, file_path: Path, pre_read_metadata: PreReadMetadata) -> CacheFile:
-
-        json_list = json.loads(file_path.read_text(encoding=pre_read_metadata.encoding))
-
-        items = []
-        # 提取键值对
-        for json_item in json_list:
-            # 根据 JSON 文件内容的数据结构，获取相应字段值
-            stage = json_item.get('stage', 0)
-            if stage == 0:  # stage 0为未翻译，详见https://paratranz.cn/docs
-                translation_status = TranslationStatus.UNTRANSLATED
-            else:
-                translation_status = TranslationStatus.TRANSLATED
-            source_text = json_item.get('original', '')  # 获取原文，如果没有则默认为空字符串
-            translated_text = json_item.get('translation', '')  # 获取翻译，如果没有则默认为空字符串
-            extra = {
-                "key": json_item.get('key', ''),  # 获取键值，如果没有则默认为空字符串
-                "context": json_item.get('context', ''),  # 获取上下文信息，如果没有则默认为空字符串
-            }
-            item = CacheItem(
-                source_text=source_text, translated_text=translated_text,
-                translation_status=translation_status,  # 更新翻译状态
-                extra=extra
-            )
-            items.append(item)
-        return CacheFile(items=items)
+    def iter_source_items(self, file_path: Path, pre_read_metadata: PreReadMetadata, file_data: CacheFile) -> Iterator[CacheItem]:
+        with open(file_path, "r", encoding=pre_read_metadata.encoding) as file:
+            # 逐个提取键值对
+            for json_item in JsonStream(file).iter_array_values():
+                # 根据 JSON 文件内容的数据结构，获取相应字段值
+                stage = json_item.get('stage', 0)
+                if stage == 0:  # stage 0为未翻译，详见https://paratranz.cn/docs
+                    translation_status = TranslationStatus.UNTRANSLATED
+                else:
+                    translation_status = TranslationStatus.TRANSLATED
+                source_text = json_item.get('original', '')  # 获取原文，如果没有则默认为空字符串
+                translated_text = json_item.get('translation', '')  # 获取翻译，如果没有则默认为空字符串
+                extra = {
+                    "key": json_item.get('key', ''),  # 获取键值，如果没有则默认为空字符串
+                    "context": json_item.get('context', ''),  # 获取上下文信息，如果没有则默认为空字符串
+                }
+                yield CacheItem(
+                    source_text=source_text, translated_text=translated_text,
+                    translation_status=translation_status,  # 更新翻译状态
+                    extra=extra
+                )
 
     def can_read_by_content(self, file_path: Path) -> bool:
         # 即使不是对应编码也不影响英文的key
-        content = json.loads(file_path.read_text(encoding='utf-8', errors='ignore'))
-        if not isinstance(content, list):
-            return False
-        return all(isinstance(line, dict) and "original" in line for line in content)
+        with open(file_path, "r", encoding='utf-8', errors='ignore') as file:
+            stream = JsonStream(file)
+            if stream.peek() != "[":
+                return False
+            return all(isinstance(line, dict) and "original" in line for line in stream.iter_array_values())
@@ -3,7 +3,10 @@ import pathlib
 import re
 import sys
 import time
-from typing import Union
+import multiprocessing
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import Callable, Union
 
 import chardet
 import charset_normalizer
@@ -14,10 +17,73 @@ from mediapipe.tasks.python.text import LanguageDetector
 
 from ModuleFolders.Cache.CacheFile import CacheFile
 from ModuleFolders.Cache.CacheItem import CacheItem
+from ModuleFolders.TextProcessor.TextProcessor import TextProcessor
+from ModuleFolders.TextProcessor import UnicodeRanges
 
 _LANG_DETECTOR_INSTANCE: LanguageDetector | None = None
 """语言检测器单例实现"""
 
+_PREFILTER_CACHE: dict[str, tuple[tuple[list[str], float, float] | None, str | None]] = {}
+"""预筛选结果缓存，键为原文，值为(无需模型的检测结果, 送入模型的文本)"""
+_DETECT_RESULT_CACHE: dict[str, tuple[list[str], float, float]] = {}
+"""模型检测结果缓存，键为送入模型的文本"""
+_DETECT_STATS: Counter = Counter()
+"""语言检测统计：行数、预筛选行数、重复或缓存命中行数、模型检测文本数"""
+
+DETECT_CACHE_MAX_SIZE = 500000
+"""单个缓存的最大条目数，超出后清空重建"""
+DETECT_CHUNK_SIZE = 2048
+"""送入模型的每批文本数"""
+DETECT_PARALLEL_MIN_TEXTS = 20000
+"""需要模型检测的文本数不少于该值时才使用多进程，进程启动与模型加载都有固定开销"""
+
+DETECT_MODE_FAST = "fast"
+"""快速模式：只要出现假名、韩文或西里尔字母中的一种，即按文字判断语言"""
+DETECT_MODE_HYBRID = "hybrid"
+"""混合模式：整行只由一种语言的文字组成时按文字判断语言，其余交给模型"""
+DETECT_MODE_FULL = "full"
+"""完整模式：全部交给模型"""
+SCRIPT_CONFIDENCE = 0.99
+"""按文字判断语言时使用的置信度"""
+
+
+def _make_char_class(*ranges: tuple[str, str]) -> str:
+    """将 (起始字符, 结束字符) 范围列表转为正则字符类的内容"""
+    return "".join(f"{start}-{end}" for start, end in ranges)
+
+
+KANA_CHAR_CLASS = _make_char_class(
+    UnicodeRanges.HIRAGANA,
+    UnicodeRanges.KATAKANA,
+    UnicodeRanges.KATAKANA_HALF_WIDTH,
+    UnicodeRanges.KATAKANA_PHONETIC_EXTENSIONS,
+)
+"""假名"""
+HANGUL_CHAR_CLASS = _make_char_class(
+    UnicodeRanges.HANGUL_JAMO,
+    UnicodeRanges.HANGUL_JAMO_EXTENDED_A,
+    UnicodeRanges.HANGUL_JAMO_EXTENDED_B,
+    UnicodeRanges.HANGUL_SYLLABLES,
+    UnicodeRanges.HANGUL_COMPATIBILITY_JAMO,
+)
+"""韩文字母"""
+RUSSIAN_CHAR_CLASS = _make_char_class(UnicodeRanges.CYRILLIC_BASIC) + "\u0401\u0451"
+"""俄文字母（含 Ёё）"""
+SCRIPT_PATTERNS = {
+    "ja": re.compile(f"[{KANA_CHAR_CLASS}]"),
+    "ko": re.compile(f"[{HANGUL_CHAR_CLASS}]"),
+    "ru": re.compile(f"[\u0400-\u04FF{_make_char_class(UnicodeRanges.CYRILLIC_SUPPLEMENT)}]"),
+}
+"""各语言独有的文字，出现即可确定语言"""
+SCRIPT_ONLY_PATTERNS = {
+    "ja": re.compile(f"[{TextProcessor.JAPANESE_CHAR_SET_CONTENT}{_make_char_class(UnicodeRanges.KATAKANA_PHONETIC_EXTENSIONS)}]+"),
+    "ko": re.compile(f"[{HANGUL_CHAR_CLASS}{_make_char_class(UnicodeRanges.CJK)}]+"),
+    "ru": re.compile(f"[{RUSSIAN_CHAR_CLASS}]+"),
+}
+"""整行只由该语言的文字组成（日文、韩文可含汉字）"""
+NON_LETTER_PATTERN = re.compile(r"[\W\d_]+")
+"""非字母字符"""
+
 VARIOUS_LETTERS_RANGE = r'a-zA-Z\uFF21-\uFF3A\uFF41-\uFF5A'
 """标准字母与全角字母的范围"""
 HAS_UNUSUAL_ENG_REGEX = re.compile(
@@ -130,6 +196,10 @@ def close_lang_detector():
         finally:
             # 无论如何都将实例设置为None，允许垃圾回收
             _LANG_DETECTOR_INSTANCE = None
+
+    # 同时释放检测结果缓存
+    _PREFILTER_CACHE.clear()
+    _DETECT_RESULT_CACHE.clear()
     return True
 
 
@@ -196,84 +266,209 @@ def detect_language_with_mediapipe(items: list[CacheItem], _start_index: int, _f
     Returns:
         list[tuple]: 每项对应的(语言代码, 置信度)列表
     """
-    # 初始化结果列表
-    results = []
+    return detect_languages([item.source_text for item in items])
 
-    # 获取语言检测器（只获取一次以提高效率）
-    detector = get_lang_detector()
 
-    for item in items:
-        # 获取原文并清理
-        source_text = item.source_text
+# 批量检测文本语言
+def detect_languages(source_texts: list[str], max_workers: int = 1, on_progress: Callable[[int], None] | None = None,
+                     mode: str = DETECT_MODE_FULL) -> list[tuple[list[str], float, float]]:
+    """批量检测语言，完整模式下结果与逐行调用模型一致
+
+    先对每个不同的原文做一次预筛选（空文本、只含符号、特殊英文），
+    再对清理后相同的文本去重并查询结果缓存，非完整模式下按文字判断能够确定语言的文本，
+    剩余的文本分批送入模型，数量较多时分发到多个进程，每个进程持有各自的检测器。
+
+    Args:
+        source_texts: 原文列表
+        max_workers: 模型检测使用的进程数，为 1 时在当前进程中检测
+        on_progress: 进度回调，参数为本次完成的行数
+        mode: 检测模式，fast / hybrid / full
+
+    Returns:
+        list[tuple]: 每行对应的(语言代码列表, 调整后置信度, 原始置信度)列表
+    """
+    results: list[tuple[list[str], float, float] | None] = [None] * len(source_texts)
+    pending: dict[str, list[int]] = defaultdict(list)
+    prefiltered_count = 0
+
+    for i, source_text in enumerate(source_texts):
         # 20250518 fix: 修复行不为字符串时的异常
         if source_text is None or not isinstance(source_text, str) or not source_text.strip():
-            results.append((['no_text'], -1.0, -1.0))
+            results[i] = (['no_text'], -1.0, -1.0)
+            prefiltered_count += 1
             continue
 
-        # 检测是否匹配目标正则
-        if HAS_UNUSUAL_ENG_REGEX.match(source_text.strip()):
-            results.append((['un'], -1.0, -1.0))
-            continue
+        prefiltered = _PREFILTER_CACHE.get(source_text)
+        if prefiltered is None:
+            prefiltered = prefilter_detect_text(source_text)
+            _put_detect_cache(_PREFILTER_CACHE, source_text, prefiltered)
+
+        result, detect_text = prefiltered
+        if result is not None:
+            results[i] = result
+            prefiltered_count += 1
+        elif detect_text in _DETECT_RESULT_CACHE:
+            results[i] = _DETECT_RESULT_CACHE[detect_text]
+        else:
+            pending[detect_text].append(i)
+
+    _DETECT_STATS["lines"] += len(source_texts)
+    _DETECT_STATS["prefiltered"] += prefiltered_count
+    _DETECT_STATS["deduplicated"] += len(source_texts) - prefiltered_count - len(pending)
+
+    # 按文字判断语言，只有拉丁字母或只有汉字等无法确定的文本才交给模型
+    if mode != DETECT_MODE_FULL:
+        for detect_text in list(pending):
+            result = detect_language_by_script(detect_text, mode)
+            if result is not None:
+                for i in pending.pop(detect_text):
+                    results[i] = result
+                _DETECT_STATS["script_texts"] += 1
+
+    _DETECT_STATS["model_texts"] += len(pending)
+
+    if on_progress is not None:
+        on_progress(len(source_texts) - sum(len(v) for v in pending.values()))
+
+    # 模型检测并回填结果
+    for detect_texts, detect_results in _iter_model_detections(list(pending), max_workers):
+        advance = 0
+        for detect_text, result in zip(detect_texts, detect_results):
+            _put_detect_cache(_DETECT_RESULT_CACHE, detect_text, result)
+            for i in pending[detect_text]:
+                results[i] = result
+            advance += len(pending[detect_text])
+
+        if on_progress is not None:
+            on_progress(advance)
 
-        cleaned_text = clean_text(source_text)
+    return results
 
-        # 检查是否只包含符号
-        if is_symbols_only(cleaned_text):
-            results.append((['symbols_only'], -1.0, -1.0))
-            continue
 
-        # 使用mediapipe的语言检测任务
-        no_symbols_text = remove_symbols(cleaned_text)
-        if not no_symbols_text:
-            results.append((['no_text'], -1.0, -1.0))
-            continue
+# 预筛选，返回(无需模型的检测结果, 送入模型的文本)，其中一项为 None
+def prefilter_detect_text(source_text: str) -> tuple[tuple[list[str], float, float] | None, str | None]:
+    # 检测是否匹配目标正则
+    if HAS_UNUSUAL_ENG_REGEX.match(source_text.strip()):
+        return (['un'], -1.0, -1.0), None
 
-        # 再次检查是否仅包含符号
-        if is_symbols_only(no_symbols_text):
-            results.append((['symbols_only_again'], -1.0, -1.0))
-            continue
+    cleaned_text = clean_text(source_text)
 
-        # 再次检测是否匹配目标正则
-        if HAS_UNUSUAL_ENG_REGEX.match(no_symbols_text):
-            results.append((['un_again'], -1.0, -1.0))
-            continue
+    # 检查是否只包含符号
+    if is_symbols_only(cleaned_text):
+        return (['symbols_only'], -1.0, -1.0), None
 
-        lang_result = detector.detect(no_symbols_text).detections
-        if not lang_result:
-            results.append((['un'], -1.0, -1.0))
-        else:
-            raw_prob = lang_result[0].probability
-            first_prob = raw_prob
-            mediapipe_langs = [detection.language_code for detection in lang_result]
-
-            # 判断识别后的语言是否有非西文语言
-            has_non_latin = bool(set(mediapipe_langs) & set(NON_LATIN_ISO_CODES))
-            if has_non_latin:
-                # 如果有非西文语言出现，去掉所有的英文字母与一些符号后再识别
-                non_latin_text = re.sub(fr"[{VARIOUS_LETTERS_RANGE}'-]+", ' ', no_symbols_text)
-                # 去除多余空格
-                non_latin_text = re.sub(r'\s+', ' ', non_latin_text).strip()
-                # 判断是否为空字符串，非空串才重新识别
-                if non_latin_text:
-                    # 进行重新识别
-                    non_latin_lang_result = detector.detect(non_latin_text).detections
-                    # 如果有识别结果才重置结果
-                    if non_latin_lang_result:
-                        # 重置lang_result
-                        lang_result = non_latin_lang_result
-                        # 重置三个变量
-                        raw_prob = lang_result[0].probability
-                        first_prob = raw_prob
-                        mediapipe_langs = [detection.language_code for detection in lang_result]
-
-            # 如果有至少两个识别结果，则使用最高置信度减去第二个
-            if len(lang_result) >= 2:
-                # 最终的mediapipe置信度
-                first_prob -= lang_result[1].probability
-
-            results.append((mediapipe_langs, first_prob, raw_prob))
+    # 使用mediapipe的语言检测任务
+    no_symbols_text = remove_symbols(cleaned_text)
+    if not no_symbols_text:
+        return (['no_text'], -1.0, -1.0), None
 
-    return results
+    # 再次检查是否仅包含符号
+    if is_symbols_only(no_symbols_text):
+        return (['symbols_only_again'], -1.0, -1.0), None
+
+    # 再次检测是否匹配目标正则
+    if HAS_UNUSUAL_ENG_REGEX.match(no_symbols_text):
+        return (['un_again'], -1.0, -1.0), None
+
+    return None, no_symbols_text
+
+
+# 按文字判断语言，无法确定时返回 None
+def detect_language_by_script(text: str, mode: str) -> tuple[list[str], float, float] | None:
+    # 只出现一种语言独有的文字时才能确定
+    found = [lang for lang, pattern in SCRIPT_PATTERNS.items() if pattern.search(text)]
+    if len(found) != 1:
+        return None
+
+    # 混合模式下整行不能包含其他文字，例如夹杂英文的日文、乌克兰文等
+    lang = found[0]
+    if mode == DETECT_MODE_HYBRID and not SCRIPT_ONLY_PATTERNS[lang].fullmatch(NON_LETTER_PATTERN.sub("", text)):
+        return None
+
+    return ([lang], SCRIPT_CONFIDENCE, SCRIPT_CONFIDENCE)
+
+
+# 使用模型检测一批预筛选后的文本，多进程检测时在子进程中调用
+def detect_prefiltered_texts(texts: list[str]) -> list[tuple[list[str], float, float]]:
+    # 获取语言检测器（只获取一次以提高效率）
+    detector = get_lang_detector()
+    return [detect_prefiltered_text(detector, text) for text in texts]
+
+
+# 使用模型检测单条预筛选后的文本
+def detect_prefiltered_text(detector: LanguageDetector, no_symbols_text: str) -> tuple[list[str], float, float]:
+    lang_result = detector.detect(no_symbols_text).detections
+    if not lang_result:
+        return (['un'], -1.0, -1.0)
+
+    raw_prob = lang_result[0].probability
+    first_prob = raw_prob
+    mediapipe_langs = [detection.language_code for detection in lang_result]
+
+    # 判断识别后的语言是否有非西文语言
+    has_non_latin = bool(set(mediapipe_langs) & set(NON_LATIN_ISO_CODES))
+    if has_non_latin:
+        # 如果有非西文语言出现，去掉所有的英文字母与一些符号后再识别
+        non_latin_text = re.sub(fr"[{VARIOUS_LETTERS_RANGE}'-]+", ' ', no_symbols_text)
+        # 去除多余空格
+        non_latin_text = re.sub(r'\s+', ' ', non_latin_text).strip()
+        # 判断是否为空字符串，非空串才重新识别
+        if non_latin_text:
+            # 进行重新识别
+            non_latin_lang_result = detector.detect(non_latin_text).detections
+            # 如果有识别结果才重置结果
+            if non_latin_lang_result:
+                # 重置lang_result
+                lang_result = non_latin_lang_result
+                # 重置三个变量
+                raw_prob = lang_result[0].probability
+                first_prob = raw_prob
+                mediapipe_langs = [detection.language_code for detection in lang_result]
+
+    # 如果有至少两个识别结果，则使用最高置信度减去第二个
+    if len(lang_result) >= 2:
+        # 最终的mediapipe置信度
+        first_prob -= lang_result[1].probability
+
+    return (mediapipe_langs, first_prob, raw_prob)
+
+
+# 分批进行模型检测，按完成顺序逐批返回(文本列表, 结果列表)
+def _iter_model_detections(texts: list[str], max_workers: int):
+    chunks = [texts[i : i + DETECT_CHUNK_SIZE] for i in range(0, len(texts), DETECT_CHUNK_SIZE)]
+
+    if max_workers <= 1 or len(texts) < DETECT_PARALLEL_MIN_TEXTS:
+        for chunk in chunks:
+            yield chunk, detect_prefiltered_texts(chunk)
+        return
+
+    # 统一使用 spawn 方式创建子进程，避免在多线程的界面进程中 fork
+    with ProcessPoolExecutor(max_workers=min(max_workers, len(chunks)), mp_context=multiprocessing.get_context("spawn")) as executor:
+        futures = {executor.submit(detect_prefiltered_texts, chunk): chunk for chunk in chunks}
+        for future in as_completed(futures):
+            yield futures[future], future.result()
+
+
+# 写入检测缓存，超出上限时清空
+def _put_detect_cache(cache: dict, key: str, value) -> None:
+    if len(cache) >= DETECT_CACHE_MAX_SIZE:
+        cache.clear()
+    cache[key] = value
+
+
+# 获取语言检测统计
+def get_detect_stats() -> dict[str, int]:
+    return dict(_DETECT_STATS)
+
+
+# 合并其他进程的语言检测统计
+def merge_detect_stats(stats: dict[str, int]) -> None:
+    _DETECT_STATS.update(stats)
+
+
+# 重置语言检测统计
+def reset_detect_stats() -> None:
+    _DETECT_STATS.clear()
 
 
 # def detect_language_with_onnx(items: list[CacheItem], _start_index: int, _file_data: CacheFile) -> \
@@ -516,7 +711,12 @@ def remove_symbols(source_text):
 
 
 def make_final_detect_text(item: CacheItem):
-    no_symbols_text = remove_symbols(clean_text(item.source_text))
+    # 优先使用预筛选时已经清理过的文本
+    prefiltered = _PREFILTER_CACHE.get(item.source_text)
+    if prefiltered is not None and prefiltered[1] is not None:
+        no_symbols_text = prefiltered[1]
+    else:
+        no_symbols_text = remove_symbols(clean_text(item.source_text))
 
     langs = set([item.lang_code[0]] + item.lang_code[2])
     has_non_latin = bool(langs & set(NON_LATIN_ISO_CODES))
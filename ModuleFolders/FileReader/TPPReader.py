@@ -1,4 +1,5 @@
 from pathlib import Path
+from typing import Iterator
 
 import openpyxl  # 需安装库pip install openpyxl
 
@@ -6,13 +7,13 @@ from ModuleFolders.Cache.CacheFile import CacheFile
 from ModuleFolders.Cache.CacheItem import CacheItem, TranslationStatus
 from ModuleFolders.Cache.CacheProject import ProjectType
 from ModuleFolders.FileReader.BaseReader import (
-    BaseSourceReader,
     InputConfig,
-    PreReadMetadata
+    PreReadMetadata,
+    StreamSourceReader
 )
 
 
-class TPPReader(BaseSourceReader):
+class TPPReader(StreamSourceReader):
     def __init__(self, input_config: InputConfig):
         super().__init__(input_config)
 
@@ -24,30 +25,31 @@ class TPPReader(BaseSourceReader):
     def support_file(self):
         return "xlsx"
 
-    def on_read_source(self, file_path: Path, pre_read_metadata: PreReadMetadata) -> CacheFile:
-        wb = openpyxl.load_workbook(file_path)
-        sheet = wb.active
-        items = []
-        for row in range(2, sheet.max_row + 1):  # 从第二行开始读取，因为第一行是标识头，通常不用理会
-            cell_value1 = sheet.cell(row=row, column=1).value  # 第N行第一列的值
-            cell_value2 = sheet.cell(row=row, column=2).value  # 第N行第二列的值
-            source_text = str(cell_value1) if cell_value1 is not None else ""  # 获取原文
-
-            if cell_value1:
-                # 第1列的值不为空，和第2列的值为空，是未翻译内容
-                # 第1列的值不为空，和第2列的值不为空，是已经翻译内容
-                if cell_value2 is not None:
-                    translated_text = cell_value2
-                    translation_status = TranslationStatus.TRANSLATED
-                else:
-                    translated_text = ''
-                    translation_status = TranslationStatus.UNTRANSLATED
-
-                item = CacheItem(
-                    source_text=source_text,
-                    translated_text=translated_text,
-                    translation_status=translation_status,
-                    extra={"row_index": row},
-                )
-                items.append(item)
-        return CacheFile(items=items)
+    def iter_source_items(self, file_path: Path, pre_read_metadata: PreReadMetadata, file_data: CacheFile) -> Iterator[CacheItem]:
+        # 只读模式按行流式解析表格，不在内存中构建完整的单元格对象
+        wb = openpyxl.load_workbook(file_path, read_only=True)
+        try:
+            sheet = wb.active
+            # 从第二行开始读取，因为第一行是标识头，通常不用理会
+            for row, values in enumerate(sheet.iter_rows(min_row=2, max_col=2, values_only=True), start=2):
+                cell_value1, cell_value2 = (tuple(values) + (None, None))[:2]  # 第N行第一列、第二列的值
+                source_text = str(cell_value1) if cell_value1 is not None else ""  # 获取原文
+
+                if cell_value1:
+                    # 第1列的值不为空，和第2列的值为空，是未翻译内容
+                    # 第1列的值不为空，和第2列的值不为空，是已经翻译内容
+                    if cell_value2 is not None:
+                        translated_text = cell_value2
+                        translation_status = TranslationStatus.TRANSLATED
+                    else:
+                        translated_text = ''
+                        translation_status = TranslationStatus.UNTRANSLATED
+
+                    yield CacheItem(
+                        source_text=source_text,
+                        translated_text=translated_text,
+                        translation_status=translation_status,
+                        extra={"row_index": row},
+                    )
+        finally:
+            wb.close()
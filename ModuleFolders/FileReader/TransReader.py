@@ -1,6 +1,6 @@
-import json
 from pathlib import Path
 import re
+from typing import IO, Any, Iterator
 
 import rich
 
@@ -8,13 +8,14 @@ from ModuleFolders.Cache.CacheFile import CacheFile
 from ModuleFolders.Cache.CacheItem import CacheItem, TranslationStatus
 from ModuleFolders.Cache.CacheProject import ProjectType
 from ModuleFolders.FileReader.BaseReader import (
-    BaseSourceReader,
     InputConfig,
-    PreReadMetadata
+    PreReadMetadata,
+    StreamSourceReader
 )
+from ModuleFolders.FileReader.JsonStream import JsonStream
 
 
-class TransReader(BaseSourceReader):
+class TransReader(StreamSourceReader):
     def __init__(self, input_config: InputConfig):
         super().__init__(input_config)
 
@@ -26,105 +27,112 @@ class TransReader(BaseSourceReader):
     def support_file(self):
         return "trans"
 
-    def on_read_source(self, file_path: Path, pre_read_metadata: PreReadMetadata) -> CacheFile:
-
-        # 以json格式读取工程文件
-        trans_content = json.loads(file_path.read_text(encoding="utf-8"))
-
-        # 获取具体文本路径
-        files_data = trans_content["project"]["files"]
-        items = []
-        
-        # 遍历每个文件类别（例如："data/Actors.json"）
-        for file_category, category_data in files_data.items():
-
-            data_list = category_data.get("data", [])
-            tags_list = category_data.get("tags", [])  # 如果缺失，默认为空列表
-            context_list = category_data.get("context", [])  # 如果缺失，默认为空列表
-            parameters_list = category_data.get("parameters", [])  # 如果缺失，默认为空列表
-
-            # 遍历每对文本 [原文，翻译]
-            for idx, text_pair in enumerate(data_list):
-
-                # 类型检查
-                if not isinstance(text_pair, (list, tuple)):
-                    rich.print(
-                        f"[[red]WARNING[/]] 在文件 '{file_path}' 的类别 '{file_category}' 索引 {idx} 处发现非列表/元组项：{text_pair}，已跳过。")
-                    continue  # 跳过这个无效项
-
-                if len(text_pair) == 0:
-                    rich.print(
-                        f"[[red]WARNING[/]] 在文件 '{file_path}' 的类别 '{file_category}' 索引 {idx} 处发现空项：{text_pair}，已跳过。")
-                    continue  # 跳过这个空项
-
-                # 初始翻译状态
-                translation_status = TranslationStatus.UNTRANSLATED
-
-
-
-                # 检查翻译状态，过滤已翻译内容
-                translated_text = ""
-                if len(text_pair) >= 2: # 获取译文内容，并且防止列表越界，有些trans文件没有译文位置
-                    translated_text = text_pair[1]
-
-                    if translated_text:
-                        translation_status = TranslationStatus.TRANSLATED
-
-
-                # 获取原文内容
-                source_text = text_pair[0]
-
-                # 获取该原文的对应标签
-                tags = None
-                if idx < len(tags_list):
-                    tags = tags_list[idx]  # 可能为 null 或类似 "red" 的列表
-
-                # 获取文本的地址来源
-                contexts = None
-                if idx < len(context_list):
-                    contexts = context_list[idx]  # 可能为null或者是列表
-
-                # 获取该原文的对应人名
-                parameters = None
-                rowInfoText = None
-                if idx < len(parameters_list):
-                    parameters = parameters_list[idx]
-                    if parameters and len(parameters) > 0 and isinstance(parameters[0], dict):  # 有些人名信息并没有以字典存储
-                        rowInfoText = parameters[0].get("rowInfoText", "")  # 可能为 具体人名 或类似 "\\v[263]" 的字符串
-
-                # 过滤不需要翻译的文本，放在这里进行处理是因为contexts太大了，后面解决性能消耗后，转移到其他地方
-                if isinstance(source_text, str) and self.filter_trans_text( source_text, tags, contexts) :
-                    translation_status = TranslationStatus.EXCLUDED  # 改变为不需要翻译
-
-                    # 添加处理过的标签注释
-                    if tags is None:
-                        tags = ["indigo"]
-                    else:
-                        tags.append("indigo")
-
-                # 额外属性
-                extra = {
-                    "tags": tags,
-                    "file_category": file_category,
-                    "data_index": idx,
-                }
-                # 基本属性
-                item = CacheItem(
-                    source_text=source_text,
-                    translated_text=translated_text,
-                    translation_status=translation_status,
-                    extra=extra
-                )
-
-                # 如果有人名，则对原文本进行二次处理
-                if rowInfoText:
-                    item.source_text = self.combine_srt(rowInfoText, source_text)
-                    item.set_extra("name", rowInfoText)
-
-                # 添加进缓存条目
-                items.append(item)
-
-        return CacheFile(items=items)
+    def iter_source_items(self, file_path: Path, pre_read_metadata: PreReadMetadata, file_data: CacheFile) -> Iterator[CacheItem]:
+        with open(file_path, "r", encoding="utf-8") as file:
+            # 遍历每个文件类别（例如："data/Actors.json"）
+            for file_category, category_data in self.iter_files_data(file):
+
+                data_list = category_data.get("data", [])
+                tags_list = category_data.get("tags", [])  # 如果缺失，默认为空列表
+                context_list = category_data.get("context", [])  # 如果缺失，默认为空列表
+                parameters_list = category_data.get("parameters", [])  # 如果缺失，默认为空列表
+
+                # 遍历每对文本 [原文，翻译]
+                for idx, text_pair in enumerate(data_list):
+
+                    # 类型检查
+                    if not isinstance(text_pair, (list, tuple)):
+                        rich.print(
+                            f"[[red]WARNING[/]] 在文件 '{file_path}' 的类别 '{file_category}' 索引 {idx} 处发现非列表/元组项：{text_pair}，已跳过。")
+                        continue  # 跳过这个无效项
+
+                    if len(text_pair) == 0:
+                        rich.print(
+                            f"[[red]WARNING[/]] 在文件 '{file_path}' 的类别 '{file_category}' 索引 {idx} 处发现空项：{text_pair}，已跳过。")
+                        continue  # 跳过这个空项
+
+                    # 初始翻译状态
+                    translation_status = TranslationStatus.UNTRANSLATED
+
+
+
+                    # 检查翻译状态，过滤已翻译内容
+                    translated_text = ""
+                    if len(text_pair) >= 2: # 获取译文内容，并且防止列表越界，有些trans文件没有译文位置
+                        translated_text = text_pair[1]
+
+                        if translated_text:
+                            translation_status = TranslationStatus.TRANSLATED
+
+
+                    # 获取原文内容
+                    source_text = text_pair[0]
+
+                    # 获取该原文的对应标签
+                    tags = None
+                    if idx < len(tags_list):
+                        tags = tags_list[idx]  # 可能为 null 或类似 "red" 的列表
+
+                    # 获取文本的地址来源
+                    contexts = None
+                    if idx < len(context_list):
+                        contexts = context_list[idx]  # 可能为null或者是列表
+
+                    # 获取该原文的对应人名
+                    parameters = None
+                    rowInfoText = None
+                    if idx < len(parameters_list):
+                        parameters = parameters_list[idx]
+                        if parameters and len(parameters) > 0 and isinstance(parameters[0], dict):  # 有些人名信息并没有以字典存储
+                            rowInfoText = parameters[0].get("rowInfoText", "")  # 可能为 具体人名 或类似 "\\v[263]" 的字符串
+
+                    # 过滤不需要翻译的文本，放在这里进行处理是因为contexts太大了，后面解决性能消耗后，转移到其他地方
+                    if isinstance(source_text, str) and self.filter_trans_text( source_text, tags, contexts) :
+                        translation_status = TranslationStatus.EXCLUDED  # 改变为不需要翻译
+
+                        # 添加处理过的标签注释
+                        if tags is None:
+                            tags = ["indigo"]
+                        else:
+                            tags.append("indigo")
+
+                    # 额外属性
+                    extra = {
+                        "tags": tags,
+                        "file_category": file_category,
+                        "data_index": idx,
+                    }
+                    # 基本属性
+                    item = CacheItem(
+                        source_text=source_text,
+                        translated_text=translated_text,
+                        translation_status=translation_status,
+                        extra=extra
+                    )
+
+                    # 如果有人名，则对原文本进行二次处理
+                    if rowInfoText:
+                        item.source_text = self.combine_srt(rowInfoText, source_text)
+                        item.set_extra("name", rowInfoText)
+
+                    # 添加进缓存条目
+                    yield item
+
+    # 流式读取工程文件中的 project.files，每次只解析一个文件类别
+    def iter_files_data(self, file: IO[str]) -> Iterator[tuple[str, Any]]:
+        stream = JsonStream(file)
+        for key in stream.iter_object():
+            if key != "project":
+                stream.read_value()
+                continue
+            for project_key in stream.iter_object():
+                if project_key != "files":
+                    stream.read_value()
+                    continue
+                yield from stream.iter_object_items()
+                return
+            raise KeyError("files")
+        raise KeyError("project")
 
     # 人名信息添加
     def combine_srt(self, name, text):
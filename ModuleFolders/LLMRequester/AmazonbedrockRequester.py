@@ -6,7 +6,7 @@ from ModuleFolders.LLMRequester.LLMClientFactory import LLMClientFactory
 # 接口请求器
 class AmazonbedrockRequester(Base):
     def __init__(self) -> None:
-        pass
+        self.last_exception = None # 最近一次请求的异常，用于维护密钥的健康状态
 
     # 发起请求
     def request_amazonbedrock(self, messages, system_prompt, platform_config) -> tuple[bool, str, str, int, int]:
@@ -86,6 +86,7 @@ class AmazonbedrockRequester(Base):
             # 提取回复的文本内容
             response_content = response["output"]["message"]["content"][0]["text"]
         except Exception as e:
+            self.last_exception = e
             self.error(f"请求任务错误 ... {e}", e if self.is_debug() else None)
             return True, None, None, None, None
 
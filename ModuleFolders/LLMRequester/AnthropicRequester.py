@@ -10,37 +10,37 @@ def is_claude3_model(model_name):
 # 接口请求器
 class AnthropicRequester(Base):
     def __init__(self) -> None:
-        pass
+        self.last_exception = None # 最近一次请求的异常，用于维护密钥的健康状态
 
     # 发起请求
     def request_anthropic(self, messages, system_prompt, platform_config) -> tuple[bool, str, str, int, int]:
         try:
-            model_name = platform_config.get("model_name")
-            request_timeout = platform_config.get("request_timeout", 60)
-            temperature = platform_config.get("temperature", 1.0)
-            top_p = platform_config.get("top_p", 1.0)
-            think_switch = platform_config.get("think_switch")
-            think_depth = platform_config.get("think_depth")
+            # 从工厂获取客户端
+            client = LLMClientFactory().get_anthropic_client(platform_config)
 
+            # 发送请求
+            response = client.messages.create(**self.build_params(messages, system_prompt, platform_config))
 
 
-            # 参数基础配置
-            base_params = {
-                "model": model_name,
-                "system": system_prompt,
-                "messages": messages,
-                "temperature": temperature,
-                "top_p": top_p,
-                "timeout": request_timeout,
-                "max_tokens": 4096 if is_claude3_model(model_name) else 20000
-            }
+            # 提取回复的文本内容
+            response_think = ""
+            response_content = response.content[0].text
 
+        except Exception as e:
+            self.last_exception = e
+            self.error(f"请求任务错误 ... {e}", e if self.is_debug() else None)
+            return True, None, None, None, None
 
-            # 从工厂获取客户端
-            client = LLMClientFactory().get_anthropic_client(platform_config)
+        return (False, response_think, response_content, *self.extract_usage(response))
+
+    # 发起异步请求
+    async def request_anthropic_async(self, messages, system_prompt, platform_config) -> tuple[bool, str, str, int, int]:
+        try:
+            # 从工厂获取异步客户端
+            client = LLMClientFactory().get_async_anthropic_client(platform_config)
 
             # 发送请求
-            response = client.messages.create(**base_params)
+            response = await client.messages.create(**self.build_params(messages, system_prompt, platform_config))
 
 
             # 提取回复的文本内容
@@ -48,9 +48,100 @@ class AnthropicRequester(Base):
             response_content = response.content[0].text
 
         except Exception as e:
+            self.last_exception = e
+            self.error(f"请求任务错误 ... {e}", e if self.is_debug() else None)
+            return True, None, None, None, None
+
+        return (False, response_think, response_content, *self.extract_usage(response))
+
+    # 发起流式请求，逐段交给流式回复检查器，检查不通过时关闭连接
+    def request_anthropic_stream(self, messages, system_prompt, platform_config, stream_checker) -> tuple[bool, str, str, int, int]:
+        try:
+            # 从工厂获取客户端
+            client = LLMClientFactory().get_anthropic_client(platform_config)
+
+            # 发送请求
+            stream_checker.start()
+            response = client.messages.create(**self.build_params(messages, system_prompt, platform_config), stream = True)
+
+            # 逐段接收回复内容
+            usage = [0, 0]
+            for event in response:
+                if not self.feed_event(stream_checker, event, usage):
+                    response.close()
+                    break
+
+            # 提取回复的文本内容
+            response_think, response_content = stream_checker.get_result()
+
+        except Exception as e:
+            self.last_exception = e
+            self.error(f"请求任务错误 ... {e}", e if self.is_debug() else None)
+            return True, None, None, None, None
+
+        return False, response_think, response_content, usage[0], usage[1] or stream_checker.aborted_tokens
+
+    # 发起异步流式请求
+    async def request_anthropic_stream_async(self, messages, system_prompt, platform_config, stream_checker) -> tuple[bool, str, str, int, int]:
+        try:
+            # 从工厂获取异步客户端
+            client = LLMClientFactory().get_async_anthropic_client(platform_config)
+
+            # 发送请求
+            stream_checker.start()
+            response = await client.messages.create(**self.build_params(messages, system_prompt, platform_config), stream = True)
+
+            # 逐段接收回复内容
+            usage = [0, 0]
+            async for event in response:
+                if not self.feed_event(stream_checker, event, usage):
+                    await response.close()
+                    break
+
+            # 提取回复的文本内容
+            response_think, response_content = stream_checker.get_result()
+
+        except Exception as e:
+            self.last_exception = e
             self.error(f"请求任务错误 ... {e}", e if self.is_debug() else None)
             return True, None, None, None, None
 
+        return False, response_think, response_content, usage[0], usage[1] or stream_checker.aborted_tokens
+
+    # 处理一个流式事件，记录 Token 消耗到 usage 中，返回 False 表示应中止请求
+    def feed_event(self, stream_checker, event, usage: list[int]) -> bool:
+        if event.type == "message_start":
+            usage[0] = getattr(event.message.usage, "input_tokens", 0) or 0
+        elif event.type == "message_delta":
+            usage[1] = getattr(event.usage, "output_tokens", 0) or 0
+        elif event.type == "content_block_delta":
+            if event.delta.type == "text_delta":
+                return stream_checker.feed(event.delta.text)
+            elif event.delta.type == "thinking_delta":
+                return stream_checker.feed(event.delta.thinking, think = True)
+
+        return True
+
+    # 构建请求参数
+    def build_params(self, messages, system_prompt, platform_config) -> dict:
+        model_name = platform_config.get("model_name")
+        request_timeout = platform_config.get("request_timeout", 60)
+        temperature = platform_config.get("temperature", 1.0)
+        top_p = platform_config.get("top_p", 1.0)
+
+        # 参数基础配置
+        return {
+            "model": model_name,
+            "system": system_prompt,
+            "messages": messages,
+            "temperature": temperature,
+            "top_p": top_p,
+            "timeout": request_timeout,
+            "max_tokens": 4096 if is_claude3_model(model_name) else 20000
+        }
+
+    # 提取 Token 消耗
+    def extract_usage(self, response) -> tuple[int, int]:
         # 获取指令消耗
         try:
             prompt_tokens = int(response.usage.prompt_tokens)
@@ -63,4 +154,4 @@ class AnthropicRequester(Base):
         except Exception:
             completion_tokens = 0
 
-        return False, response_think, response_content, prompt_tokens, completion_tokens
+        return prompt_tokens, completion_tokens
@@ -5,7 +5,7 @@ from ModuleFolders.LLMRequester.LLMClientFactory import LLMClientFactory
 # 因为各家思考模式的开关设置不同.............................
 class DashscopeRequester(Base):
     def __init__(self) -> None:
-        pass
+        self.last_exception = None # 最近一次请求的异常，用于维护密钥的健康状态
 
     # 发起请求
     def request_openai(self, messages, system_prompt, platform_config) -> tuple[bool, str, str, int, int]:
@@ -88,6 +88,7 @@ class DashscopeRequester(Base):
                 response_content = message.content
 
         except Exception as e:
+            self.last_exception = e
             self.error(f"请求任务错误 ... {e}", e if self.is_debug() else None)
             return True, None, None, None, None
 
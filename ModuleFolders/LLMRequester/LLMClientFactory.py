@@ -2,7 +2,7 @@
 import threading
 from typing import Dict, Any
 import httpx
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 import anthropic
 import boto3
 import cohere
@@ -41,6 +41,29 @@ def create_httpx_client(
     )
 
 
+def create_async_httpx_client(
+        http2=True,
+        max_connections=2048,
+        max_keepalive_connections=512,
+        keepalive_expiry=30,
+        **kwargs
+):
+    """
+    创建配置好的异步HTTP客户端，供异步请求引擎使用
+
+    异步客户端的连接池与创建它时所在的事件循环绑定，只能在同一个事件循环中使用
+    """
+    return httpx.AsyncClient(
+        http2=http2,
+        limits=httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_keepalive_connections,
+            keepalive_expiry=keepalive_expiry
+        ),
+        **kwargs
+    )
+
+
 class LLMClientFactory:
     """LLM客户端工厂 - 集中管理和缓存不同类型的LLM客户端"""
 
@@ -91,6 +114,20 @@ class LLMClientFactory:
         key = ("anthropic", api_url, api_key)
         return self._get_cached_client(key, lambda: self._create_anthropic_client(config))
 
+    def get_async_openai_client(self, config: Dict[str, Any]) -> AsyncOpenAI:
+        """获取异步OpenAI客户端"""
+        api_key = config.get("api_key")
+        api_url = config.get("api_url")
+        key = ("openai_async", api_url, api_key)
+        return self._get_cached_client(key, lambda: self._create_async_openai_client(config, api_key))
+
+    def get_async_anthropic_client(self, config: Dict[str, Any]) -> anthropic.AsyncAnthropic:
+        """获取异步Anthropic客户端"""
+        api_key = config.get("api_key")
+        api_url = config.get("api_url")
+        key = ("anthropic_async", api_url, api_key)
+        return self._get_cached_client(key, lambda: self._create_async_anthropic_client(config))
+
     def get_anthropic_bedrock(self, config: Dict[str, Any]) -> anthropic.AnthropicBedrock:
         """获取AnthropicBedrock客户端"""
         region = config.get("region")
@@ -162,6 +199,20 @@ class LLMClientFactory:
             http_client=create_httpx_client()
         )
 
+    def _create_async_openai_client(self, config, api_key):
+        return AsyncOpenAI(
+            base_url=config.get("api_url"),
+            api_key=api_key,
+            http_client=create_async_httpx_client()
+        )
+
+    def _create_async_anthropic_client(self, config):
+        return anthropic.AsyncAnthropic(
+            base_url=config.get("api_url"),
+            api_key=config.get("api_key"),
+            http_client=create_async_httpx_client()
+        )
+
     def _create_anthropic_bedrock(self, config):
         return anthropic.AnthropicBedrock(
             aws_region=config.get("region"),
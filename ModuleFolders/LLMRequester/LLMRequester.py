@@ -1,3 +1,5 @@
+import asyncio
+
 from ModuleFolders.LLMRequester.SakuraRequester import SakuraRequester
 from ModuleFolders.LLMRequester.LocalLLMRequester import LocalLLMRequester
 from ModuleFolders.LLMRequester.CohereRequester import CohereRequester
@@ -7,64 +9,77 @@ from ModuleFolders.LLMRequester.AmazonbedrockRequester import AmazonbedrockReque
 from ModuleFolders.LLMRequester.AmazonTranslateRequester import AmazonTranslateRequester
 from ModuleFolders.LLMRequester.OpenaiRequester import OpenaiRequester
 from ModuleFolders.LLMRequester.DashscopeRequester import DashscopeRequester
+from ModuleFolders.ResponseChecker.StreamChecker import StreamChecker
 
 # 接口请求器
 class LLMRequester():
     def __init__(self) -> None:
-        pass
+        self.last_exception = None # 最近一次请求的异常，用于维护密钥的健康状态
 
-    # 分发请求
-    def sent_request(self, messages: list[dict], system_prompt: str, platform_config: dict) -> tuple[bool, str, str, int, int]:
+    # 分发请求，传入流式回复检查器时，支持流式请求的接口边接收边检查
+    def sent_request(self, messages: list[dict], system_prompt: str, platform_config: dict, stream_checker: StreamChecker = None) -> tuple[bool, str, str, int, int]:
         # 获取平台参数
         target_platform = platform_config.get("target_platform")
         api_format = platform_config.get("api_format")
 
+        # 发起流式请求
+        if stream_checker is not None and self.is_stream_supported(target_platform, api_format):
+            if target_platform == "anthropic" or api_format == "Anthropic":
+                requester = AnthropicRequester()
+                result = requester.request_anthropic_stream(messages, system_prompt, platform_config, stream_checker)
+            else:
+                requester = OpenaiRequester()
+                result = requester.request_openai_stream(messages, system_prompt, platform_config, stream_checker)
+
+            self.last_exception = requester.last_exception
+            return result
+
         # 发起请求
         if target_platform == "sakura":
-            sakura_requester = SakuraRequester()
-            skip, response_think, response_content, prompt_tokens, completion_tokens = sakura_requester.request_sakura(
+            requester = SakuraRequester()
+            skip, response_think, response_content, prompt_tokens, completion_tokens = requester.request_sakura(
                 messages,
                 system_prompt,
                 platform_config,
             )
         elif target_platform == "LocalLLM":
-            local_llm_requester = LocalLLMRequester()
-            skip, response_think, response_content, prompt_tokens, completion_tokens = local_llm_requester.request_LocalLLM(
+            requester = LocalLLMRequester()
+            skip, response_think, response_content, prompt_tokens, completion_tokens = requester.request_LocalLLM(
                 messages,
                 system_prompt,
                 platform_config,
             )
         elif target_platform == "cohere":
-            cohere_requester = CohereRequester()
-            skip, response_think, response_content, prompt_tokens, completion_tokens = cohere_requester.request_cohere(
+            requester = CohereRequester()
+            skip, response_think, response_content, prompt_tokens, completion_tokens = requester.request_cohere(
                 messages,
                 system_prompt,
                 platform_config,
             )
         elif target_platform == "google" or (target_platform and target_platform.startswith("custom_platform_") and api_format == "Google"):
-            google_requester = GoogleRequester()
-            skip, response_think, response_content, prompt_tokens, completion_tokens = google_requester.request_google(
+            requester = GoogleRequester()
+            skip, response_think, response_content, prompt_tokens, completion_tokens = requester.request_google(
                 messages,
                 system_prompt,
                 platform_config,
             )
         elif target_platform == "anthropic" or (target_platform and target_platform.startswith("custom_platform_") and api_format == "Anthropic"):
-            anthropic_requester = AnthropicRequester()
-            skip, response_think, response_content, prompt_tokens, completion_tokens = anthropic_requester.request_anthropic(
+            requester = AnthropicRequester()
+            skip, response_think, response_content, prompt_tokens, completion_tokens = requester.request_anthropic(
                 messages,
                 system_prompt,
                 platform_config,
             )
         elif target_platform == "amazonbedrock":
-            amazonbedrock_requester = AmazonbedrockRequester()
-            skip, response_think, response_content, prompt_tokens, completion_tokens = amazonbedrock_requester.request_amazonbedrock(
+            requester = AmazonbedrockRequester()
+            skip, response_think, response_content, prompt_tokens, completion_tokens = requester.request_amazonbedrock(
                 messages,
                 system_prompt,
                 platform_config,
             )
         elif target_platform == "amazontranslate":
-            amazon_translate_requester = AmazonTranslateRequester()
-            skip, response_think, response_content, prompt_tokens, completion_tokens = amazon_translate_requester.request_amazon_translate(
+            requester = AmazonTranslateRequester()
+            skip, response_think, response_content, prompt_tokens, completion_tokens = requester.request_amazon_translate(
                 messages,
                 system_prompt,
                 platform_config,
@@ -79,18 +94,59 @@ class LLMRequester():
             if completion_tokens is None:
                 completion_tokens = 0
         elif target_platform == "dashscope":
-            dashscope_requester = DashscopeRequester()
-            skip, response_think, response_content, prompt_tokens, completion_tokens = dashscope_requester.request_openai(
+            requester = DashscopeRequester()
+            skip, response_think, response_content, prompt_tokens, completion_tokens = requester.request_openai(
                 messages,
                 system_prompt,
                 platform_config,
             )
         else:
-            openai_requester = OpenaiRequester()
-            skip, response_think, response_content, prompt_tokens, completion_tokens = openai_requester.request_openai(
+            requester = OpenaiRequester()
+            skip, response_think, response_content, prompt_tokens, completion_tokens = requester.request_openai(
                 messages,
                 system_prompt,
                 platform_config,
             )
 
+        self.last_exception = getattr(requester, "last_exception", None)
         return skip, response_think, response_content, prompt_tokens, completion_tokens
+
+    # 分发异步请求
+    async def sent_request_async(self, messages: list[dict], system_prompt: str, platform_config: dict, stream_checker: StreamChecker = None) -> tuple[bool, str, str, int, int]:
+        # 获取平台参数
+        target_platform = platform_config.get("target_platform")
+        api_format = platform_config.get("api_format")
+
+        # 具备异步客户端的接口直接在事件循环中发起请求
+        if stream_checker is not None and self.is_stream_supported(target_platform, api_format):
+            if target_platform == "anthropic" or api_format == "Anthropic":
+                requester = AnthropicRequester()
+                result = await requester.request_anthropic_stream_async(messages, system_prompt, platform_config, stream_checker)
+            else:
+                requester = OpenaiRequester()
+                result = await requester.request_openai_stream_async(messages, system_prompt, platform_config, stream_checker)
+        elif target_platform == "google" or (target_platform and target_platform.startswith("custom_platform_") and api_format == "Google"):
+            requester = GoogleRequester()
+            result = await requester.request_google_async(messages, system_prompt, platform_config)
+        elif target_platform == "anthropic" or (target_platform and target_platform.startswith("custom_platform_") and api_format == "Anthropic"):
+            requester = AnthropicRequester()
+            result = await requester.request_anthropic_async(messages, system_prompt, platform_config)
+        elif target_platform not in ("sakura", "LocalLLM", "cohere", "amazonbedrock", "amazontranslate", "dashscope"):
+            requester = OpenaiRequester()
+            result = await requester.request_openai_async(messages, system_prompt, platform_config)
+
+        # 其余接口放到线程中执行同步请求
+        else:
+            return await asyncio.to_thread(self.sent_request, messages, system_prompt, platform_config, stream_checker)
+
+        self.last_exception = requester.last_exception
+        return result
+
+    # 是否支持流式请求，目前支持 OpenAI 与 Anthropic 格式的在线接口
+    def is_stream_supported(self, target_platform: str, api_format: str) -> bool:
+        if target_platform in ("sakura", "LocalLLM", "cohere", "amazonbedrock", "amazontranslate", "dashscope", "google"):
+            return False
+        elif target_platform and target_platform.startswith("custom_platform_"):
+            return api_format in ("OpenAI", "Anthropic")
+        else:
+            return True
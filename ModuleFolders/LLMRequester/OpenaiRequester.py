@@ -1,108 +1,245 @@
+import threading
+
+from openai import BadRequestError, UnprocessableEntityError
+
 from Base.Base import Base
 from ModuleFolders.LLMRequester.LLMClientFactory import LLMClientFactory
 
 
 # 接口请求器
 class OpenaiRequester(Base):
+
+    # 不支持 stream_options 参数的接口地址，之后的流式请求不再携带该参数
+    STREAM_OPTIONS_UNSUPPORTED = set()
+    STREAM_OPTIONS_LOCK = threading.Lock()
+
     def __init__(self) -> None:
-        pass
+        self.last_exception = None # 最近一次请求的异常，用于维护密钥的健康状态
 
     # 发起请求
     def request_openai(self, messages, system_prompt, platform_config) -> tuple[bool, str, str, int, int]:
         try:
-            # 获取具体配置
-            model_name = platform_config.get("model_name")
-            request_timeout = platform_config.get("request_timeout", 60)
-            temperature = platform_config.get("temperature", 1.0)
-            top_p = platform_config.get("top_p", 1.0)
-            presence_penalty = platform_config.get("presence_penalty", 0)
-            frequency_penalty = platform_config.get("frequency_penalty", 0)
-            extra_body = platform_config.get("extra_body", "{}")
-            think_switch = platform_config.get("think_switch")
-            think_depth = platform_config.get("think_depth")
-
-            # 插入系统消息
-            if system_prompt:
-                messages.insert(
-                    0,
-                    {
-                        "role": "system",
-                        "content": system_prompt
-                    })
-
             # 从工厂获取客户端
             client = LLMClientFactory().get_openai_client(platform_config)
 
-            # 针对ds-r模型的特殊处理，因为该模型不支持模型预输入回复
-            if model_name in {"deepseek-reasoner", "deepseek-r1", "DeepSeek-R1"}:
-                # 检查一下最后的消息是否用户消息，以免误删。(用户使用了推理模型卻不切换为推理模型提示词的情况)
-                if isinstance(messages[-1], dict) and messages[-1].get('role') != 'user':
-                    messages = messages[:-1]  # 移除最后一个元素
-
-
-            # 参数基础配置
-            base_params = {
-                "extra_body": extra_body,
-                "model": model_name,
-                "messages": messages,
-                "timeout": request_timeout,
-                "stream": False
-            }
-
-            # 按需添加参数
-            if temperature != 1:
-                base_params.update({
-                    "temperature": temperature,
-                })
+            # 发起请求
+            response = client.chat.completions.create(**self.build_params(messages, system_prompt, platform_config))
 
-            if top_p != 1:
-                base_params.update({
-                    "top_p": top_p,
-                })
+            # 提取回复内容
+            response_think, response_content = self.extract_content(response)
 
-            if presence_penalty != 0:
-                base_params.update({
-                    "presence_penalty": presence_penalty,
-                })
+        except Exception as e:
+            self.last_exception = e
+            self.error(f"请求任务错误 ... {e}", e if self.is_debug() else None)
+            return True, None, None, None, None
 
-            if frequency_penalty != 0:
-                base_params.update({
-                    "frequency_penalty": frequency_penalty
-                })
+        return (False, response_think, response_content, *self.extract_usage(response))
 
+    # 发起异步请求
+    async def request_openai_async(self, messages, system_prompt, platform_config) -> tuple[bool, str, str, int, int]:
+        try:
+            # 从工厂获取异步客户端
+            client = LLMClientFactory().get_async_openai_client(platform_config)
 
-            # 开启思考开关时添加参数
-            if think_switch:
-                base_params.update({
-                    "reasoning_effort": think_depth
-                })
+            # 发起请求
+            response = await client.chat.completions.create(**self.build_params(messages, system_prompt, platform_config))
+
+            # 提取回复内容
+            response_think, response_content = self.extract_content(response)
 
+        except Exception as e:
+            self.last_exception = e
+            self.error(f"请求任务错误 ... {e}", e if self.is_debug() else None)
+            return True, None, None, None, None
+
+        return (False, response_think, response_content, *self.extract_usage(response))
+
+    # 发起流式请求，逐段交给流式回复检查器，检查不通过时关闭连接
+    def request_openai_stream(self, messages, system_prompt, platform_config, stream_checker) -> tuple[bool, str, str, int, int]:
+        try:
+            # 从工厂获取客户端
+            client = LLMClientFactory().get_openai_client(platform_config)
 
             # 发起请求
-            response = client.chat.completions.create(**base_params)
+            stream_checker.start()
+            params = self.build_params(messages, system_prompt, platform_config, stream = True)
+            try:
+                response = client.chat.completions.create(**params)
+            except (BadRequestError, UnprocessableEntityError) as e:
+                if not self.drop_stream_options(params, platform_config, e):
+                    raise
+                response = client.chat.completions.create(**params)
 
+            # 逐段接收回复内容
+            usage = None
+            for chunk in response:
+                usage = getattr(chunk, "usage", None) or usage
+                if not self.feed_chunk(stream_checker, chunk):
+                    response.close()
+                    break
 
             # 提取回复内容
-            message = response.choices[0].message
-
-            # 自适应提取推理过程
-            if "</think>" in message.content:
-                splited = message.content.split("</think>")
-                response_think = splited[0].removeprefix("<think>").replace("\n\n", "\n")
-                response_content = splited[-1]
-            else:
-                try:
-                    response_think = message.reasoning_content
-                    if not response_think:
-                        response_think = ""
-                except Exception:
-                    response_think = ""
-                response_content = message.content
+            response_think, response_content = stream_checker.get_result()
 
         except Exception as e:
+            self.last_exception = e
             self.error(f"请求任务错误 ... {e}", e if self.is_debug() else None)
             return True, None, None, None, None
 
+        return (False, response_think, response_content, *self.extract_stream_usage(usage, stream_checker))
+
+    # 发起异步流式请求
+    async def request_openai_stream_async(self, messages, system_prompt, platform_config, stream_checker) -> tuple[bool, str, str, int, int]:
+        try:
+            # 从工厂获取异步客户端
+            client = LLMClientFactory().get_async_openai_client(platform_config)
+
+            # 发起请求
+            stream_checker.start()
+            params = self.build_params(messages, system_prompt, platform_config, stream = True)
+            try:
+                response = await client.chat.completions.create(**params)
+            except (BadRequestError, UnprocessableEntityError) as e:
+                if not self.drop_stream_options(params, platform_config, e):
+                    raise
+                response = await client.chat.completions.create(**params)
+
+            # 逐段接收回复内容
+            usage = None
+            async for chunk in response:
+                usage = getattr(chunk, "usage", None) or usage
+                if not self.feed_chunk(stream_checker, chunk):
+                    await response.close()
+                    break
+
+            # 提取回复内容
+            response_think, response_content = stream_checker.get_result()
+
+        except Exception as e:
+            self.last_exception = e
+            self.error(f"请求任务错误 ... {e}", e if self.is_debug() else None)
+            return True, None, None, None, None
+
+        return (False, response_think, response_content, *self.extract_stream_usage(usage, stream_checker))
+
+    # 接口拒绝 stream_options 参数时移除该参数并记录，返回是否需要重试
+    def drop_stream_options(self, params: dict, platform_config: dict, e: Exception) -> bool:
+        if "stream_options" not in params or "stream_options" not in str(e):
+            return False
+
+        params.pop("stream_options")
+        with __class__.STREAM_OPTIONS_LOCK:
+            __class__.STREAM_OPTIONS_UNSUPPORTED.add(platform_config.get("api_url"))
+        self.debug(f"接口不支持 stream_options 参数，将不再获取流式请求的 Token 用量 ... {e}")
+        return True
+
+    # 将一个流式分块交给检查器，返回 False 表示应中止请求
+    def feed_chunk(self, stream_checker, chunk) -> bool:
+        if not chunk.choices:
+            return True
+
+        delta = chunk.choices[0].delta
+        return (
+            stream_checker.feed(getattr(delta, "reasoning_content", None), think = True)
+            and stream_checker.feed(delta.content)
+        )
+
+    # 构建请求参数
+    def build_params(self, messages, system_prompt, platform_config, stream: bool = False) -> dict:
+        # 获取具体配置
+        model_name = platform_config.get("model_name")
+        request_timeout = platform_config.get("request_timeout", 60)
+        temperature = platform_config.get("temperature", 1.0)
+        top_p = platform_config.get("top_p", 1.0)
+        presence_penalty = platform_config.get("presence_penalty", 0)
+        frequency_penalty = platform_config.get("frequency_penalty", 0)
+        extra_body = platform_config.get("extra_body", "{}")
+        think_switch = platform_config.get("think_switch")
+        think_depth = platform_config.get("think_depth")
+
+        # 插入系统消息
+        if system_prompt:
+            messages.insert(
+                0,
+                {
+                    "role": "system",
+                    "content": system_prompt
+                })
+
+        # 针对ds-r模型的特殊处理，因为该模型不支持模型预输入回复
+        if model_name in {"deepseek-reasoner", "deepseek-r1", "DeepSeek-R1"}:
+            # 检查一下最后的消息是否用户消息，以免误删。(用户使用了推理模型卻不切换为推理模型提示词的情况)
+            if isinstance(messages[-1], dict) and messages[-1].get('role') != 'user':
+                messages = messages[:-1]  # 移除最后一个元素
+
+
+        # 参数基础配置
+        base_params = {
+            "extra_body": extra_body,
+            "model": model_name,
+            "messages": messages,
+            "timeout": request_timeout,
+            "stream": stream
+        }
+
+        # 流式请求需要显式要求接口在最后一个分块中返回 Token 用量
+        if stream and platform_config.get("api_url") not in __class__.STREAM_OPTIONS_UNSUPPORTED:
+            base_params.update({
+                "stream_options": {"include_usage": True},
+            })
+
+        # 按需添加参数
+        if temperature != 1:
+            base_params.update({
+                "temperature": temperature,
+            })
+
+        if top_p != 1:
+            base_params.update({
+                "top_p": top_p,
+            })
+
+        if presence_penalty != 0:
+            base_params.update({
+                "presence_penalty": presence_penalty,
+            })
+
+        if frequency_penalty != 0:
+            base_params.update({
+                "frequency_penalty": frequency_penalty
+            })
+
+
+        # 开启思考开关时添加参数
+        if think_switch:
+            base_params.update({
+                "reasoning_effort": think_depth
+            })
+
+        return base_params
+
+    # 提取思考内容与回复内容
+    def extract_content(self, response) -> tuple[str, str]:
+        message = response.choices[0].message
+
+        # 自适应提取推理过程
+        if "</think>" in message.content:
+            splited = message.content.split("</think>")
+            response_think = splited[0].removeprefix("<think>").replace("\n\n", "\n")
+            response_content = splited[-1]
+        else:
+            try:
+                response_think = message.reasoning_content
+                if not response_think:
+                    response_think = ""
+            except Exception:
+                response_think = ""
+            response_content = message.content
+
+        return response_think, response_content
+
+    # 提取 Token 消耗
+    def extract_usage(self, response) -> tuple[int, int]:
         # 获取指令消耗
         try:
             prompt_tokens = int(response.usage.prompt_tokens)
@@ -115,4 +252,23 @@ class OpenaiRequester(Base):
         except Exception:
             completion_tokens = 0
 
-        return False, response_think, response_content, prompt_tokens, completion_tokens
+        return prompt_tokens, completion_tokens
+
+    # 提取流式请求的 Token 消耗，接口未返回用量时，中止的请求按检查器统计的数量计算
+    def extract_stream_usage(self, usage, stream_checker) -> tuple[int, int]:
+        # 获取指令消耗
+        try:
+            prompt_tokens = int(usage.prompt_tokens)
+        except Exception:
+            prompt_tokens = 0
+
+        # 获取回复消耗
+        try:
+            completion_tokens = int(usage.completion_tokens)
+        except Exception:
+            completion_tokens = 0
+
+        if completion_tokens == 0 and stream_checker.aborted:
+            completion_tokens = stream_checker.aborted_tokens
+
+        return prompt_tokens, completion_tokens
@@ -5,7 +5,7 @@ from ModuleFolders.LLMRequester.LLMClientFactory import LLMClientFactory
 # 接口请求器
 class SakuraRequester(Base):
     def __init__(self):
-        pass
+        self.last_exception = None # 最近一次请求的异常，用于维护密钥的健康状态
 
     # 发起请求
     def request_sakura(self, messages, system_prompt, platform_config) -> tuple[bool, str, str, int, int]:
@@ -46,6 +46,7 @@ class SakuraRequester(Base):
             # 提取回复的文本内容
             response_content = response.choices[0].message.content
         except Exception as e:
+            self.last_exception = e
             self.error(f"请求任务错误 ... {e}", e if self.is_debug() else None)
             return True, None, None, None, None
 
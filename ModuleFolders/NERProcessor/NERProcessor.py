@@ -1,8 +1,10 @@
 import os
+import time
 import spacy
 import sudachipy
 import sudachidict_core
 import threading
+import multiprocessing
 from Base.Base import Base
 
 class NERProcessor(Base):
@@ -13,6 +15,18 @@ class NERProcessor(Base):
                         "|","ｰ","%","if","Lv","(","\\","]","[","◆",":","_","ｗｗｗ","、","ぁぁ","んえ","んんん",
                     )
 
+    # 每批送入模型的文本数量
+    PIPE_BATCH_SIZE = 256
+
+    # 文本数量达到该值时才启用多进程，每个子进程都需要重新加载一次模型
+    PARALLEL_MIN_TEXTS = 5000
+
+    # 多进程识别的最大进程数，每个进程都会占用一份模型内存
+    MAX_PROCESSES = 4
+
+    # 切分过长原文时优先使用的断点
+    SEGMENT_BREAKS = ("\n", "。", "！", "？", ".", "!", "?", "　", " ")
+
     def __init__(self):
         super().__init__()
         self.nlp_models = {}
@@ -111,7 +125,65 @@ class NERProcessor(Base):
         self.info("正在按类型对术语进行排序...")
         return sorted(results, key=lambda item: item['type'])
 
-    def extract_terms(self, items_data: list, model_name: str, entity_types: list) -> list:
+    def _split_text(self, text: str, max_length: int | None) -> list[str]:
+        """
+        将超过最大长度的原文切分为多段，尽量在换行、句末标点或空格处断开。
+        """
+        if not max_length or len(text) <= max_length:
+            return [text]
+
+        segments = []
+        start = 0
+        while len(text) - start > max_length:
+            end = start + max_length
+            cut = max(text.rfind(mark, start + 1, end) for mark in self.SEGMENT_BREAKS)
+            cut = cut + 1 if cut > start else end
+            segments.append(text[start:cut])
+            start = cut
+        segments.append(text[start:])
+        return segments
+
+    def _get_process_count(self, text_count: int) -> int:
+        """
+        根据文本数量决定识别使用的进程数。
+        """
+        if text_count < self.PARALLEL_MIN_TEXTS:
+            return 1
+
+        # 在多线程的界面进程中 fork 子进程可能死锁，只在 spawn 方式下启用多进程
+        if multiprocessing.get_start_method(allow_none=False) == "fork":
+            return 1
+
+        return max(1, min(self.MAX_PROCESSES, os.cpu_count() or 1))
+
+    def _recognize_entities(self, nlp, segments: list, file_paths: dict, entity_types: set, batch_size: int, n_process: int) -> list:
+        """
+        使用 nlp.pipe 批量识别实体，结果顺序与输入顺序一致。
+        """
+        raw_results = []
+        total = len(segments)
+        report_step = max(1, total // 20)
+        docs = nlp.pipe((segment for _, segment in segments), batch_size=batch_size, n_process=n_process)
+
+        for processed_count, ((source_text, segment), doc) in enumerate(zip(segments, docs), start=1):
+            for ent in doc.ents:
+                if ent.label_ in entity_types:
+                    raw_results.append({
+                        "term": ent.text,
+                        "type": ent.label_,
+                        "context": segment,
+                        "file_path": file_paths[source_text],
+                    })
+
+            if processed_count % report_step == 0 or processed_count == total:
+                self.info(f"实体识别进度: {processed_count}/{total}...")
+
+        return raw_results
+
+    def extract_terms(
+        self, items_data: list, model_name: str, entity_types: list,
+        batch_size: int = None, n_process: int = None, max_text_length: int = None,
+    ) -> list:
         """
         从提供的原文数据列表中提取、去重、过滤和排序命名实体。
 
@@ -119,6 +191,9 @@ class NERProcessor(Base):
             items_data (list): 包含待处理数据的列表。
             model_name (str): 要使用的模型名称 (文件夹名)。
             entity_types (list): 需要提取的实体类型标签列表。
+            batch_size (int): 每批送入模型的文本数量，默认为 PIPE_BATCH_SIZE。
+            n_process (int): 识别使用的进程数，默认根据文本数量自动决定。
+            max_text_length (int): 单段文本的最大长度，超出的原文切分后识别，术语的上下文也只保留所在的片段，默认不限制。
 
         Returns:
             list: 包含最终处理结果的字典列表。
@@ -128,32 +203,38 @@ class NERProcessor(Base):
             return []
 
         total_items = len(items_data)
-        self.info(f"开始对 {total_items} 条原文进行实体识别...")
-        
-        raw_results = []
-        processed_count = 0
-        
-        # 步骤 1: 从文本中提取原始实体
+
+        # 步骤 1: 相同的原文只识别一次，记录首次出现时的文件路径
+        file_paths = {}
         for item_data in items_data:
             source_text = item_data.get("source_text")
-            file_path = item_data.get("file_path")
-            
             if not source_text or not source_text.strip():
                 continue
+            file_paths.setdefault(source_text, item_data.get("file_path"))
 
-            doc = nlp(source_text)
-            for ent in doc.ents:
-                if ent.label_ in entity_types:
-                    raw_results.append({
-                        "term": ent.text,
-                        "type": ent.label_,
-                        "context": source_text,
-                        "file_path": file_path,
-                    })
+        # 过长的原文切分后识别，结果以所在的片段作为上下文
+        segments = [
+            (source_text, segment)
+            for source_text in file_paths
+            for segment in self._split_text(source_text, max_text_length)
+        ]
 
-            processed_count += 1
-            if processed_count % 50 == 0 or processed_count == total_items:
-                self.info(f"实体识别进度: {processed_count}/{total_items}...")
+        batch_size = batch_size or self.PIPE_BATCH_SIZE
+        n_process = n_process or self._get_process_count(len(segments))
+        self.info(f"开始对 {total_items} 条原文进行实体识别，去重后共 {len(segments)} 段文本，使用 {n_process} 个进程...")
+
+        start_time = time.time()
+        entity_types = set(entity_types or [])
+        try:
+            raw_results = self._recognize_entities(nlp, segments, file_paths, entity_types, batch_size, n_process)
+        except Exception as e:
+            if n_process <= 1:
+                raise
+            self.warning(f"多进程实体识别失败，改为单进程识别: {e}")
+            raw_results = self._recognize_entities(nlp, segments, file_paths, entity_types, batch_size, 1)
+
+        elapsed = time.time() - start_time
+        self.info(f"实体识别完成，耗时 {elapsed:.2f} 秒，平均每秒 {len(segments) / max(elapsed, 1e-6):.0f} 段。")
 
         # 步骤 2: 对提取结果进行去重
         unique_results = self._deduplicate_results(raw_results)
@@ -402,15 +402,8 @@ class PromptBuilder(Base):
 
     # 构造术语表
     def build_glossary_prompt(config: TaskConfig, input_dict: dict) -> str:
-        # 将输入字典中的所有值转换为集合
-        lines = set(line for line in input_dict.values())
-
-        # 筛选在输入词典中出现过的条目
-        result = []
-        for v in config.prompt_dictionary_data:
-            src_lower = v.get("src").lower() # 将术语表中的 src 转换为小写
-            if any(src_lower in line.lower() for line in lines): # 将原文行也转换为小写进行比较
-                result.append(v)
+        # 筛选在输入词典中出现过的条目，不区分大小写
+        result = config.get_prompt_matcher().match_glossary(input_dict.values())
 
         # 数据校验
         if len(result) == 0:
@@ -454,40 +447,9 @@ class PromptBuilder(Base):
     # 构造禁翻表
     def build_ntl_prompt(config: TaskConfig, source_text_dict) -> str:
 
-        # 获取禁翻表内容
-        exclusion_list_data = config.exclusion_list_data.copy()
-
+        # 使用预编译的正则与标记符查找禁翻内容
+        exclusion_dict = config.get_prompt_matcher().match_exclusions(source_text_dict.values())
 
-        exclusion_dict = {}  # 用字典存储并自动去重
-        texts = list(source_text_dict.values())
-        
-        # 处理正则匹配
-        for element in exclusion_list_data:
-            regex = element.get("regex", "").strip()
-            marker = element.get("markers", "").strip()
-            info = element.get("info", "")
-            
-            # 检查是否写正则，如果写了，只处理正则
-            if regex:
-                # 避免错误正则，导致崩溃
-                try:
-                    # 编译正则表达式字符串为模式对象
-                    pattern = re.compile(regex)
-                    # 寻找文本中所有符合正则的文本内容
-                    for text in texts:
-                        for match in pattern.finditer(text):
-                            markers = match.group(0)
-                            # 避免重复添加
-                            if markers not in exclusion_dict: 
-                                exclusion_dict[markers] = info
-                except re.error:
-                    pass
-            # 没写正则，只处理标记符        
-            else:
-                found = any(marker in text for text in texts)
-                if found and marker not in exclusion_dict:  # 避免重复添加
-                    exclusion_dict[marker] = info
-        
         # 检查内容是否为空
         if not exclusion_dict :
             return ""
@@ -505,17 +467,8 @@ class PromptBuilder(Base):
 
     # 构造角色设定
     def build_characterization(config: TaskConfig, input_dict: dict) -> str:
-        # 将数据存储到中间字典中
-        dictionary = {}
-        for v in config.characterization_data:
-            dictionary[v.get("original_name", "")] = v
-
-        # 筛选，如果该key在发送文本中，则存储进新字典中
-        temp_dict = {}
-        for key_a, value_a in dictionary.items():
-            for _, value_b in input_dict.items():
-                if key_a in value_b:
-                    temp_dict[key_a] = value_a
+        # 筛选在发送文本中出现过的角色
+        temp_dict = config.get_prompt_matcher().match_characters(input_dict.values())
 
         # 如果没有含有字典内容
         if temp_dict == {}:
@@ -0,0 +1,140 @@
+import re
+from collections import deque
+
+
+class AhoCorasick:
+    """多模式字符串匹配自动机
+
+    预先把所有模式串构建为一个自动机，之后每段文本只需扫描一遍即可找出其中出现的全部模式串，
+    耗时与模式串的数量无关。
+    """
+
+    def __init__(self, patterns: list[str]) -> None:
+        self.goto: list[dict[str, int]] = [{}]  # 每个状态的转移表
+        self.fail: list[int] = [0]  # 每个状态的失配跳转
+        self.output: list[tuple[int, ...]] = [()]  # 到达每个状态时匹配到的模式串编号
+
+        # 空字符串包含于任何文本中，无法放入自动机，单独记录
+        self.empty: tuple[int, ...] = tuple(i for i, pattern in enumerate(patterns) if pattern == "")
+
+        # 构建字典树
+        for i, pattern in enumerate(patterns):
+            if pattern == "":
+                continue
+            state = 0
+            for char in pattern:
+                next_state = self.goto[state].get(char)
+                if next_state is None:
+                    next_state = len(self.goto)
+                    self.goto[state][char] = next_state
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(())
+                state = next_state
+            self.output[state] = self.output[state] + (i,)
+
+        # 按层计算失配跳转，并把跳转目标的匹配结果合并到当前状态
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self.goto[state].items():
+                queue.append(next_state)
+                fail_state = self.fail[state]
+                while fail_state and char not in self.goto[fail_state]:
+                    fail_state = self.fail[fail_state]
+                self.fail[next_state] = self.goto[fail_state].get(char, 0)
+                self.output[next_state] = self.output[next_state] + self.output[self.fail[next_state]]
+
+    # 返回文本中出现的模式串编号
+    def search(self, text: str) -> set[int]:
+        goto = self.goto
+        fail = self.fail
+        output = self.output
+
+        found = set(self.empty)
+        state = 0
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if output[state]:
+                found.update(output[state])
+
+        return found
+
+    # 返回多段文本中出现的模式串编号，每段文本单独匹配
+    def search_all(self, texts) -> set[int]:
+        found = set()
+        for text in texts:
+            found.update(self.search(text))
+        return found
+
+
+class PromptMatcher:
+    """提示词匹配器
+
+    为术语表、角色介绍与禁翻表预先构建匹配规则，每次任务只构建一次，
+    供所有翻译任务在拼接提示词时筛选当前文本中出现的条目。
+    """
+
+    def __init__(self, glossary_data: list[dict], characterization_data: list[dict], exclusion_data: list[dict]) -> None:
+        # 术语表，不区分大小写
+        self.glossary_data = glossary_data or []
+        self.glossary_automaton = AhoCorasick([v.get("src").lower() for v in self.glossary_data])
+
+        # 角色介绍，同名角色以最后一条为准
+        characters = {}
+        for v in characterization_data or []:
+            characters[v.get("original_name", "")] = v
+        self.character_names = list(characters.keys())
+        self.character_data = list(characters.values())
+        self.character_automaton = AhoCorasick(self.character_names)
+
+        # 禁翻表，写了正则的条目只使用正则，错误的正则直接忽略
+        self.exclusion_rules: list[tuple[re.Pattern | None, str, str]] = []
+        markers = []
+        for element in exclusion_data or []:
+            regex = element.get("regex", "").strip()
+            marker = element.get("markers", "").strip()
+            info = element.get("info", "")
+            if regex:
+                try:
+                    self.exclusion_rules.append((re.compile(regex), "", info))
+                except re.error:
+                    pass
+            else:
+                self.exclusion_rules.append((None, marker, info))
+                markers.append(marker)
+        self.marker_automaton = AhoCorasick(markers)
+        self.markers = markers
+
+    # 筛选在文本中出现过的术语表条目
+    def match_glossary(self, texts) -> list[dict]:
+        found = self.glossary_automaton.search_all(set(text.lower() for text in texts))
+        return [v for i, v in enumerate(self.glossary_data) if i in found]
+
+    # 筛选在文本中出现过的角色，返回 {原名: 角色信息}
+    def match_characters(self, texts) -> dict[str, dict]:
+        found = self.character_automaton.search_all(set(texts))
+        return {
+            name: value
+            for i, (name, value) in enumerate(zip(self.character_names, self.character_data))
+            if i in found
+        }
+
+    # 找出文本中需要保留的禁翻内容，返回 {标记符: 备注}
+    def match_exclusions(self, texts) -> dict[str, str]:
+        texts = list(texts)
+        found_markers = set(self.markers[i] for i in self.marker_automaton.search_all(texts))
+
+        exclusion_dict = {}  # 用字典存储并自动去重
+        for pattern, marker, info in self.exclusion_rules:
+            if pattern is not None:
+                # 寻找文本中所有符合正则的文本内容
+                for text in texts:
+                    for match in pattern.finditer(text):
+                        exclusion_dict.setdefault(match.group(0), info)
+            elif marker in found_markers:
+                exclusion_dict.setdefault(marker, info)
+
+        return exclusion_dict
@@ -0,0 +1,147 @@
+from ModuleFolders.RequestLimiter.RateBucket import RateBucket
+
+
+# 单个密钥的额度与健康状态
+class ApiKeyState:
+
+    def __init__(self, key: str, bucket: RateBucket) -> None:
+        self.key = key
+        self.bucket = bucket
+
+        # 请求结果统计
+        self.requests = 0
+        self.successes = 0
+        self.rate_limited = 0  # 429
+        self.server_errors = 0  # 5xx
+        self.other_errors = 0
+        self.latency = 0.0  # 成功请求耗时的指数移动平均值（s）
+
+        # 冷却与淘汰
+        self.consecutive_failures = 0
+        self.consecutive_rate_limited = 0
+        self.cooldown_until = 0.0
+        self.evicted = False
+
+    def to_dict(self, now: float) -> dict:
+        return {
+            "key": f"{self.key[:4]}...{self.key[-4:]}" if len(self.key) > 12 else self.key,
+            "requests": self.requests,
+            "successes": self.successes,
+            "rate_limited": self.rate_limited,
+            "server_errors": self.server_errors,
+            "other_errors": self.other_errors,
+            "latency": self.latency,
+            "headroom": max(0.0, self.bucket.get_headroom()),
+            "cooldown": max(0.0, self.cooldown_until - now),
+            "evicted": self.evicted,
+        }
+
+
+class ApiKeyPool:
+    """API 密钥池
+
+    每个密钥拥有独立的 RPM/TPM 额度，并根据请求结果维护健康状态：
+    - 429 时按连续次数指数退避冷却，5xx 与其他错误连续多次后冷却
+    - 401/403 或连续失败次数过多的密钥被淘汰，但始终保留至少一个密钥
+    - 调度时在可立即发送的密钥中选择剩余额度最多的一个
+    本类不加锁，由 RequestLimiter 保证串行访问
+    """
+
+    # 冷却参数（s）
+    RATE_LIMIT_COOLDOWN = 2
+    RATE_LIMIT_COOLDOWN_MAX = 60
+    FAILURE_COOLDOWN = 10
+
+    # 连续失败多少次后开始冷却与淘汰
+    FAILURES_BEFORE_COOLDOWN = 3
+    FAILURES_BEFORE_EVICTION = 10
+
+    # 视为密钥失效、直接淘汰的状态码
+    EVICTION_STATUS_CODES = (401, 403)
+
+    # 耗时移动平均的权重
+    LATENCY_ALPHA = 0.2
+
+    def __init__(self, api_keys: list[str], tpm_limit: int, rpm_limit: int, rpm_burst: int, now: float) -> None:
+        self.states = {
+            key: ApiKeyState(key, RateBucket(tpm_limit, rpm_limit, rpm_burst, now))
+            for key in dict.fromkeys(api_keys)
+        }
+
+    # 为请求选择密钥，返回 (密钥, 0) 表示已扣除该密钥的额度，否则返回 (None, 需等待的秒数)
+    def try_acquire(self, tokens: int, now: float) -> tuple[str | None, float]:
+        best_state, best_headroom, min_wait_time = None, None, float("inf")
+        for state in self.states.values():
+            if state.evicted:
+                continue
+
+            wait_time = max(state.cooldown_until - now, state.bucket.get_wait_time(tokens, now))
+            if wait_time > 0:
+                min_wait_time = min(min_wait_time, wait_time)
+                continue
+
+            # 剩余额度相同时优先选择耗时更短的密钥
+            headroom = (state.bucket.get_headroom(), -state.latency)
+            if best_headroom is None or headroom > best_headroom:
+                best_state, best_headroom = state, headroom
+
+        if best_state is None:
+            return None, min_wait_time
+
+        best_state.bucket.consume(tokens, now)
+        best_state.requests += 1
+        return best_state.key, 0
+
+    # 记录请求结果，status_code 为 None 且 success 为 False 时表示没有状态码的错误（如超时）
+    def report(self, key: str, success: bool, latency: float, status_code: int | None, now: float) -> None:
+        state = self.states.get(key)
+        if state is None:
+            return None
+
+        if success:
+            state.successes += 1
+            state.consecutive_failures = 0
+            state.consecutive_rate_limited = 0
+            state.latency = latency if state.successes == 1 else state.latency + (latency - state.latency) * __class__.LATENCY_ALPHA
+            return None
+
+        state.consecutive_failures += 1
+        if status_code == 429:
+            state.rate_limited += 1
+            state.consecutive_rate_limited += 1
+            cooldown = min(__class__.RATE_LIMIT_COOLDOWN_MAX, __class__.RATE_LIMIT_COOLDOWN * 2 ** (state.consecutive_rate_limited - 1))
+            state.cooldown_until = max(state.cooldown_until, now + cooldown)
+        elif status_code is not None and 500 <= status_code < 600:
+            state.server_errors += 1
+        else:
+            state.other_errors += 1
+
+        if state.consecutive_failures >= __class__.FAILURES_BEFORE_COOLDOWN:
+            state.cooldown_until = max(state.cooldown_until, now + __class__.FAILURE_COOLDOWN)
+
+        # 淘汰失效的密钥，保留最后一个可用密钥
+        if status_code in __class__.EVICTION_STATUS_CODES or state.consecutive_failures >= __class__.FAILURES_BEFORE_EVICTION:
+            if sum(1 for v in self.states.values() if not v.evicted) > 1:
+                state.evicted = True
+
+    # 获取密钥池状态
+    def get_stats(self, now: float) -> dict:
+        keys = [state.to_dict(now) for state in self.states.values()]
+        return {
+            "total": len(keys),
+            "active": sum(1 for v in keys if not v["evicted"] and v["cooldown"] == 0),
+            "cooling": sum(1 for v in keys if not v["evicted"] and v["cooldown"] > 0),
+            "evicted": sum(1 for v in keys if v["evicted"]),
+            "keys": keys,
+        }
+
+    # 从异常中提取 HTTP 状态码
+    def get_status_code(e: Exception) -> int | None:
+        if e is None:
+            return None
+
+        for value in (getattr(e, "status_code", None), getattr(e, "code", None), getattr(getattr(e, "response", None), "status_code", None)):
+            if isinstance(value, int):
+                return value
+
+        return None
@@ -0,0 +1,248 @@
+import time
+import asyncio
+import itertools
+import statistics
+import threading
+from collections import deque
+from typing import Callable
+
+from Base.Base import Base
+from ModuleFolders.RequestLimiter.ApiKeyPool import ApiKeyPool
+from ModuleFolders.RequestLimiter.LimiterWaiter import LimiterWaiter
+
+
+class ConcurrencyController(Base):
+    """自适应并发控制器（AIMD）
+
+    - 每收集一个窗口（不少于当前并发上限）的请求结果，比较窗口内成功请求耗时的中位数与错误率和基线值：
+      两者保持平稳且并发已被用满时提高上限，初期成倍增长，首次退避后每个窗口加一；耗时或错误率明显上升时小幅降低上限
+    - 遇到 429 或超时立即按比例降低上限，退避之前发出的请求的结果不再重复触发退避
+    - 关闭自适应时上限固定为初始值
+    """
+
+    # 窗口的最少样本数
+    WINDOW_MIN_SAMPLES = 8
+
+    # 耗时中位数超过基线的倍数、错误率超过基线的差值时，视为出现拥塞
+    LATENCY_TOLERANCE = 1.5
+    ERROR_RATE_TOLERANCE = 0.1
+
+    # 遇到 429 或超时时的退避比例，以及耗时或错误率上升时的退避比例
+    BACKOFF_RATIO = 0.7
+    GRADIENT_BACKOFF_RATIO = 0.9
+
+    # 基线值向上跟随窗口值的速率，向下时立即跟随
+    BASELINE_ALPHA = 0.1
+
+    # 视为超时的状态码
+    TIMEOUT_STATUS_CODES = (408, 504)
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.lock = threading.Lock()
+        self.waiters: deque[LimiterWaiter] = deque()
+        self.sequence = itertools.count()
+        self.configure(1, 1, False)
+
+    # 设置初始并发数与并发上限，并重置统计数据
+    def configure(self, initial_limit: int, max_limit: int, adaptive: bool) -> None:
+        with self.lock:
+            self.max_limit = max(1, max_limit)
+            self.limit = float(max(1, min(initial_limit, self.max_limit)))
+            self.adaptive = adaptive
+            self.in_flight = 0
+
+            # 窗口统计
+            self.samples = []
+            self.saturated = False
+            self.slow_start = True
+            self.last_backoff_time = 0.0
+            self.latency_p50 = 0.0
+            self.baseline_latency = None
+            self.baseline_error_rate = None
+
+            self.wake_next()
+
+    # 当前的并发上限
+    def get_limit(self) -> int:
+        return max(1, int(self.limit))
+
+    # 获取控制器状态
+    def get_stats(self) -> dict:
+        with self.lock:
+            return {
+                "limit": self.get_limit(),
+                "max_limit": self.max_limit,
+                "in_flight": self.in_flight,
+                "waiting": len(self.waiters),
+                "latency_p50": self.latency_p50,
+                "adaptive": self.adaptive,
+            }
+
+    # 唤醒队首的等待者，需在持有锁时调用
+    def wake_next(self) -> None:
+        if self.waiters and self.in_flight < self.get_limit():
+            self.waiters[0].wake()
+
+    # 唤醒全部等待者，以便其重新检查停止状态
+    def wake_all(self) -> None:
+        with self.lock:
+            for waiter in self.waiters:
+                waiter.wake()
+
+    # 入队，空闲时直接占用并发名额并返回 None
+    def enqueue(self, loop: asyncio.AbstractEventLoop = None) -> LimiterWaiter | None:
+        with self.lock:
+            if not self.waiters and self.in_flight < self.get_limit():
+                self.in_flight = self.in_flight + 1
+                self.saturated = self.saturated or self.in_flight >= self.get_limit()
+                return None
+
+            # 有任务在排队，说明并发已被用满
+            self.saturated = True
+            waiter = LimiterWaiter(0, 0, next(self.sequence), loop)
+            self.waiters.append(waiter)
+            return waiter
+
+    # 队首尝试占用并发名额
+    def poll(self, waiter: LimiterWaiter) -> bool:
+        with self.lock:
+            if self.waiters[0] is not waiter or self.in_flight >= self.get_limit():
+                return False
+
+            self.waiters.popleft()
+            self.in_flight = self.in_flight + 1
+            self.wake_next()
+            return True
+
+    # 放弃等待并出队
+    def dequeue(self, waiter: LimiterWaiter) -> None:
+        with self.lock:
+            if waiter in self.waiters:
+                self.waiters.remove(waiter)
+                self.wake_next()
+
+    # 阻塞等待并发名额，stop_check 返回 True 时放弃并返回 False
+    def acquire(self, stop_check: Callable[[], bool] = None) -> bool:
+        waiter = self.enqueue()
+        if waiter is None:
+            return True
+
+        acquired = False
+        try:
+            while True:
+                waiter.event.clear()
+                if self.poll(waiter):
+                    acquired = True
+                    return True
+
+                if stop_check is not None and stop_check():
+                    return False
+
+                waiter.event.wait()
+        finally:
+            if not acquired:
+                self.dequeue(waiter)
+
+    # 异步等待并发名额，任务被取消时自动出队
+    async def acquire_async(self) -> bool:
+        waiter = self.enqueue(asyncio.get_running_loop())
+        if waiter is None:
+            return True
+
+        acquired = False
+        try:
+            while True:
+                waiter.event.clear()
+                if self.poll(waiter):
+                    acquired = True
+                    return True
+
+                await waiter.event.wait()
+        finally:
+            if not acquired:
+                self.dequeue(waiter)
+
+    # 归还并发名额
+    def release(self) -> None:
+        with self.lock:
+            self.in_flight = max(0, self.in_flight - 1)
+            self.wake_next()
+
+    # 记录一次请求的结果，并据此调整并发上限
+    def report(self, success: bool, latency: float, exception: Exception = None) -> None:
+        now = time.time()
+        with self.lock:
+            if self.adaptive == False:
+                return None
+
+            # 429 与超时立即退避，退避之前发出的请求不再重复触发
+            if not success and __class__.is_congestion_error(exception):
+                if now - latency >= self.last_backoff_time:
+                    self.last_backoff_time = now
+                    self.slow_start = False
+                    self.samples = []
+                    self.saturated = False
+                    self.set_limit(self.limit * __class__.BACKOFF_RATIO, "请求被限流或超时")
+                return None
+
+            self.samples.append((success, latency))
+            if len(self.samples) < max(__class__.WINDOW_MIN_SAMPLES, self.get_limit()):
+                return None
+
+            # 统计窗口内的耗时中位数与错误率
+            latencies = [v for ok, v in self.samples if ok]
+            error_rate = 1 - len(latencies) / len(self.samples)
+            latency_p50 = statistics.median(latencies) if latencies else None
+            saturated = self.saturated
+            self.samples = []
+            self.saturated = False
+
+            # 首个窗口只建立基线
+            if self.baseline_latency is None or self.baseline_error_rate is None:
+                if latency_p50 is not None:
+                    self.latency_p50 = latency_p50
+                    self.baseline_latency = latency_p50
+                    self.baseline_error_rate = error_rate
+                return None
+
+            self.latency_p50 = latency_p50 if latency_p50 is not None else self.latency_p50
+            congested = (
+                latency_p50 is None
+                or latency_p50 > self.baseline_latency * __class__.LATENCY_TOLERANCE
+                or error_rate > self.baseline_error_rate + __class__.ERROR_RATE_TOLERANCE
+            )
+
+            if congested:
+                self.slow_start = False
+                self.set_limit(self.limit * __class__.GRADIENT_BACKOFF_RATIO, "请求耗时或错误率上升")
+            elif saturated:
+                # 并发未被用满时，提高上限没有意义
+                self.set_limit(self.limit * 2 if self.slow_start else self.limit + 1, "请求耗时与错误率保持平稳")
+
+            # 更新基线
+            if latency_p50 is not None:
+                self.baseline_latency = min(latency_p50, self.baseline_latency + (latency_p50 - self.baseline_latency) * __class__.BASELINE_ALPHA)
+            self.baseline_error_rate = min(error_rate, self.baseline_error_rate + (error_rate - self.baseline_error_rate) * __class__.BASELINE_ALPHA)
+
+    # 修改并发上限，需在持有锁时调用
+    def set_limit(self, limit: float, reason: str) -> None:
+        old_limit = self.get_limit()
+        self.limit = max(1.0, min(float(self.max_limit), limit))
+
+        if self.get_limit() != old_limit:
+            self.debug(f"{reason}，并发上限调整为 {self.get_limit()} ...")
+
+        self.wake_next()
+
+    # 判断异常是否为限流或超时
+    def is_congestion_error(e: Exception) -> bool:
+        if e is None:
+            return False
+
+        status_code = ApiKeyPool.get_status_code(e)
+        if status_code == 429 or status_code in __class__.TIMEOUT_STATUS_CODES:
+            return True
+
+        return isinstance(e, TimeoutError) or "timeout" in type(e).__name__.lower()
@@ -0,0 +1,25 @@
+import asyncio
+import threading
+
+
+# 排队等待发送许可的请求
+class LimiterWaiter:
+
+    def __init__(self, tokens: int, priority: int, sequence: int, loop: asyncio.AbstractEventLoop = None) -> None:
+        self.tokens = tokens
+        self.priority = priority
+        self.sequence = sequence
+
+        # 同步调用者使用线程事件，异步调用者使用所在事件循环的事件
+        self.loop = loop
+        self.event = threading.Event() if loop is None else asyncio.Event()
+
+    def __lt__(self, other: "LimiterWaiter") -> bool:
+        return (self.priority, self.sequence) < (other.priority, other.sequence)
+
+    # 唤醒等待者，可以在任意线程中调用
+    def wake(self) -> None:
+        if self.loop is None:
+            self.event.set()
+        else:
+            self.loop.call_soon_threadsafe(self.event.set)
@@ -0,0 +1,69 @@
+from collections import deque
+
+
+class RateBucket:
+    """单个限额主体（一个密钥）的 RPM/TPM 额度
+
+    - TPM 以令牌桶建模，容量等于 tpm_limit，超过容量的单个请求在令牌桶满时放行，并以欠额的形式推迟后续请求
+    - RPM 以 60 秒滑动窗口建模，另有一个容量为突发请求数的令牌桶控制短时间内的集中请求
+    本类不加锁，由持有者保证串行访问
+    """
+
+    # RPM 滑动窗口的长度（s）
+    RPM_WINDOW = 60
+
+    def __init__(self, tpm_limit: int, rpm_limit: int, rpm_burst: int, now: float) -> None:
+        # TPM相关参数，容量为一分钟的额度
+        self.max_tokens = max(1, tpm_limit)  # 令牌桶最大容量
+        self.tokens_rate = tpm_limit / 60  # 令牌每秒的恢复速率
+        self.remaining_tokens = self.max_tokens  # 令牌桶剩余容量
+        self.last_time = now  # 上次记录时间
+
+        # RPM相关参数，突发请求数为 0 时默认允许一秒内的请求量
+        self.rpm_limit = max(1, rpm_limit)  # 滑动窗口内的最大请求数
+        self.rpm_burst = max(1, rpm_burst if rpm_burst > 0 else self.rpm_limit // __class__.RPM_WINDOW)  # 允许连续发送的最大请求数
+        self.remaining_requests = self.rpm_burst  # 突发令牌桶剩余容量
+        self.request_times = deque()  # 滑动窗口内的请求时间
+
+    # 按经过的时间恢复额度
+    def refill(self, now: float) -> None:
+        elapsed = max(0, now - self.last_time)
+        self.remaining_tokens = min(self.max_tokens, self.remaining_tokens + elapsed * self.tokens_rate)
+        self.remaining_requests = min(self.rpm_burst, self.remaining_requests + elapsed * self.rpm_limit / __class__.RPM_WINDOW)
+        self.last_time = now
+
+        # 移出滑动窗口的请求
+        while self.request_times and self.request_times[0] <= now - __class__.RPM_WINDOW:
+            self.request_times.popleft()
+
+    # 计算发送该请求还需等待的时间，不扣除额度
+    def get_wait_time(self, tokens: int, now: float) -> float:
+        self.refill(now)
+
+        # 超过令牌桶容量的请求，等待令牌桶装满即可发送
+        need_tokens = min(tokens, self.max_tokens)
+
+        # 分别计算 TPM、RPM 突发与 RPM 窗口所需的等待时间
+        wait_time = 0
+        if need_tokens > self.remaining_tokens:
+            wait_time = max(wait_time, (need_tokens - self.remaining_tokens) / self.tokens_rate if self.tokens_rate > 0 else float("inf"))
+        if self.remaining_requests < 1:
+            wait_time = max(wait_time, (1 - self.remaining_requests) * __class__.RPM_WINDOW / self.rpm_limit)
+        if len(self.request_times) >= self.rpm_limit:
+            wait_time = max(wait_time, self.request_times[0] + __class__.RPM_WINDOW - now)
+
+        return wait_time
+
+    # 扣除一次请求的额度
+    def consume(self, tokens: int, now: float) -> None:
+        self.remaining_tokens = self.remaining_tokens - tokens
+        self.remaining_requests = self.remaining_requests - 1
+        self.request_times.append(now)
+
+    # 剩余额度占比，取 TPM 与 RPM 中较紧张的一项
+    def get_headroom(self) -> float:
+        return min(
+            self.remaining_tokens / self.max_tokens,
+            self.remaining_requests / self.rpm_burst,
+            1 - len(self.request_times) / self.rpm_limit,
+        )
@@ -1,110 +1,167 @@
 import time
+import heapq
+import asyncio
+import itertools
 import threading
-import tiktoken  # 需要安装库pip install tiktoken
-import tiktoken_ext  # 必须导入这两个库，否则打包后无法运行
-from tiktoken_ext import openai_public
+from typing import Callable
+
+from ModuleFolders.RequestLimiter.ApiKeyPool import ApiKeyPool
+from ModuleFolders.RequestLimiter.LimiterWaiter import LimiterWaiter
+from ModuleFolders.RequestLimiter.ConcurrencyController import ConcurrencyController
+from ModuleFolders.TokenCounter.TokenCounter import TokenCounter
 
 
 class RequestLimiter:
+    """请求限制器
+
+    - 每个 API 密钥拥有独立的 RPM/TPM 额度（见 RateBucket），由密钥池按剩余额度与健康状态调度
+    - 调用者按优先级与先来后到排队，只有队首计算精确的等待时间并定时休眠，其余调用者在被唤醒前不占用 CPU
+    - 同时执行的任务数由自适应并发控制器（见 ConcurrencyController）根据请求结果调整
+    """
 
     def __init__(self) -> None:
-        # TPM相关参数
-        self.max_tokens = 0  # 令牌桶最大容量
-        self.remaining_tokens = 0  # 令牌桶剩余容量
-        self.tokens_rate = 0  # 令牌每秒的恢复速率
-        self.last_time = time.time()  # 上次记录时间
-
-        # RPM相关参数
-        self.last_request_time = 0  # 上次记录时间
-        self.request_interval = 0  # 请求的最小时间间隔（s）
+        # 密钥池
+        self.key_pool = ApiKeyPool(["no_key_required"], 0, 1, 0, time.time())
+
+        # 等待队列
         self.lock = threading.Lock()
+        self.waiters: list[LimiterWaiter] = []
+        self.sequence = itertools.count()
+
+        # 自适应并发控制器
+        self.concurrency_controller = ConcurrencyController()
+
+        # Token 计数服务
+        self.token_counter = TokenCounter.get_singleton()
+
+    # 设置限制器的参数，RPM 与 TPM 限额均为单个密钥的限额
+    def set_limit(self, tpm_limit: int, rpm_limit: int, rpm_burst: int = 0, api_keys: list[str] = None) -> None:
+        with self.lock:
+            self.key_pool = ApiKeyPool(api_keys or ["no_key_required"], tpm_limit, rpm_limit, rpm_burst, time.time())
+            self.wake_head()
+
+    # 记录请求结果，用于维护密钥的健康状态
+    def report_result(self, api_key: str, success: bool, latency: float, exception: Exception = None) -> None:
+        with self.lock:
+            self.key_pool.report(api_key, success, latency, ApiKeyPool.get_status_code(exception), time.time())
+
+            # 密钥状态变化后，队首需要重新计算等待时间
+            self.wake_head()
+
+        # 同时作为调整并发上限的依据
+        self.concurrency_controller.report(success, latency, exception)
+
+    # 获取密钥池状态
+    def get_key_pool_stats(self) -> dict:
+        with self.lock:
+            return self.key_pool.get_stats(time.time())
+
+    # 唤醒队首的等待者，需在持有锁时调用
+    def wake_head(self) -> None:
+        if self.waiters:
+            self.waiters[0].wake()
 
-    # 设置限制器的参数
-    def set_limit(self, tpm_limit: int, rpm_limit: int) -> None:
-        # 设置限制器的TPM参数
-        self.max_tokens = 32000  # 令牌桶最大容量
-        self.tokens_rate = tpm_limit / 60  # 令牌每秒的恢复速率
-        self.remaining_tokens = 32000  # 令牌桶剩余容量
-
-        # 设置限制器的RPM参数
-        self.request_interval = 60 / rpm_limit  # 请求的最小时间间隔（s）
-
-    def rpm_limiter(self) -> bool:
-        current_time = time.time()  # 获取现在的时间
-        time_since_last_request = current_time - self.last_request_time  # 计算当前时间与上次记录时间的间隔
-        if time_since_last_request < self.request_interval:
-            # print("[DEBUG] Request limit exceeded. Please try again later.")
-            return False
-        else:
-            self.last_request_time = current_time
-            return True
-
-    def tpm_limiter(self, tokens: int) -> bool:
-        now = time.time()  # 获取现在的时间
-        tokens_to_add = (now - self.last_time) * self.tokens_rate  # 现在时间减去上一次记录的时间，乘以恢复速率，得出这段时间恢复的tokens数量
-        self.remaining_tokens = min(self.max_tokens, self.remaining_tokens + tokens_to_add)  # 计算新的剩余容量，与最大容量比较，谁小取谁值，避免发送信息超过最大容量
-        self.last_time = now  # 改变上次记录时间
-
-        # 检查是否超过模型最大输入限制
-        if tokens >= self.max_tokens:
-            print("[Warning INFO] 该次任务的文本总tokens量已经超过最大输入限制，将直接进入下次拆分轮次")
-            return False
-        
-        # 检查是否超过余量
-        elif tokens >= self.remaining_tokens:
-            return False
-        
-        else:
-            # print("[DEBUG] 数量足够，剩余tokens：", tokens,'\n' )
-            return True
-
-    def check_limiter(self, tokens: int) -> bool:
-        # 如果能够发送请求，则扣除令牌桶里的令牌数
+    # 唤醒全部等待者，以便其重新检查停止状态
+    def wake_all(self) -> None:
         with self.lock:
-            if self.rpm_limiter() and self.tpm_limiter(tokens):
-                self.remaining_tokens = self.remaining_tokens - tokens
-                return True
-            else:
-                return False
+            for waiter in self.waiters:
+                waiter.wake()
+
+        self.concurrency_controller.wake_all()
+
+    # 入队
+    def enqueue(self, tokens: int, priority: int, loop: asyncio.AbstractEventLoop = None) -> LimiterWaiter:
+        with self.lock:
+            waiter = LimiterWaiter(tokens, priority, next(self.sequence), loop)
+            heapq.heappush(self.waiters, waiter)
+            return waiter
+
+    # 队首尝试获取许可，返回 (密钥, 0) 表示已获得许可，(None, None) 表示未轮到，其余为需等待的秒数
+    def poll(self, waiter: LimiterWaiter) -> tuple[str | None, float | None]:
+        with self.lock:
+            if self.waiters[0] is not waiter:
+                return None, None
+
+            api_key, wait_time = self.key_pool.try_acquire(waiter.tokens, time.time())
+            if api_key is not None:
+                heapq.heappop(self.waiters)
+                self.wake_head()
+            return api_key, wait_time
+
+    # 放弃等待并出队
+    def dequeue(self, waiter: LimiterWaiter) -> None:
+        with self.lock:
+            if waiter in self.waiters:
+                is_head = self.waiters[0] is waiter
+                self.waiters.remove(waiter)
+                heapq.heapify(self.waiters)
+                if is_head:
+                    self.wake_head()
+
+    # 阻塞等待发送许可，返回分配到的密钥，超时或 stop_check 返回 True 时放弃并返回 None
+    def acquire(self, tokens: int, timeout: float, priority: int = 0, stop_check: Callable[[], bool] = None) -> str | None:
+        deadline = time.time() + timeout
+        waiter = self.enqueue(tokens, priority)
+        acquired = False
+        try:
+            while True:
+                waiter.event.clear()
+                api_key, wait_time = self.poll(waiter)
+                if api_key is not None:
+                    acquired = True
+                    return api_key
+
+                remaining = deadline - time.time()
+                if remaining <= 0 or (stop_check is not None and stop_check()):
+                    return None
+
+                waiter.event.wait(remaining if wait_time is None else min(wait_time, remaining))
+        finally:
+            if not acquired:
+                self.dequeue(waiter)
+
+    # 异步等待发送许可，返回分配到的密钥，超时时放弃并返回 None，任务被取消时自动出队
+    async def acquire_async(self, tokens: int, timeout: float, priority: int = 0) -> str | None:
+        deadline = time.time() + timeout
+        waiter = self.enqueue(tokens, priority, asyncio.get_running_loop())
+        acquired = False
+        try:
+            while True:
+                waiter.event.clear()
+                api_key, wait_time = self.poll(waiter)
+                if api_key is not None:
+                    acquired = True
+                    return api_key
+
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return None
+
+                try:
+                    await asyncio.wait_for(waiter.event.wait(), remaining if wait_time is None else min(wait_time, remaining))
+                except asyncio.TimeoutError:
+                    pass
+        finally:
+            if not acquired:
+                self.dequeue(waiter)
+
+    # 不排队，立即检查能否发送，能够发送时扣除额度并返回分配到的密钥
+    def check_limiter(self, tokens: int) -> str | None:
+        with self.lock:
+            if self.waiters:
+                return None
+            return self.key_pool.try_acquire(tokens, time.time())[0]
 
     # 计算消息列表内容的tokens的函数
     def num_tokens_from_messages(self, messages) -> int:
         """Return the number of tokens used by a list of messages."""
-        try:
-            encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
-        except KeyError:
-            print("Warning: model not found. Using cl100k_base encoding.")
-            encoding = tiktoken.get_encoding("cl100k_base")
-
-        tokens_per_message = 3
-        tokens_per_name = 1
-        num_tokens = 0
-        for message in messages:
-            num_tokens += tokens_per_message
-            for key, value in message.items():
-                # 如果value是字符串类型才计算tokens，否则跳过，因为AI在调用函数时，会在content中回复null，导致报错
-                if isinstance(value, str):
-                    num_tokens += len(encoding.encode(value))
-                if key == "name":
-                    num_tokens += tokens_per_name
-        num_tokens += 3  # every reply is primed with <|start|>assistant<|message|>
-        return num_tokens
+        return self.token_counter.count_messages(messages)
 
 
     # 计算字符串内容的tokens的函数
     def num_tokens_from_str(self, text) -> int:
         """Return the number of tokens used by a list of messages."""
-        try:
-            encoding = tiktoken.encoding_for_model("gpt-3.5-turbo")
-        except KeyError:
-            print("Warning: model not found. Using cl100k_base encoding.")
-            encoding = tiktoken.get_encoding("cl100k_base")
-        if isinstance(text, str):
-            num_tokens = len(encoding.encode(text))
-        else:
-            num_tokens = 0
-
-        return num_tokens
+        return self.token_counter.count(text)
     
     def calculate_tokens(self, message1, text1,):
         """
@@ -0,0 +1,162 @@
+import re
+import time
+
+from ModuleFolders.TokenCounter.TokenCounter import TokenCounter
+
+
+class StreamChecker():
+    """流式回复检查器
+
+    在流式请求接收回复的过程中逐段解析 <textarea> 标签内的内容，按行检查数字序号，
+    出现拒绝翻译、缺少 <textarea> 标签、错行串行或行数过多等结构性错误时立即标记中止，
+    由请求器关闭连接，不再为后续的补全内容付费。
+    回复中出现多个 <textarea> 标签时，与 ResponseExtractor 一致以最后一个为准，每个新标签都重新检查。
+    完整回复的检查仍由 ResponseChecker 负责，本类只做能够提前发现的检查。
+    """
+
+    # 出现 <textarea> 标签之前允许的最大字符数（不含思考内容），超出则视为拒绝翻译或格式错误
+    PREAMBLE_MAX_LENGTH = 2048
+
+    # 以数字序号开头的行，与 ResponseExtractor.extract_text_to_dict 的分割规则一致
+    NUMBERED_LINE_PATTERN = re.compile(r"^(\d+)\.")
+
+    # 解析状态
+    STATE_PREAMBLE = 0
+    STATE_TEXTAREA = 1
+    STATE_CLOSED = 2
+
+    def __init__(self, line_count: int, strict: bool = True) -> None:
+        self.line_count = line_count
+
+        # 严格模式用于要求直接输出 <textarea> 的提示词，会检查标签前的内容长度并在出现错误时立即中止
+        # 思维链与自定义提示词会在译文前输出大量分析，也可能先输出草稿，只记录错误不中止
+        self.strict = strict
+
+        # 已接收的回复内容
+        self.think_parts = []
+        self.content_parts = []
+
+        # 解析状态
+        self.state = __class__.STATE_PREAMBLE
+        self.buffer = ""
+        self.expected_number = 1
+        self.block_error = ""
+
+        # 统计数据
+        self.start_time = time.time()
+        self.ttft = None
+        self.aborted = False
+        self.aborted_tokens = 0
+        self.error_content = ""
+
+    # 请求发出时调用，作为首个 Token 耗时的起点
+    def start(self) -> None:
+        self.start_time = time.time()
+
+    # 接收一段回复，返回 False 表示应中止请求
+    def feed(self, text: str, think: bool = False) -> bool:
+        if not text or self.aborted:
+            return not self.aborted
+
+        if self.ttft is None:
+            self.ttft = time.time() - self.start_time
+
+        # 思考内容不参与检查
+        if think == True:
+            self.think_parts.append(text)
+            return True
+
+        self.content_parts.append(text)
+        self.buffer = self.buffer + text
+
+        while True:
+            # 等待 <textarea> 标签出现，提取时使用最后一个标签，每出现新的标签都重新检查
+            if self.state != __class__.STATE_TEXTAREA:
+                start = self.buffer.find("<textarea")
+                end = self.buffer.find(">", start) if start >= 0 else -1
+                if end < 0:
+                    return self.check_preamble(start)
+
+                self.buffer = self.buffer[end + 1:]
+                self.state = __class__.STATE_TEXTAREA
+                self.expected_number = 1
+                self.block_error = ""
+
+            # 标签闭合后检查剩余的全部行，否则只检查已经完整接收的行
+            end = self.buffer.find("</textarea>")
+            if end >= 0:
+                lines, self.buffer = self.buffer[:end].split("\n"), self.buffer[end + len("</textarea>"):]
+                self.state = __class__.STATE_CLOSED
+            else:
+                *lines, self.buffer = self.buffer.split("\n")
+
+            for line in lines:
+                if not self.check_line(line):
+                    return False
+
+            if self.state == __class__.STATE_TEXTAREA:
+                return True
+
+    # 检查 <textarea> 标签之前的内容，start 为未完整接收的标签位置
+    def check_preamble(self, start: int) -> bool:
+        if self.state == __class__.STATE_PREAMBLE and self.strict:
+            preamble = self.buffer.split("</think>")[-1] if "</think>" in self.buffer else self.buffer
+            if "<think>" not in preamble and len(preamble) > __class__.PREAMBLE_MAX_LENGTH:
+                return self.abort("模型已拒绝翻译或格式错误，回复中没有 <textarea> 标签")
+            return True
+
+        # 不检查长度时只保留可能构成标签开头的部分
+        if start >= 0:
+            self.buffer = self.buffer[start:]
+        else:
+            self.buffer = self.buffer[-len("<textarea"):]
+        return True
+
+    # 检查一行的数字序号
+    def check_line(self, line: str) -> bool:
+        # 首个序号之前的空白会在提取时被去除
+        match = __class__.NUMBERED_LINE_PATTERN.match(line.lstrip() if self.expected_number == 1 else line)
+
+        # 单行原文不检查序号，与 ResponseChecker 保持一致
+        if match is None or self.line_count == 1:
+            return True
+
+        # 当前标签已出现错误时不再检查，等待新的标签
+        if self.block_error:
+            return True
+
+        number = int(match.group(1))
+        if number > self.line_count:
+            return self.fail("【行数错误】 - 行数不一致")
+        if number != self.expected_number:
+            return self.fail("【行数错误】 - 出现错行串行")
+
+        self.expected_number = self.expected_number + 1
+        return True
+
+    # 记录当前标签内的错误，严格模式下立即中止
+    def fail(self, error_content: str) -> bool:
+        self.block_error = error_content
+        if self.strict:
+            return self.abort(error_content)
+        return True
+
+    # 标记中止，并记录中止前已经产生的补全 Token 数量
+    def abort(self, error_content: str) -> bool:
+        self.aborted = True
+        self.error_content = error_content
+        token_counter = TokenCounter.get_singleton()
+        self.aborted_tokens = token_counter.compute("".join(self.think_parts) + "".join(self.content_parts), token_counter.mode)
+        return False
+
+    # 获取已接收的思考内容与回复内容，回复中的思考标签按与非流式请求相同的方式拆分
+    def get_result(self) -> tuple[str, str]:
+        response_think = "".join(self.think_parts)
+        response_content = "".join(self.content_parts)
+
+        if "</think>" in response_content:
+            splited = response_content.split("</think>")
+            response_think = splited[0].removeprefix("<think>").replace("\n\n", "\n")
+            response_content = splited[-1]
+
+        return response_think, response_content
@@ -677,7 +677,8 @@ class SimpleExecutor(Base):
         results = processor.extract_terms(
             items_data=items_data,
             model_name=params.get("model_name"), # 使用 model_name
-            entity_types=params.get("entity_types")
+            entity_types=params.get("entity_types"),
+            max_text_length=params.get("max_text_length"),
         )
         
         self.info(f"术语提取完成，共找到 {len(results)} 个术语。")
@@ -6,6 +6,7 @@ import urllib
 import rapidjson as json
 
 from Base.Base import Base
+from ModuleFolders.PromptBuilder.PromptMatcher import PromptMatcher
 from ModuleFolders.TaskConfig.TaskType import TaskType
 
 
@@ -15,6 +16,9 @@ class TaskConfig(Base):
     # 打印时的类型过滤器
     TYPE_FILTER = (int, str, bool, float, list, dict, tuple)
 
+    # 异步请求引擎自动模式下的最大并发数
+    ASYNC_MAX_CONCURRENCY = 1000
+
     def __init__(self) -> None:
         super().__init__()
         
@@ -68,6 +72,20 @@ class TaskConfig(Base):
         for key, value in config.items():
             setattr(self, key, value)
 
+        # 配置已更新，提示词匹配器需要重新构建
+        self.prompt_matcher = None
+
+    # 获取提示词匹配器，每次任务只构建一次，供所有翻译任务共用
+    def get_prompt_matcher(self) -> PromptMatcher:
+        with self._config_lock:
+            if getattr(self, "prompt_matcher", None) is None:
+                self.prompt_matcher = PromptMatcher(
+                    getattr(self, "prompt_dictionary_data", []),
+                    getattr(self, "characterization_data", []),
+                    getattr(self, "exclusion_list_data", []),
+                )
+            return self.prompt_matcher
+
     # 准备翻译
     def prepare_for_translation(self,mode) -> None:
 
@@ -106,9 +124,7 @@ class TaskConfig(Base):
         self.rpm_limit = self.platforms.get(self.target_platform).get("rpm_limit", 4096)    # 当取不到账号类型对应的预设值，则使用该值
         self.tpm_limit = self.platforms.get(self.target_platform).get("tpm_limit", 10000000)    # 当取不到账号类型对应的预设值，则使用该值
 
-        # 根据密钥数量给 RPM 和 TPM 限额翻倍
-        self.rpm_limit = self.rpm_limit * len(self.apikey_list)
-        self.tpm_limit = self.tpm_limit * len(self.apikey_list)
+        # 接口限额按单个密钥计算，由请求限制器为每个密钥分别维护额度
 
         # 如果开启自动设置输出文件夹功能，设置为输入文件夹的平级目录
         if self.auto_set_output_path == True:
@@ -131,7 +147,14 @@ class TaskConfig(Base):
 
 
         # 计算实际线程数
-        self.actual_thread_counts = self.thread_counts_setting(self.user_thread_counts,self.target_platform,self.rpm_limit)
+        self.actual_thread_counts = self.thread_counts_setting(self.user_thread_counts,self.target_platform,self.rpm_limit * len(self.apikey_list))
+
+        # 自动模式下开启自适应并发时，以实际线程数为初始值在上限内动态调整，本地接口以 slots 数为上限
+        self.adaptive_concurrency = self.user_thread_counts <= 0 and self.adaptive_concurrency_switch == True
+        if self.adaptive_concurrency == False or self.target_platform in ("sakura","LocalLLM"):
+            self.max_thread_counts = self.actual_thread_counts
+        else:
+            self.max_thread_counts = self.ASYNC_MAX_CONCURRENCY if self.async_request_switch == True else 100
 
 
     # 自动计算实际请求线程数
@@ -148,7 +171,7 @@ class TaskConfig(Base):
 
         # 如果用户没有指定线程数，则自动计算
         else :
-            actual_thread_counts = self.calculate_thread_count(rpm_limit)
+            actual_thread_counts = self.calculate_thread_count(rpm_limit, self.ASYNC_MAX_CONCURRENCY if self.async_request_switch == True else 100)
             self.info(f"根据账号类型和接口限额，自动设置同时执行的翻译任务数量为 {actual_thread_counts} 个 ...")
 
         return actual_thread_counts
@@ -167,12 +190,11 @@ class TaskConfig(Base):
             return num
         
     # 线性计算并发线程数
-    def calculate_thread_count(self,rpm_limit):
+    def calculate_thread_count(self,rpm_limit,max_threads = 100):
 
         min_rpm = 1
         max_rpm = 10000
         min_threads = 1
-        max_threads = 100
 
         if rpm_limit <= min_rpm:
             rpm_threads = min_threads
@@ -185,14 +207,14 @@ class TaskConfig(Base):
         rpm_threads = int(round(rpm_threads)) # 四舍五入取整
 
         # 确保线程数在 1-100 范围内，并使用 CPU 核心数作为辅助上限 
-        # 更简洁的方式是直接限制在 1-100 范围内，因为 100 通常已经足够高
-        actual_thread_counts = max(1, min(100, rpm_threads)) # 限制在 1-100
+        # 更简洁的方式是直接限制在 1-100 范围内，因为 100 通常已经足够高，异步请求引擎不占用线程，上限相应放宽
+        actual_thread_counts = max(1, min(max_threads, rpm_threads)) # 限制在 1-max_threads
 
         return actual_thread_counts
 
 
     # 获取接口配置信息包
-    def get_platform_configuration(self,platform_type):
+    def get_platform_configuration(self,platform_type,api_key = None):
 
         if platform_type == "translationReq":
             target_platform = self.api_settings["translate"]
@@ -204,7 +226,7 @@ class TaskConfig(Base):
             target_platform = self.api_settings.get("retry")
 
         api_url = self.base_url
-        api_key = self.get_next_apikey()
+        api_key = api_key if api_key is not None else self.get_next_apikey() # 未指定密钥时轮询获取
         api_format = self.platforms.get(target_platform).get("api_format")
         model_name = self.model
         region = self.platforms.get(target_platform).get("region",'')
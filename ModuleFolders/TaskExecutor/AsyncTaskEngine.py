@@ -0,0 +1,101 @@
+import asyncio
+import threading
+from typing import Callable
+
+from Base.Base import Base
+from ModuleFolders.RequestLimiter.ConcurrencyController import ConcurrencyController
+
+
+class AsyncTaskEngine(Base):
+    """异步请求引擎
+
+    在一个常驻的事件循环线程中并发执行任务的 start_async 协程，并发数由并发控制器控制，
+    少量线程即可维持成百上千个同时进行中的请求。
+    事件循环在多轮任务之间保持不变，以便复用与其绑定的异步客户端连接池。
+    """
+
+    # 检测停止事件的间隔时间
+    STOP_CHECK_INTERVAL = 0.5
+
+    def __init__(self) -> None:
+        super().__init__()
+
+        self.loop = None
+        self.loop_thread = None
+        self.loop_lock = threading.Lock()
+
+    # 获取常驻的事件循环，不存在时在后台线程中创建
+    def get_loop(self) -> asyncio.AbstractEventLoop:
+        with self.loop_lock:
+            if self.loop is None:
+                self.loop = asyncio.new_event_loop()
+                self.loop_thread = threading.Thread(
+                    target = self.loop.run_forever,
+                    name = "async_task_engine",
+                    daemon = True,
+                )
+                self.loop_thread.start()
+
+        return self.loop
+
+    # 等待空位，收到停止事件时返回 False
+    def acquire_slot(slots: threading.Semaphore) -> bool:
+        while Base.work_status != Base.STATUS.STOPING:
+            if slots.acquire(timeout = __class__.STOP_CHECK_INTERVAL):
+                return True
+        return False
+
+    # 执行任务，阻塞至全部任务完成或收到停止事件
+    # 任务在调用线程中按需取出并构建，避免构建消息列表时阻塞事件循环，已提交但未完成的任务数不超过 max_pending
+    def run(self, tasks, controller: ConcurrencyController, done_callback: Callable[[asyncio.Future], None], max_pending: int) -> None:
+        loop = self.get_loop()
+        slots = threading.Semaphore(max_pending)
+        futures = []
+
+        tasks = iter(tasks)
+        while __class__.acquire_slot(slots):
+            task = next(tasks, None)
+            if task is None:
+                break
+
+            futures.append(
+                asyncio.run_coroutine_threadsafe(
+                    self.submit_task(task, controller, done_callback, slots),
+                    loop,
+                ).result()
+            )
+
+        asyncio.run_coroutine_threadsafe(self.wait_tasks(futures), loop).result()
+
+    # 在事件循环中创建任务，任务完成时释放空位
+    async def submit_task(self, task, controller: ConcurrencyController, done_callback: Callable[[asyncio.Future], None], slots: threading.Semaphore) -> asyncio.Future:
+        async def run_task() -> dict:
+            await controller.acquire_async()
+            try:
+                # 排队期间收到停止事件时不再发起请求
+                if Base.work_status == Base.STATUS.STOPING:
+                    return {}
+                return await task.start_async()
+            finally:
+                controller.release()
+
+        # 与线程池模式一样，任务完成时通过回调更新统计数据，被取消的任务没有结果，不触发回调
+        def on_done(future: asyncio.Future) -> None:
+            slots.release()
+            if not future.cancelled():
+                done_callback(future)
+
+        future = asyncio.ensure_future(run_task())
+        future.add_done_callback(on_done)
+        return future
+
+    # 等待全部任务完成，期间收到停止事件则取消尚未完成的任务
+    async def wait_tasks(self, futures: list[asyncio.Future]) -> None:
+        pending = set(futures)
+        while pending:
+            _, pending = await asyncio.wait(pending, timeout = __class__.STOP_CHECK_INTERVAL)
+            if pending and Base.work_status == Base.STATUS.STOPING:
+                for future in pending:
+                    future.cancel()
+                await asyncio.gather(*pending, return_exceptions = True)
+                break
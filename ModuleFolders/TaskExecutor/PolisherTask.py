@@ -10,24 +10,28 @@ from rich.markup import escape
 from Base.Base import Base
 from Base.PluginManager import PluginManager
 from ModuleFolders.Cache.CacheItem import CacheItem, TranslationStatus
+from ModuleFolders.Cache.CacheManager import CacheManager
 from ModuleFolders.TaskConfig.TaskConfig import TaskConfig
 from ModuleFolders.LLMRequester.LLMRequester import LLMRequester
 from ModuleFolders.PromptBuilder.PromptBuilderPolishing import PromptBuilderPolishing
+from ModuleFolders.PromptBuilder.PromptBuilderEnum import PromptBuilderEnum
 from ModuleFolders.ResponseExtractor.ResponseExtractor import ResponseExtractor
 from ModuleFolders.ResponseChecker.ResponseChecker import ResponseChecker
+from ModuleFolders.ResponseChecker.StreamChecker import StreamChecker
 from ModuleFolders.RequestLimiter.RequestLimiter import RequestLimiter
 
 from ModuleFolders.TextProcessor.PolishTextProcessor import PolishTextProcessor
 
 class PolisherTask(Base):
 
-    def __init__(self, config: TaskConfig, plugin_manager: PluginManager, request_limiter: RequestLimiter) -> None:
+    def __init__(self, config: TaskConfig, plugin_manager: PluginManager, request_limiter: RequestLimiter, cache_manager: CacheManager = None) -> None:
         super().__init__()
 
         self.config = config
         self.plugin_manager = plugin_manager
         self.request_limiter = request_limiter
-        self.text_processor = PolishTextProcessor(self.config) # 文本处理器
+        self.cache_manager = cache_manager # 用于记录增量缓存日志
+        self.text_processor = PolishTextProcessor.get_shared(self.config) # 文本处理器，同一份规则的所有任务共用
 
         # 提示词与信息内容存储
         self.messages = []
@@ -35,6 +39,8 @@ class PolisherTask(Base):
 
         # 输出日志存储
         self.extra_log = []
+        # 流式回复检查器，未开启流式请求时为 None
+        self.stream_checker = None
 
 
     # 设置缓存数据
@@ -94,33 +100,84 @@ class PolisherTask(Base):
         # 任务开始的时间
         task_start_time = time.time()
 
-        while True:
-            # 检测是否收到停止翻译事件
-            if Base.work_status == Base.STATUS.STOPING:
-                return {}
+        # 排队等待 RPM 和 TPM 限制放行并分配密钥，收到停止翻译事件或超时则直接跳过当前任务，以避免死循环
+        api_key = self.request_limiter.acquire(
+            self.request_tokens_consume,
+            self.config.request_timeout,
+            stop_check = lambda: Base.work_status == Base.STATUS.STOPING,
+        )
+        if api_key is None:
+            return {}
+
+        # 获取接口配置信息包
+        platform_config = self.config.get_platform_configuration("polishingReq", api_key)
+
+        # 开启流式请求时，边接收边检查回复内容
+        self.stream_checker = self.create_stream_checker()
+
+        # 发起请求
+        request_start_time = time.time()
+        requester = LLMRequester()
+        skip, response_think, response_content, prompt_tokens, completion_tokens = requester.sent_request(
+            self.messages,
+            self.system_prompt,
+            platform_config,
+            self.stream_checker,
+        )
 
-            # 检查是否超时，超时则直接跳过当前任务，以避免死循环
-            if time.time() - task_start_time >= self.config.request_timeout:
-                return {}
+        # 反馈请求结果，以维护密钥的健康状态
+        self.request_limiter.report_result(api_key, not skip, time.time() - request_start_time, requester.last_exception)
 
-            # 检查 RPM 和 TPM 限制，如果符合条件，则继续
-            if self.request_limiter.check_limiter(self.request_tokens_consume):
-                break
+        return self.add_stream_stats(self.handle_response(task_start_time, skip, response_think, response_content, prompt_tokens, completion_tokens))
+
+    # 异步启动任务，供异步请求引擎调用
+    async def start_async(self) -> dict:
+        # 任务开始的时间
+        task_start_time = time.time()
 
-            # 如果以上条件都不符合，则间隔 1 秒再次检查
-            time.sleep(1)
+        # 排队等待 RPM 和 TPM 限制放行并分配密钥，超时则直接跳过当前任务
+        api_key = await self.request_limiter.acquire_async(self.request_tokens_consume, self.config.request_timeout)
+        if api_key is None:
+            return {}
 
         # 获取接口配置信息包
-        platform_config = self.config.get_platform_configuration("polishingReq")
+        platform_config = self.config.get_platform_configuration("polishingReq", api_key)
+
+        # 开启流式请求时，边接收边检查回复内容
+        self.stream_checker = self.create_stream_checker()
 
         # 发起请求
+        request_start_time = time.time()
         requester = LLMRequester()
-        skip, response_think, response_content, prompt_tokens, completion_tokens = requester.sent_request(
+        skip, response_think, response_content, prompt_tokens, completion_tokens = await requester.sent_request_async(
             self.messages,
             self.system_prompt,
-            platform_config
+            platform_config,
+            self.stream_checker,
         )
 
+        # 反馈请求结果，以维护密钥的健康状态
+        self.request_limiter.report_result(api_key, not skip, time.time() - request_start_time, requester.last_exception)
+
+        return self.add_stream_stats(self.handle_response(task_start_time, skip, response_think, response_content, prompt_tokens, completion_tokens))
+
+    # 开启流式请求时创建回复检查器，自定义提示词不做严格检查
+    def create_stream_checker(self) -> StreamChecker:
+        if self.config.response_stream_switch != True:
+            return None
+        strict = self.config.polishing_prompt_selection["last_selected_id"] == PromptBuilderEnum.POLISH_COMMON
+        return StreamChecker(len(self.source_text_dict), strict = strict)
+
+    # 在任务结果中附带流式请求的首个 Token 耗时与中止时已产生的 Token 数量
+    def add_stream_stats(self, result: dict) -> dict:
+        if self.stream_checker is not None and result:
+            result["ttft"] = self.stream_checker.ttft
+            result["aborted_tokens"] = self.stream_checker.aborted_tokens
+
+        return result
+
+    # 处理请求结果
+    def handle_response(self, task_start_time: float, skip: bool, response_think: str, response_content: str, prompt_tokens: int, completion_tokens: int) -> dict:
         # 如果请求结果标记为 skip，即有运行错误发生，则直接返回错误信息，停止后续任务
         if skip == True:
             return {
@@ -141,14 +198,17 @@ class PolisherTask(Base):
         # 提取回复内容
         response_dict = ResponseExtractor.text_extraction(self, text_dict, response_content)
 
-        # 检查回复内容
-        check_result, error_content = ResponseChecker.check_polish_response_content(
-            self,
-            self.config,
-            response_content,
-            response_dict,
-            text_dict
-        )
+        # 检查回复内容，流式请求已提前中止时直接使用中止的原因
+        if self.stream_checker is not None and self.stream_checker.aborted:
+            check_result, error_content = False, f"{self.stream_checker.error_content}，已提前中止请求"
+        else:
+            check_result, error_content = ResponseChecker.check_polish_response_content(
+                self,
+                self.config,
+                response_content,
+                response_dict,
+                text_dict
+            )
 
         # 去除回复内容的数字序号
         response_dict = ResponseExtractor.remove_numbered_prefix(self, response_dict)
@@ -191,6 +251,10 @@ class PolisherTask(Base):
                     item.polished_text = response
                     item.translation_status = TranslationStatus.POLISHED
 
+            # 记录变动条目到增量缓存日志
+            if self.cache_manager is not None:
+                self.cache_manager.append_journal_items(self.items)
+
 
             # 打印任务结果
             self.print(
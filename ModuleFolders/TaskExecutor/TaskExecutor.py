@@ -3,13 +3,13 @@ import threading
 import concurrent.futures
 
 import opencc
-from tqdm import tqdm
 
 from Base.Base import Base
 from ModuleFolders.Cache.CacheItem import TranslationStatus
 from ModuleFolders.Cache.CacheManager import CacheManager
 from ModuleFolders.Cache.CacheProject import CacheProjectStatistics
 from ModuleFolders.TaskConfig.TaskType import TaskType
+from ModuleFolders.TaskExecutor.AsyncTaskEngine import AsyncTaskEngine
 from ModuleFolders.TaskExecutor.TranslatorTask import TranslatorTask
 from ModuleFolders.TaskExecutor.PolisherTask import PolisherTask
 from ModuleFolders.TaskConfig.TaskConfig import TaskConfig
@@ -19,12 +19,17 @@ from ModuleFolders.PromptBuilder.PromptBuilderEnum import PromptBuilderEnum
 from ModuleFolders.PromptBuilder.PromptBuilderLocal import PromptBuilderLocal
 from ModuleFolders.PromptBuilder.PromptBuilderSakura import PromptBuilderSakura
 from ModuleFolders.RequestLimiter.RequestLimiter import RequestLimiter
+from ModuleFolders.TokenCounter.TokenCounter import TokenCounter
+from ModuleFolders.TranslationMemory.TranslationMemory import TranslationMemory
 from ModuleFolders.TaskExecutor.TranslatorUtil import get_source_language_for_file
 
 
 # 翻译器
 class TaskExecutor(Base):
 
+    # 超出并发上限后额外预先生成的任务数，保证有空位时总有构建好的任务可以立即执行
+    TASK_PREFETCH_COUNT = 8
+
     def __init__(self, plugin_manager,cache_manager, file_reader, file_writer) -> None:
         super().__init__()
 
@@ -35,6 +40,9 @@ class TaskExecutor(Base):
         self.file_writer = file_writer
         self.config = TaskConfig()
         self.request_limiter = RequestLimiter()
+        self.token_counter = TokenCounter.get_singleton()
+        self.translation_memory = TranslationMemory.get_singleton()
+        self.async_task_engine = AsyncTaskEngine()
 
         # 注册事件
         self.subscribe(Base.EVENT.TASK_STOP, self.task_stop)
@@ -84,7 +92,8 @@ class TaskExecutor(Base):
         output_config = {
             "translated_suffix": config.get('output_filename_suffix'),
             "bilingual_suffix": "_bilingual",
-            "bilingual_order": config.get('bilingual_text_order','translation_first') 
+            "bilingual_order": config.get('bilingual_text_order','translation_first'),
+            "parallel_write_switch": config.get('parallel_write_switch', True),
         }
 
         # 写入文件
@@ -93,6 +102,7 @@ class TaskExecutor(Base):
             output_path,
             inpput_path, 
             output_config, 
+            self.emit_output_progress,
         )
 
         self.print("")
@@ -104,6 +114,9 @@ class TaskExecutor(Base):
         # 设置运行状态为停止中
         Base.work_status = Base.STATUS.STOPING
 
+        # 唤醒正在排队等待请求限制的任务
+        self.request_limiter.wake_all()
+
         def target() -> None:
             while True:
                 time.sleep(0.5)
@@ -156,7 +169,18 @@ class TaskExecutor(Base):
         self.config.prepare_for_translation(TaskType.TRANSLATION)
 
         # 配置请求限制器
-        self.request_limiter.set_limit(self.config.tpm_limit, self.config.rpm_limit)
+        self.request_limiter.set_limit(self.config.tpm_limit, self.config.rpm_limit, self.config.rpm_burst, self.config.apikey_list)
+        self.request_limiter.concurrency_controller.configure(self.config.actual_thread_counts, self.config.max_thread_counts, self.config.adaptive_concurrency)
+
+        # 根据模型选择 Token 计数模式
+        self.token_counter.configure_for_model(self.config.model)
+
+        # 打开翻译记忆库
+        self.translation_memory.open(
+            TranslationMemory.get_project_path(self.config.label_output_path) if self.config.translation_memory_switch == True else None,
+            TranslationMemory.GLOBAL_PATH if self.config.global_translation_memory_switch == True else None,
+            self.config.target_language,
+        )
 
         # 初开始翻译时，生成监控数据
         if continue_status == False:
@@ -181,6 +205,7 @@ class TaskExecutor(Base):
             if Base.work_status == Base.STATUS.STOPING:
                 # 循环次数比实际最大轮次要多一轮，当触发停止翻译的事件时，最后都会从这里退出任务
                 # 执行到这里说明停止任意的任务已经执行完毕，可以重置内部状态了
+                self.translation_memory.close()
                 Base.work_status = Base.STATUS.TASKSTOPPED
                 return None
 
@@ -205,6 +230,10 @@ class TaskExecutor(Base):
             if current_round == 0 and continue_status == False:
                 self.project_status_data.total_line = item_count_status_untranslated
 
+            # 使用翻译记忆填充已有译文的条目，全部命中时直接进入下一轮
+            if self.apply_translation_memory() > 0 and self.cache_manager.get_item_count_by_status(TranslationStatus.UNTRANSLATED) == 0:
+                continue
+
             # 第二轮开始对半切分
             if current_round > 0:
                 self.config.lines_limit = max(1, int(self.config.lines_limit / 2))
@@ -215,25 +244,16 @@ class TaskExecutor(Base):
                 "line" if self.config.tokens_limit_switch == False else "token",
                 self.config.lines_limit if self.config.tokens_limit_switch == False else self.config.tokens_limit,
                 self.config.pre_line_counts,
-                TaskType.TRANSLATION
+                TaskType.TRANSLATION,
+                self.config.chunk_strategy,
+                self.config.deduplication_switch,
             )
 
-            # 生成翻译任务合集列表
-            tasks_list = []
-            print("")
-            self.info(f"正在生成翻译任务 ...")
-            for chunk, previous_chunk, file_path in tqdm(zip(chunks, previous_chunks, file_paths),desc="生成翻译任务", total=len(chunks)):
-                # 确定该任务的主语言
-                language_stats = self.cache_manager.project.get_file(file_path).language_stats # 获取该文件的语言检测数据
-                file_source_lang = get_source_language_for_file(self.config.source_language,self.config.target_language,language_stats)
-
-                task = TranslatorTask(self.config, self.plugin_manager, self.request_limiter, file_source_lang)  # 实例化
-                task.set_items(chunk)  # 传入该任务待翻译原文
-                task.set_previous_items(previous_chunk)  # 传入该任务待翻译原文的上文
-                task.prepare(self.config.target_platform)  # 预先构建消息列表
-                tasks_list.append(task)
-            self.info(f"已经生成全部翻译任务 ...")
-            self.print("")
+            # 输出去重的效果
+            self.print_dedup_stats()
+
+            # 翻译任务在执行时按需逐个生成
+            tasks = self.generate_translation_tasks(chunks, previous_chunks, file_paths)
 
             # 输出开始翻译的日志
             self.print("")
@@ -249,6 +269,7 @@ class TaskExecutor(Base):
             self.print("")
             self.info(f"RPM 限额 - {self.config.rpm_limit}")
             self.info(f"TPM 限额 - {self.config.tpm_limit}")
+            self.info(f"密钥数量 - {len(set(self.config.apikey_list))}，限额按每个密钥分别计算")
 
             # 根据提示词规则打印基础指令
             system = ""
@@ -265,21 +286,25 @@ class TaskExecutor(Base):
             if system:
                 self.info(f"本次任务使用以下基础提示词：\n{system}\n") 
 
-            self.info(f"即将开始执行翻译任务，预计任务总数为 {len(tasks_list)}, 同时执行的任务数量为 {self.config.actual_thread_counts}，请注意保持网络通畅 ...")
-            time.sleep(3)
+            self.info(f"即将开始执行翻译任务，预计任务总数为 {len(chunks)}, 同时执行的任务数量为 {self.request_limiter.concurrency_controller.get_limit()}，请注意保持网络通畅 ...")
             self.print("")
 
-            # 开始执行翻译任务,构建异步线程池
-            with concurrent.futures.ThreadPoolExecutor(max_workers = self.config.actual_thread_counts, thread_name_prefix = "translator") as executor:
-                for task in tasks_list:
-                    future = executor.submit(task.start)
-                    future.add_done_callback(self.task_done_callback)  # 为future对象添加一个回调函数，当任务完成时会被调用，更新数据
+            # 开始执行翻译任务
+            self.execute_tasks(tasks)
 
         # 检查是否还有未翻译的内容，如果有则尝试使用重试接口
         final_untranslated_count = self.cache_manager.get_item_count_by_status(TranslationStatus.UNTRANSLATED)
         if final_untranslated_count > 0:
             self.try_retry_translation_for_remaining()
 
+        # 输出 Token 计数缓存的统计数据
+        self.debug(f"Token 计数统计 - {self.token_counter.get_stats()}")
+        self.print_stream_stats()
+
+        # 输出翻译记忆的统计数据，并关闭记忆库
+        self.print_translation_memory_stats()
+        self.translation_memory.close()
+
         # 等待可能存在的缓存文件写入请求处理完毕
         time.sleep(CacheManager.SAVE_INTERVAL)
 
@@ -305,7 +330,8 @@ class TaskExecutor(Base):
         output_config = {
              "translated_suffix": self.config.output_filename_suffix,
              "bilingual_suffix": "_bilingual",
-             "bilingual_order": self.config.bilingual_text_order 
+             "bilingual_order": self.config.bilingual_text_order,
+             "parallel_write_switch": self.config.parallel_write_switch,
         }
 
         # 写入文件
@@ -314,6 +340,7 @@ class TaskExecutor(Base):
             self.config.label_output_path,
             self.config.label_input_path,
             output_config,
+            self.emit_output_progress,
         )
         self.print("")
         self.info(f"翻译结果已保存至 {self.config.label_output_path} 目录 ...")
@@ -342,7 +369,11 @@ class TaskExecutor(Base):
         self.config.prepare_for_translation(TaskType.POLISH)
 
         # 配置请求限制器
-        self.request_limiter.set_limit(self.config.tpm_limit, self.config.rpm_limit)
+        self.request_limiter.set_limit(self.config.tpm_limit, self.config.rpm_limit, self.config.rpm_burst, self.config.apikey_list)
+        self.request_limiter.concurrency_controller.configure(self.config.actual_thread_counts, self.config.max_thread_counts, self.config.adaptive_concurrency)
+
+        # 根据模型选择 Token 计数模式
+        self.token_counter.configure_for_model(self.config.model)
 
         # 初开始任务时，生成监控数据
         if continue_status == False:
@@ -405,28 +436,20 @@ class TaskExecutor(Base):
                     "line" if self.config.tokens_limit_switch == False else "token",
                     self.config.lines_limit if self.config.tokens_limit_switch == False else self.config.tokens_limit,
                     self.config.polishing_pre_line_counts,
-                    TaskType.TRANSLATION
+                    TaskType.TRANSLATION,
+                    self.config.chunk_strategy,
                 )
             elif self.config.polishing_mode_selection == "translated_text_polish":
                 chunks, previous_chunks, file_paths = self.cache_manager.generate_item_chunks(
                     "line" if self.config.tokens_limit_switch == False else "token",
                     self.config.lines_limit if self.config.tokens_limit_switch == False else self.config.tokens_limit,
                     self.config.polishing_pre_line_counts,
-                    TaskType.POLISH
+                    TaskType.POLISH,
+                    self.config.chunk_strategy,
                 )
 
-            # 生成润色任务合集列表
-            tasks_list = []
-            print("")
-            self.info(f"正在生成润色任务 ...")
-            for chunk, previous_chunk, file_path in tqdm(zip(chunks, previous_chunks, file_paths),desc="生成润色任务", total=len(chunks)):
-                task = PolisherTask(self.config, self.plugin_manager, self.request_limiter)  # 实例化
-                task.set_items(chunk)  # 传入该任务待润色文
-                task.set_previous_items(previous_chunk)  # 传入该任务待润色文的上文
-                task.prepare()  # 预先构建消息列表
-                tasks_list.append(task)
-            self.info(f"已经生成全部润色任务 ...")
-            self.print("")
+            # 润色任务在执行时按需逐个生成
+            tasks = self.generate_polish_tasks(chunks, previous_chunks)
 
             # 输出开始翻译的日志
             self.print("")
@@ -440,6 +463,7 @@ class TaskExecutor(Base):
             self.print("")
             self.info(f"RPM 限额 - {self.config.rpm_limit}")
             self.info(f"TPM 限额 - {self.config.tpm_limit}")
+            self.info(f"密钥数量 - {len(set(self.config.apikey_list))}，限额按每个密钥分别计算")
 
             # 根据提示词规则打印基础指令
             system = ""
@@ -451,15 +475,15 @@ class TaskExecutor(Base):
             if system:
                 self.info(f"本次任务使用以下基础提示词：\n{system}\n") 
 
-            self.info(f"即将开始执行润色任务，预计任务总数为 {len(tasks_list)}, 同时执行的任务数量为 {self.config.actual_thread_counts}，请注意保持网络通畅 ...")
-            time.sleep(3)
+            self.info(f"即将开始执行润色任务，预计任务总数为 {len(chunks)}, 同时执行的任务数量为 {self.request_limiter.concurrency_controller.get_limit()}，请注意保持网络通畅 ...")
             self.print("")
 
-            # 开始执行润色务,构建异步线程池
-            with concurrent.futures.ThreadPoolExecutor(max_workers = self.config.actual_thread_counts, thread_name_prefix = "translator") as executor:
-                for task in tasks_list:
-                    future = executor.submit(task.start)
-                    future.add_done_callback(self.task_done_callback)  # 为future对象添加一个回调函数，当任务完成时会被调用，更新数据
+            # 开始执行润色任务
+            self.execute_tasks(tasks)
+
+        # 输出 Token 计数缓存的统计数据
+        self.debug(f"Token 计数统计 - {self.token_counter.get_stats()}")
+        self.print_stream_stats()
 
         # 等待可能存在的缓存文件写入请求处理完毕
         time.sleep(CacheManager.SAVE_INTERVAL)
@@ -468,7 +492,8 @@ class TaskExecutor(Base):
         output_config = {
              "translated_suffix": self.config.output_filename_suffix,
              "bilingual_suffix": "_bilingual",
-             "bilingual_order": self.config.bilingual_text_order 
+             "bilingual_order": self.config.bilingual_text_order,
+             "parallel_write_switch": self.config.parallel_write_switch,
         }
 
         # 写入文件
@@ -477,6 +502,7 @@ class TaskExecutor(Base):
             self.config.polishing_output_path,
             self.config.label_input_path,
             output_config,
+            self.emit_output_progress,
         )
         self.print("")
         self.info(f"润色结果已保存至 {self.config.polishing_output_path} 目录 ...")
@@ -561,6 +587,7 @@ class TaskExecutor(Base):
             # 重新初始化翻译平台配置
             if hasattr(self.config, 'prepare_for_translation'):
                 self.config.prepare_for_translation(TaskType.TRANSLATION)
+            self.token_counter.configure_for_model(self.config.model)
 
             # 使用较小的批次大小进行重试（避免再次失败）
             retry_lines_limit = max(1, int(self.config.lines_limit / 4))  # 使用1/4的批次大小
@@ -571,25 +598,13 @@ class TaskExecutor(Base):
                 "line" if self.config.tokens_limit_switch == False else "token",
                 retry_lines_limit if self.config.tokens_limit_switch == False else retry_tokens_limit,
                 self.config.pre_line_counts,
-                TaskType.TRANSLATION
+                TaskType.TRANSLATION,
+                self.config.chunk_strategy,
+                self.config.deduplication_switch,
             )
 
-            # 生成重试翻译任务列表
-            retry_tasks_list = []
-            self.info(f"正在生成重试翻译任务...")
-            for chunk, previous_chunk, file_path in tqdm(zip(chunks, previous_chunks, file_paths), desc="生成重试任务", total=len(chunks)):
-                # 确定该任务的主语言
-                language_stats = self.cache_manager.project.get_file(file_path).language_stats
-                file_source_lang = get_source_language_for_file(self.config.source_language, self.config.target_language, language_stats)
-
-                task = TranslatorTask(self.config, self.plugin_manager, self.request_limiter, file_source_lang)
-                task.set_items(chunk)
-                task.set_previous_items(previous_chunk)
-                task.prepare(self.config.target_platform)
-                retry_tasks_list.append(task)
-
-            self.info(f"已生成 {len(retry_tasks_list)} 个重试翻译任务")
-            self.print("")
+            # 重试任务与正常轮次一样在执行时按需逐个生成
+            retry_tasks = self.generate_translation_tasks(chunks, previous_chunks, file_paths)
 
             # 输出重试接口信息和调试信息
             retry_platform_name = retry_platform_config.get("name", "未知")
@@ -610,15 +625,14 @@ class TaskExecutor(Base):
             
             self.print("")
 
-            self.info(f"开始执行重试翻译任务，任务数量为 {len(retry_tasks_list)}...")
-            time.sleep(2)
+            self.info(f"开始执行重试翻译任务，任务数量为 {len(chunks)}...")
             self.print("")
 
             # 执行重试翻译任务（使用单线程，避免过载）
             retry_success_count = 0
-            retry_total_count = len(retry_tasks_list)
+            retry_total_count = len(chunks)
             
-            for i, task in enumerate(retry_tasks_list, 1):
+            for i, task in enumerate(retry_tasks, 1):
                 # 检测是否需要停止任务
                 if Base.work_status == Base.STATUS.STOPING:
                     break
@@ -675,6 +689,130 @@ class TaskExecutor(Base):
             except:
                 pass
 
+    # 使用翻译记忆填充待翻译的条目，返回命中的条目数量
+    def apply_translation_memory(self) -> int:
+        if not self.translation_memory.is_enabled():
+            return 0
+
+        hit_items = self.translation_memory.apply(list(self.cache_manager.project.items_iter()))
+        if not hit_items:
+            return 0
+
+        # 记录变动条目到增量缓存日志，并请求保存缓存文件
+        self.cache_manager.append_journal_items(hit_items)
+        self.cache_manager.require_save_to_file(self.config.label_output_path)
+
+        # 更新翻译进度
+        with self.project_status_data.atomic_scope():
+            self.project_status_data.line += len(hit_items)
+            stats_dict = self.project_status_data.to_dict()
+        self.emit(Base.EVENT.TASK_UPDATE, stats_dict)
+
+        self.info(f"翻译记忆命中 {len(hit_items)} 行，已直接填入译文 ...")
+        return len(hit_items)
+
+    # 输出翻译记忆的统计数据
+    def print_translation_memory_stats(self) -> None:
+        stats = self.translation_memory.get_stats()
+        if stats.get("lookups") == 0:
+            return None
+
+        self.info(
+            f"翻译记忆查询 {stats.get("lookups")} 次，精确命中 {stats.get("exact_hits")} 次，规范化命中 {stats.get("normalized_hits")} 次，"
+            + f"命中率 {stats.get("hit_rate") * 100:.2f}%，写入 {stats.get("stored")} 条"
+        )
+
+    # 通知界面翻译结果的输出进度
+    def emit_output_progress(self, completed: int, total: int) -> None:
+        self.emit(Base.EVENT.TASK_OUTPUT_PROGRESS, {
+            "completed": completed,
+            "total": total,
+        })
+
+    # 输出去重的效果
+    def print_dedup_stats(self) -> None:
+        stats = self.cache_manager.dedup_stats
+        if stats.get("duplicate_items", 0) == 0:
+            return None
+
+        self.info(
+            f"去重 - 待翻译 {stats.get("items")} 行，其中重复原文 {stats.get("duplicate_items")} 行，"
+            + f"预计减少 {stats.get("requests_saved")} 个请求、{stats.get("tokens_saved")} Tokens"
+        )
+
+    # 输出流式请求的统计数据
+    def print_stream_stats(self) -> None:
+        stats = self.project_status_data
+        if stats.stream_requests == 0:
+            return None
+
+        self.info(
+            f"流式请求 {stats.stream_requests} 次，平均首个 Token 耗时 {stats.total_ttft / stats.stream_requests:.2f} 秒，"
+            + f"提前中止 {stats.aborted_requests} 次，中止时已产生 {stats.aborted_tokens} Tokens"
+        )
+
+    # 按需逐个生成翻译任务，收到停止事件后不再生成
+    def generate_translation_tasks(self, chunks: list, previous_chunks: list, file_paths: list):
+        for chunk, previous_chunk, file_path in zip(chunks, previous_chunks, file_paths):
+            if Base.work_status == Base.STATUS.STOPING:
+                return
+
+            # 确定该任务的主语言
+            language_stats = self.cache_manager.project.get_file(file_path).language_stats # 获取该文件的语言检测数据
+            file_source_lang = get_source_language_for_file(self.config.source_language,self.config.target_language,language_stats)
+
+            task = TranslatorTask(self.config, self.plugin_manager, self.request_limiter, file_source_lang, self.cache_manager)  # 实例化
+            task.set_items(chunk)  # 传入该任务待翻译原文
+            task.set_previous_items(previous_chunk)  # 传入该任务待翻译原文的上文
+            task.prepare(self.config.target_platform)  # 构建消息列表
+            yield task
+
+    # 按需逐个生成润色任务，收到停止事件后不再生成
+    def generate_polish_tasks(self, chunks: list, previous_chunks: list):
+        for chunk, previous_chunk in zip(chunks, previous_chunks):
+            if Base.work_status == Base.STATUS.STOPING:
+                return
+
+            task = PolisherTask(self.config, self.plugin_manager, self.request_limiter, self.cache_manager)  # 实例化
+            task.set_items(chunk)  # 传入该任务待润色文
+            task.set_previous_items(previous_chunk)  # 传入该任务待润色文的上文
+            task.prepare()  # 构建消息列表
+            yield task
+
+    # 执行任务，阻塞至全部任务完成
+    def execute_tasks(self, tasks) -> None:
+        # 有空位时才从生成器中取出并构建下一个任务，已构建但未完成的任务数不超过并发上限加预取数
+        max_pending = self.request_limiter.concurrency_controller.max_limit + __class__.TASK_PREFETCH_COUNT
+
+        # 使用异步请求引擎
+        if self.config.async_request_switch == True:
+            self.async_task_engine.run(tasks, self.request_limiter.concurrency_controller, self.task_done_callback, max_pending)
+            return None
+
+        # 构建线程池，线程数为并发上限，实际同时执行的任务数由并发控制器决定
+        slots = threading.Semaphore(max_pending)
+        tasks = iter(tasks)
+        with concurrent.futures.ThreadPoolExecutor(max_workers = self.request_limiter.concurrency_controller.max_limit, thread_name_prefix = "translator") as executor:
+            while AsyncTaskEngine.acquire_slot(slots):
+                task = next(tasks, None)
+                if task is None:
+                    break
+
+                future = executor.submit(self.run_task, task)
+                future.add_done_callback(lambda _: slots.release())
+                future.add_done_callback(self.task_done_callback)  # 为future对象添加一个回调函数，当任务完成时会被调用，更新数据
+
+    # 获得并发控制器的许可后执行任务
+    def run_task(self, task) -> dict:
+        controller = self.request_limiter.concurrency_controller
+        if not controller.acquire(stop_check = lambda: Base.work_status == Base.STATUS.STOPING):
+            return {}
+
+        try:
+            return task.start()
+        finally:
+            controller.release()
+
     # 单个翻译任务完成时,更新项目进度状态   
     def task_done_callback(self, future: concurrent.futures.Future) -> None:
         try:
@@ -693,8 +831,18 @@ class TaskExecutor(Base):
                 self.project_status_data.token += result.get("prompt_tokens", 0) + result.get("completion_tokens", 0)
                 self.project_status_data.total_completion_tokens += result.get("completion_tokens", 0)
                 self.project_status_data.time = time.time() - self.project_status_data.start_time
+                if result.get("ttft") is not None:
+                    self.project_status_data.stream_requests += 1
+                    self.project_status_data.total_ttft += result.get("ttft")
+                if result.get("aborted_tokens", 0) > 0:
+                    self.project_status_data.aborted_requests += 1
+                    self.project_status_data.aborted_tokens += result.get("aborted_tokens")
                 stats_dict = self.project_status_data.to_dict()
 
+            # 附带密钥池与并发控制器的状态，供监控页面显示
+            stats_dict["key_pool"] = self.request_limiter.get_key_pool_stats()
+            stats_dict["concurrency"] = self.request_limiter.concurrency_controller.get_stats()
+
             # 请求保存缓存文件
             self.cache_manager.require_save_to_file(self.config.label_output_path)
 
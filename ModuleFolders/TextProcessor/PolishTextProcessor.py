@@ -1,6 +1,8 @@
 import re
 from typing import List, Dict, Optional, Any
 
+from ModuleFolders.TextProcessor.TextProcessor import ProcessorCache
+
 # 与TextProcessor基本一样
 class PolishTextProcessor():
 
@@ -8,6 +10,9 @@ class PolishTextProcessor():
     RE_DIGITAL_SEQ_PRE_STR = r'^(\d+)\.'
     RE_DIGITAL_SEQ_REC_STR = r'^【(\d+)】'
 
+    # 共用的处理器缓存
+    SHARED_CACHE = ProcessorCache()
+
     def __init__(self, config: Any):
         super().__init__()
 
@@ -23,6 +28,13 @@ class PolishTextProcessor():
             getattr(config, 'post_translation_data', None)
         )
 
+    # 获取配置对应的共用处理器，处理器构建后只读，可在多个任务间共用
+    def get_shared(config: Any) -> "PolishTextProcessor":
+        return __class__.SHARED_CACHE.get(
+            lambda: PolishTextProcessor(config),
+            (getattr(config, 'pre_translation_data', None), getattr(config, 'post_translation_data', None)),
+        )
+
     def _compile_translation_rules(self, rules_data: Optional[List[Dict]]) -> List[Dict]:
         """
         编译翻译替换规则，将规则中的正则表达式字符串预编译成 re.Pattern 对象。
@@ -1,7 +1,59 @@
+import hashlib
 import json
 import os
 import re
-from typing import List, Dict, Tuple, Any, Optional
+import threading
+from typing import List, Dict, Tuple, Any, Optional, Callable
+
+
+class ProcessorCache:
+    """文本处理器缓存
+
+    编译全部替换与自动处理规则的耗时远大于单个任务的文本处理，
+    同一份规则只构建一个处理器，供所有任务只读共用。
+    规则数据或正则库文件变化时（如在界面中修改了规则表），指纹随之变化并重新构建。
+    """
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.rules_data: tuple = None  # 构建时使用的规则数据，同一份数据不必重新计算指纹
+        self.file_state: tuple = None
+        self.fingerprint: str = None
+        self.processor = None
+
+    # 获取文件状态，文件不存在时返回 None
+    def get_file_state(path: str) -> tuple[int, int] | None:
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        return stat.st_size, stat.st_mtime_ns
+
+    # 计算规则指纹
+    def get_fingerprint(rules_data: tuple, file_state: tuple) -> str:
+        data = json.dumps([rules_data, file_state], ensure_ascii = False, sort_keys = True, default = repr)
+        return hashlib.blake2b(data.encode("utf-8", "surrogatepass"), digest_size = 16).hexdigest()
+
+    # 获取规则对应的处理器，规则未变化时直接复用
+    def get(self, factory: Callable[[], Any], rules_data: tuple, file_state: tuple = None) -> Any:
+        with self.lock:
+            # 仍是同一份配置数据时跳过指纹计算
+            if (
+                self.processor is not None
+                and self.file_state == file_state
+                and len(self.rules_data) == len(rules_data)
+                and all(a is b for a, b in zip(self.rules_data, rules_data))
+            ):
+                return self.processor
+
+            fingerprint = __class__.get_fingerprint(rules_data, file_state)
+            if self.processor is None or self.fingerprint != fingerprint:
+                self.processor = factory()
+                self.fingerprint = fingerprint
+            self.rules_data = rules_data
+            self.file_state = file_state
+            return self.processor
+
 
 class TextProcessor():
     # 定义日语字符集的正则表达式
@@ -24,6 +76,9 @@ class TextProcessor():
     RE_DIGITAL_SEQ_REC_STR = r'^【(\d+)】'
     RE_WHITESPACE_AFFIX_STR = r'^(\s*)(.*?)(\s*)$'
 
+    # 共用的处理器缓存
+    SHARED_CACHE = ProcessorCache()
+
     def __init__(self, config: Any):
         super().__init__()
 
@@ -65,6 +120,14 @@ class TextProcessor():
             for p_str in special_placeholder_pattern_strings if p_str
         ]
 
+    # 获取配置对应的共用处理器，处理器构建后只读，可在多个任务间共用
+    def get_shared(config: Any) -> "TextProcessor":
+        return __class__.SHARED_CACHE.get(
+            lambda: TextProcessor(config),
+            (config.pre_translation_data, config.post_translation_data, config.exclusion_list_data),
+            ProcessorCache.get_file_state(__class__.DEFAULT_REGEX_DIR),
+        )
+
     def _normalize_line_endings(self, text: str) -> Tuple[str, List[Tuple[int, str]]]:
         """
         统一换行符为 \n，并记录每个换行符的原始类型和位置
@@ -0,0 +1,169 @@
+import os
+import re
+import threading
+from collections import OrderedDict
+
+import tiktoken  # 需要安装库pip install tiktoken
+import tiktoken_ext  # 必须导入这两个库，否则打包后无法运行
+from tiktoken_ext import openai_public
+
+
+class TokenCounter:
+    """Token 计数服务
+
+    全局共用一个编码器实例，并以有界 LRU 缓存最近计算过的文本：
+    - exact 模式使用 cl100k_base 编码器精确计数
+    - approximate 模式按字符类别估算，用于分词器不是 cl100k 的模型，速度远快于编码
+    缓存同时受条目数与总字符数限制，超出时淘汰最久未使用的文本
+    """
+
+    MODE_EXACT = "exact"
+    MODE_APPROXIMATE = "approximate"
+
+    ENCODING_NAME = "cl100k_base"
+
+    # 缓存上限
+    CACHE_MAX_ENTRIES = 4096
+    CACHE_MAX_CHARS = 8 * 1024 * 1024
+
+    # 批量编码使用的线程数
+    ENCODE_THREADS = min(8, os.cpu_count() or 1)
+
+    # 估算模式下的字符类别：拉丁字母串、数字串、空白，其余字符逐个计数
+    APPROXIMATE_WORD_PATTERN = re.compile(r"[A-Za-z\u00C0-\u024F]+")
+    APPROXIMATE_NUMBER_PATTERN = re.compile(r"[0-9]+")
+    APPROXIMATE_SPACE_PATTERN = re.compile(r"\s")
+
+    # 单一实例
+    _singleton = None
+    _singleton_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self.mode = __class__.MODE_EXACT
+        self.lock = threading.Lock()
+        self.encoding = None
+
+        # LRU 缓存与统计数据
+        self.cache: OrderedDict[str, int] = OrderedDict()
+        self.cache_chars = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    # 获取单例
+    def get_singleton() -> "TokenCounter":
+        if TokenCounter._singleton is None:
+            with TokenCounter._singleton_lock:
+                if TokenCounter._singleton is None:
+                    TokenCounter._singleton = TokenCounter()
+
+        return TokenCounter._singleton
+
+    # 根据模型名称选择计数模式，分词器不是 cl100k 的模型使用估算模式
+    def configure_for_model(self, model: str) -> str:
+        try:
+            encoding_name = tiktoken.encoding_name_for_model(model)
+        except KeyError:
+            encoding_name = None
+
+        self.set_mode(__class__.MODE_EXACT if encoding_name == __class__.ENCODING_NAME else __class__.MODE_APPROXIMATE)
+        return self.mode
+
+    # 切换计数模式，不同模式的结果不能混用，切换时清空缓存
+    def set_mode(self, mode: str) -> None:
+        with self.lock:
+            if mode != self.mode:
+                self.mode = mode
+                self.cache.clear()
+                self.cache_chars = 0
+
+    # 获取共用的编码器
+    def get_encoding(self) -> tiktoken.Encoding:
+        if self.encoding is None:
+            self.encoding = tiktoken.get_encoding(__class__.ENCODING_NAME)
+
+        return self.encoding
+
+    # 计算单个字符串的 Token 数
+    def count(self, text: str) -> int:
+        if not isinstance(text, str) or text == "":
+            return 0
+
+        with self.lock:
+            num_tokens = self.cache.get(text)
+            if num_tokens is not None:
+                self.cache.move_to_end(text)
+                self.hits += 1
+                return num_tokens
+            self.misses += 1
+            mode = self.mode
+
+        num_tokens = self.compute(text, mode)
+
+        with self.lock:
+            # 计算期间模式可能已被切换，此时结果不再写入缓存
+            if mode == self.mode and text not in self.cache:
+                self.cache[text] = num_tokens
+                self.cache_chars += len(text)
+                while self.cache and (len(self.cache) > __class__.CACHE_MAX_ENTRIES or self.cache_chars > __class__.CACHE_MAX_CHARS):
+                    evicted, _ = self.cache.popitem(last = False)
+                    self.cache_chars -= len(evicted)
+                    self.evictions += 1
+
+        return num_tokens
+
+    # 批量计算字符串的 Token 数，结果不写入缓存，适合一次性处理大量互不重复的文本
+    def count_batch(self, texts: list[str]) -> list[int]:
+        if self.mode == __class__.MODE_APPROXIMATE:
+            return [__class__.approximate(text) for text in texts]
+
+        tokens_list = self.get_encoding().encode_ordinary_batch(texts, num_threads = __class__.ENCODE_THREADS)
+        return [len(tokens) for tokens in tokens_list]
+
+    # 计算消息列表的 Token 数
+    def count_messages(self, messages: list[dict]) -> int:
+        tokens_per_message = 3
+        tokens_per_name = 1
+        num_tokens = 0
+        for message in messages:
+            num_tokens += tokens_per_message
+            for key, value in message.items():
+                # 如果value是字符串类型才计算tokens，否则跳过，因为AI在调用函数时，会在content中回复null，导致报错
+                if isinstance(value, str):
+                    num_tokens += self.count(value)
+                if key == "name":
+                    num_tokens += tokens_per_name
+        num_tokens += 3  # every reply is primed with <|start|>assistant<|message|>
+        return num_tokens
+
+    # 按指定模式计算 Token 数
+    def compute(self, text: str, mode: str) -> int:
+        if mode == __class__.MODE_APPROXIMATE:
+            return __class__.approximate(text)
+
+        return len(self.get_encoding().encode_ordinary(text))
+
+    # 按字符类别估算 Token 数
+    def approximate(text: str) -> int:
+        # 中日韩文字与标点符号约 1 个字符一个 Token，先按字符数计数，再修正拉丁字母串、数字串与空白
+        # 中日韩文本中字母与数字很少，只需查找这几类字符，不必逐个字符匹配
+        num_tokens = len(text)
+        for word in __class__.APPROXIMATE_WORD_PATTERN.findall(text):
+            num_tokens += (len(word) + 3) // 4 - len(word) # 拉丁字母约 4 个字符一个 Token
+        for number in __class__.APPROXIMATE_NUMBER_PATTERN.findall(text):
+            num_tokens += (len(number) + 2) // 3 - len(number) # 数字每 3 位一个 Token
+        return num_tokens - len(__class__.APPROXIMATE_SPACE_PATTERN.findall(text)) # 空白不计数
+
+    # 获取缓存统计数据
+    def get_stats(self) -> dict:
+        with self.lock:
+            total = self.hits + self.misses
+            return {
+                "mode": self.mode,
+                "entries": len(self.cache),
+                "chars": self.cache_chars,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / total if total > 0 else 0.0,
+            }
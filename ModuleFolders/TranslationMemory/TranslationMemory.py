@@ -0,0 +1,226 @@
+import os
+import re
+import time
+import sqlite3
+import hashlib
+import threading
+import unicodedata
+
+from ModuleFolders.Cache.CacheItem import CacheItem, TranslationStatus
+
+
+# 单个翻译记忆库文件
+class TranslationMemoryStore:
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS memory (
+            target_language TEXT NOT NULL,
+            key TEXT NOT NULL,
+            source_text TEXT NOT NULL,
+            translated_text TEXT NOT NULL,
+            model TEXT NOT NULL,
+            updated REAL NOT NULL,
+            PRIMARY KEY (target_language, key)
+        );
+    """
+
+    # 单次查询的最大参数数量
+    QUERY_BATCH_SIZE = 500
+
+    def __init__(self, db_path: str) -> None:
+        self.db_path = db_path
+        self.lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or ".", exist_ok = True)
+        self.connection = sqlite3.connect(db_path, check_same_thread = False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(__class__.SCHEMA)
+
+    def close(self) -> None:
+        with self.lock:
+            self.connection.close()
+
+    # 按键批量查询，返回 {键: (原文, 译文, 模型)}
+    def lookup(self, target_language: str, keys: list[str]) -> dict[str, tuple[str, str, str]]:
+        result = {}
+        with self.lock:
+            for i in range(0, len(keys), __class__.QUERY_BATCH_SIZE):
+                batch = keys[i : i + __class__.QUERY_BATCH_SIZE]
+                rows = self.connection.execute(
+                    f"SELECT key, source_text, translated_text, model FROM memory WHERE target_language = ? AND key IN ({",".join("?" * len(batch))})",
+                    (target_language, *batch),
+                )
+                for key, source_text, translated_text, model in rows:
+                    result[key] = (source_text, translated_text, model)
+
+        return result
+
+    # 批量写入，相同的键以新译文覆盖
+    def store(self, target_language: str, records: list[tuple[str, str, str, str]]) -> None:
+        now = time.time()
+        with self.lock, self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO memory (target_language, key, source_text, translated_text, model, updated) VALUES (?, ?, ?, ?, ?, ?)",
+                [(target_language, key, source_text, translated_text, model, now) for key, source_text, translated_text, model in records],
+            )
+
+
+class TranslationMemory:
+    """翻译记忆
+
+    以规范化后的原文与译文语言为键，保存已通过检查的译文：
+    - 项目记忆库位于输出目录的缓存文件夹中，全局记忆库位于 Resource 文件夹中，可分别开启
+    - 生成翻译任务前先查询记忆库（先项目后全局），命中的条目直接填入译文并标记为已翻译
+    - 原文完全一致为精确命中，仅规范化后一致（全半角、行内空白差异）为规范化命中，后者保留当前原文首尾的空白
+    - 规范化时保留行内的换行，换行位置或行数不同的原文不会命中，避免填入行数不符的译文
+    """
+
+    # 全局记忆库路径
+    GLOBAL_PATH = os.path.join(".", "Resource", "TranslationMemory.db")
+
+    # 模型名称，用于标记由记忆库填入的译文
+    MODEL_NAME = "TranslationMemory"
+
+    # 换行以外的连续空白
+    WHITESPACE_PATTERN = re.compile(r"[^\S\n]+")
+
+    # 各类换行符
+    LINE_BREAK_PATTERN = re.compile(r"\r\n?")
+
+    # 单一实例
+    _singleton = None
+    _singleton_lock = threading.Lock()
+
+    def __init__(self) -> None:
+        self.lock = threading.Lock()
+        self.stores: list[TranslationMemoryStore] = []
+        self.target_language = ""
+        self.reset_stats()
+
+    # 获取单例
+    def get_singleton() -> "TranslationMemory":
+        if TranslationMemory._singleton is None:
+            with TranslationMemory._singleton_lock:
+                if TranslationMemory._singleton is None:
+                    TranslationMemory._singleton = TranslationMemory()
+
+        return TranslationMemory._singleton
+
+    # 获取项目记忆库路径
+    def get_project_path(output_path: str) -> str:
+        return os.path.join(output_path, "cache", "TranslationMemory.db")
+
+    # 打开记忆库，路径为 None 时不使用对应的记忆库
+    def open(self, project_path: str | None, global_path: str | None, target_language: str) -> None:
+        self.close()
+
+        with self.lock:
+            self.target_language = target_language
+            self.stores = [TranslationMemoryStore(path) for path in (project_path, global_path) if path is not None]
+            self.reset_stats()
+
+    # 关闭记忆库
+    def close(self) -> None:
+        with self.lock:
+            for store in self.stores:
+                store.close()
+            self.stores = []
+
+    # 是否已打开记忆库
+    def is_enabled(self) -> bool:
+        return len(self.stores) > 0
+
+    # 重置统计数据
+    def reset_stats(self) -> None:
+        self.lookups = 0
+        self.exact_hits = 0
+        self.normalized_hits = 0
+        self.stored = 0
+
+    # 获取统计数据
+    def get_stats(self) -> dict:
+        with self.lock:
+            hits = self.exact_hits + self.normalized_hits
+            return {
+                "lookups": self.lookups,
+                "exact_hits": self.exact_hits,
+                "normalized_hits": self.normalized_hits,
+                "hit_rate": hits / self.lookups if self.lookups > 0 else 0.0,
+                "stored": self.stored,
+            }
+
+    # 规范化原文：兼容字符转为标准形式，统一换行符，逐行去除首尾空白并合并连续空白，行内换行保持不变
+    def normalize(text: str) -> str:
+        text = unicodedata.normalize("NFKC", __class__.LINE_BREAK_PATTERN.sub("\n", text)).strip()
+        return "\n".join(__class__.WHITESPACE_PATTERN.sub(" ", line).strip() for line in text.split("\n"))
+
+    # 计算记忆库的键
+    def get_key(text: str) -> str:
+        return hashlib.blake2b(__class__.normalize(text).encode("utf-8"), digest_size = 16).hexdigest()
+
+    # 为待翻译的条目查询记忆库，命中时直接填入译文，返回命中的条目
+    def apply(self, items: list[CacheItem]) -> list[CacheItem]:
+        with self.lock:
+            if not self.stores:
+                return []
+
+            # 相同的原文只查询一次
+            pending: dict[str, list[CacheItem]] = {}
+            for item in items:
+                if item.translation_status == TranslationStatus.UNTRANSLATED and item.source_text.strip() != "":
+                    pending.setdefault(__class__.get_key(item.source_text), []).append(item)
+
+            # 先查询项目记忆库，未命中的再查询全局记忆库
+            found = {}
+            for store in self.stores:
+                keys = [key for key in pending if key not in found]
+                if not keys:
+                    break
+                found.update(store.lookup(self.target_language, keys))
+
+            hit_items = []
+            for key, key_items in pending.items():
+                if key not in found:
+                    continue
+
+                source_text, translated_text, model = found[key]
+                for item in key_items:
+                    with item.atomic_scope():
+                        if item.source_text == source_text:
+                            item.translated_text = translated_text
+                            self.exact_hits += 1
+                        else:
+                            item.translated_text = __class__.restore_whitespace(item.source_text, translated_text)
+                            self.normalized_hits += 1
+                        item.model = model or __class__.MODEL_NAME
+                        item.translation_status = TranslationStatus.TRANSLATED
+                    hit_items.append(item)
+
+            self.lookups += sum(len(v) for v in pending.values())
+            return hit_items
+
+    # 将已翻译的条目写入记忆库
+    def store(self, items: list[CacheItem]) -> None:
+        if not self.stores:
+            return None
+
+        records = {}
+        for item in items:
+            if item.translation_status == TranslationStatus.TRANSLATED and item.translated_text and item.source_text.strip() != "":
+                records[__class__.get_key(item.source_text)] = (item.source_text, item.translated_text, item.model or "")
+
+        if not records:
+            return None
+
+        records = [(key, *value) for key, value in records.items()]
+        with self.lock:
+            for store in self.stores:
+                store.store(self.target_language, records)
+            self.stored += len(records)
+
+    # 按当前原文的首尾空白调整记忆库中的译文
+    def restore_whitespace(source_text: str, translated_text: str) -> str:
+        leading = source_text[: len(source_text) - len(source_text.lstrip())]
+        trailing = source_text[len(source_text.rstrip()) :]
+        return leading + translated_text.strip() + trailing
@@ -12,6 +12,9 @@ class CustomWriter(BaseTranslationWriter):
     """插件式Writer，继承后可自动注册"""
     _writers: list[Self] = []
 
+    # 插件无法保证线程安全，需要时由插件自行开启
+    parallel_write = False
+
     def __init_subclass__(cls, **kwargs) -> None:
         super().__init_subclass__(**kwargs)
         # import 发生在 PluginManager 中
@@ -6,74 +6,10 @@ from ModuleFolders.TaskExecutor import TranslatorUtil
 from PluginScripts.PluginBase import PluginBase
 from ModuleFolders.Cache.CacheItem import TranslationStatus
 from ModuleFolders.TaskConfig.TaskConfig import TaskConfig
+from ModuleFolders.TextProcessor import UnicodeRanges
 
 
 class LanguageFilter(PluginBase):
-    # 平假名
-    HIRAGANA = ("\u3040", "\u309F")
-
-    # 片假名
-    KATAKANA = ("\u30A0", "\u30FF")
-
-    # 半角片假名（包括半角浊音、半角拗音等）
-    KATAKANA_HALF_WIDTH = ("\uFF65", "\uFF9F")
-
-    # 片假名语音扩展
-    KATAKANA_PHONETIC_EXTENSIONS = ("\u31F0", "\u31FF")
-
-    # 濁音和半浊音符号
-    VOICED_SOUND_MARKS = ("\u309B", "\u309C")
-
-    # 韩文字母 (Hangul Jamo)
-    HANGUL_JAMO = ("\u1100", "\u11FF")
-
-    # 韩文字母扩展-A (Hangul Jamo Extended-A)
-    HANGUL_JAMO_EXTENDED_A = ("\uA960", "\uA97F")
-
-    # 韩文字母扩展-B (Hangul Jamo Extended-B)
-    HANGUL_JAMO_EXTENDED_B = ("\uD7B0", "\uD7FF")
-
-    # 韩文音节块 (Hangul Syllables)
-    HANGUL_SYLLABLES = ("\uAC00", "\uD7AF")
-
-    # 韩文兼容字母 (Hangul Compatibility Jamo)
-    HANGUL_COMPATIBILITY_JAMO = ("\u3130", "\u318F")
-
-    # 中日韩统一表意文字
-    CJK = ("\u4E00", "\u9FFF")
-
-    # 中日韩通用标点符号
-    GENERAL_PUNCTUATION = ("\u2000", "\u206F")
-    CJK_SYMBOLS_AND_PUNCTUATION = ("\u3000", "\u303F")
-    HALFWIDTH_AND_FULLWIDTH_FORMS = ("\uFF00", "\uFFEF")
-    OTHER_CJK_PUNCTUATION = (
-        "\u30FB"  # ・ 在片假名 ["\u30A0", "\u30FF"] 范围内
-    )
-
-    # 拉丁字符
-    LATIN_1 = ("\u0041", "\u005A")  # 大写字母 A-Z
-    LATIN_2 = ("\u0061", "\u007A")  # 小写字母 a-z
-    LATIN_EXTENDED_A = ("\u0100", "\u017F")
-    LATIN_EXTENDED_B = ("\u0180", "\u024F")
-    LATIN_SUPPLEMENTAL = ("\u00A0", "\u00FF")
-
-    # 拉丁标点符号
-    LATIN_PUNCTUATION_BASIC_1 = ("\u0020", "\u002F")
-    LATIN_PUNCTUATION_BASIC_2 = ("\u003A", "\u0040")
-    LATIN_PUNCTUATION_BASIC_3 = ("\u005B", "\u0060")
-    LATIN_PUNCTUATION_BASIC_4 = ("\u007B", "\u007E")
-    LATIN_PUNCTUATION_GENERAL = ("\u2000", "\u206F")
-    LATIN_PUNCTUATION_SUPPLEMENTAL = ("\u2E00", "\u2E7F")
-
-    # 俄文字符
-    CYRILLIC_BASIC = ("\u0410", "\u044F")  # 基本俄文字母 (大写字母 А-Я, 小写字母 а-я)
-    CYRILLIC_SUPPLEMENT = ("\u0500", "\u052F")  # 俄文字符扩展区（补充字符，包括一些历史字母和其他斯拉夫语言字符）
-    CYRILLIC_EXTENDED_A = ("\u2C00", "\u2C5F")  # 扩展字符 A 区块（历史字母和一些东斯拉夫语言字符）
-    CYRILLIC_EXTENDED_B = ("\u0300", "\u04FF")  # 扩展字符 B 区块（更多历史字母）
-    CYRILLIC_SUPPLEMENTAL = ("\u1C80", "\u1C8F")  # 俄文字符补充字符集，包括一些少见和历史字符
-    CYRILLIC_SUPPLEMENTAL_EXTRA = ("\u2DE0", "\u2DFF")  # 其他扩展字符（例如：斯拉夫语言的一些符号）
-    CYRILLIC_OTHER = ("\u0500", "\u050F")  # 其他字符区块（包括斯拉夫语系其他语言的字符，甚至一些特殊符号）
-
     def __init__(self) -> None:
         super().__init__()
 
@@ -161,52 +97,52 @@ class LanguageFilter(PluginBase):
 
     # 判断字符是否为汉字（中文）字符
     def is_cjk(self, char: str) -> bool:
-        return LanguageFilter.CJK[0] <= char <= LanguageFilter.CJK[1]
+        return UnicodeRanges.CJK[0] <= char <= UnicodeRanges.CJK[1]
 
     # 判断字符是否为拉丁字符
     def is_latin(self, char: str) -> bool:
         return (
-                LanguageFilter.LATIN_1[0] <= char <= LanguageFilter.LATIN_1[1]
-                or LanguageFilter.LATIN_2[0] <= char <= LanguageFilter.LATIN_2[1]
-                or LanguageFilter.LATIN_EXTENDED_A[0] <= char <= LanguageFilter.LATIN_EXTENDED_A[1]
-                or LanguageFilter.LATIN_EXTENDED_B[0] <= char <= LanguageFilter.LATIN_EXTENDED_B[1]
-                or LanguageFilter.LATIN_SUPPLEMENTAL[0] <= char <= LanguageFilter.LATIN_SUPPLEMENTAL[1]
+                UnicodeRanges.LATIN_1[0] <= char <= UnicodeRanges.LATIN_1[1]
+                or UnicodeRanges.LATIN_2[0] <= char <= UnicodeRanges.LATIN_2[1]
+                or UnicodeRanges.LATIN_EXTENDED_A[0] <= char <= UnicodeRanges.LATIN_EXTENDED_A[1]
+                or UnicodeRanges.LATIN_EXTENDED_B[0] <= char <= UnicodeRanges.LATIN_EXTENDED_B[1]
+                or UnicodeRanges.LATIN_SUPPLEMENTAL[0] <= char <= UnicodeRanges.LATIN_SUPPLEMENTAL[1]
         )
 
     # 判断字符是否为韩文（含汉字）字符
     def is_korean(self, char: str) -> bool:
         return (
-                LanguageFilter.CJK[0] <= char <= LanguageFilter.CJK[1]
-                or LanguageFilter.HANGUL_JAMO[0] <= char <= LanguageFilter.HANGUL_JAMO[1]
-                or LanguageFilter.HANGUL_JAMO_EXTENDED_A[0] <= char <= LanguageFilter.HANGUL_JAMO_EXTENDED_A[1]
-                or LanguageFilter.HANGUL_JAMO_EXTENDED_B[0] <= char <= LanguageFilter.HANGUL_JAMO_EXTENDED_B[1]
-                or LanguageFilter.HANGUL_SYLLABLES[0] <= char <= LanguageFilter.HANGUL_SYLLABLES[1]
-                or LanguageFilter.HANGUL_COMPATIBILITY_JAMO[0] <= char <= LanguageFilter.HANGUL_COMPATIBILITY_JAMO[1]
+                UnicodeRanges.CJK[0] <= char <= UnicodeRanges.CJK[1]
+                or UnicodeRanges.HANGUL_JAMO[0] <= char <= UnicodeRanges.HANGUL_JAMO[1]
+                or UnicodeRanges.HANGUL_JAMO_EXTENDED_A[0] <= char <= UnicodeRanges.HANGUL_JAMO_EXTENDED_A[1]
+                or UnicodeRanges.HANGUL_JAMO_EXTENDED_B[0] <= char <= UnicodeRanges.HANGUL_JAMO_EXTENDED_B[1]
+                or UnicodeRanges.HANGUL_SYLLABLES[0] <= char <= UnicodeRanges.HANGUL_SYLLABLES[1]
+                or UnicodeRanges.HANGUL_COMPATIBILITY_JAMO[0] <= char <= UnicodeRanges.HANGUL_COMPATIBILITY_JAMO[1]
         )
 
     # 判断字符是否为俄文字符
     def is_russian(self, char: str) -> bool:
         return (
-                LanguageFilter.CYRILLIC_BASIC[0] <= char <= LanguageFilter.CYRILLIC_BASIC[1]
-                or LanguageFilter.CYRILLIC_SUPPLEMENT[0] <= char <= LanguageFilter.CYRILLIC_SUPPLEMENT[1]
-                or LanguageFilter.CYRILLIC_EXTENDED_A[0] <= char <= LanguageFilter.CYRILLIC_EXTENDED_A[1]
-                or LanguageFilter.CYRILLIC_EXTENDED_B[0] <= char <= LanguageFilter.CYRILLIC_EXTENDED_B[1]
-                or LanguageFilter.CYRILLIC_SUPPLEMENTAL[0] <= char <= LanguageFilter.CYRILLIC_SUPPLEMENTAL[1]
-                or LanguageFilter.CYRILLIC_SUPPLEMENTAL_EXTRA[0] <= char <= LanguageFilter.CYRILLIC_SUPPLEMENTAL_EXTRA[
+                UnicodeRanges.CYRILLIC_BASIC[0] <= char <= UnicodeRanges.CYRILLIC_BASIC[1]
+                or UnicodeRanges.CYRILLIC_SUPPLEMENT[0] <= char <= UnicodeRanges.CYRILLIC_SUPPLEMENT[1]
+                or UnicodeRanges.CYRILLIC_EXTENDED_A[0] <= char <= UnicodeRanges.CYRILLIC_EXTENDED_A[1]
+                or UnicodeRanges.CYRILLIC_EXTENDED_B[0] <= char <= UnicodeRanges.CYRILLIC_EXTENDED_B[1]
+                or UnicodeRanges.CYRILLIC_SUPPLEMENTAL[0] <= char <= UnicodeRanges.CYRILLIC_SUPPLEMENTAL[1]
+                or UnicodeRanges.CYRILLIC_SUPPLEMENTAL_EXTRA[0] <= char <= UnicodeRanges.CYRILLIC_SUPPLEMENTAL_EXTRA[
                     1]
-                or LanguageFilter.CYRILLIC_OTHER[0] <= char <= LanguageFilter.CYRILLIC_OTHER[1]
+                or UnicodeRanges.CYRILLIC_OTHER[0] <= char <= UnicodeRanges.CYRILLIC_OTHER[1]
         )
 
     # 判断字符是否为日文（含汉字）字符
     def is_japanese(self, char: str) -> bool:
         return (
-                LanguageFilter.CJK[0] <= char <= LanguageFilter.CJK[1]
-                or LanguageFilter.KATAKANA[0] <= char <= LanguageFilter.KATAKANA[1]
-                or LanguageFilter.HIRAGANA[0] <= char <= LanguageFilter.HIRAGANA[1]
-                or LanguageFilter.KATAKANA_HALF_WIDTH[0] <= char <= LanguageFilter.KATAKANA_HALF_WIDTH[1]
-                or LanguageFilter.KATAKANA_PHONETIC_EXTENSIONS[0] <= char <=
-                LanguageFilter.KATAKANA_PHONETIC_EXTENSIONS[1]
-                or LanguageFilter.VOICED_SOUND_MARKS[0] <= char <= LanguageFilter.VOICED_SOUND_MARKS[1]
+                UnicodeRanges.CJK[0] <= char <= UnicodeRanges.CJK[1]
+                or UnicodeRanges.KATAKANA[0] <= char <= UnicodeRanges.KATAKANA[1]
+                or UnicodeRanges.HIRAGANA[0] <= char <= UnicodeRanges.HIRAGANA[1]
+                or UnicodeRanges.KATAKANA_HALF_WIDTH[0] <= char <= UnicodeRanges.KATAKANA_HALF_WIDTH[1]
+                or UnicodeRanges.KATAKANA_PHONETIC_EXTENSIONS[0] <= char <=
+                UnicodeRanges.KATAKANA_PHONETIC_EXTENSIONS[1]
+                or UnicodeRanges.VOICED_SOUND_MARKS[0] <= char <= UnicodeRanges.VOICED_SOUND_MARKS[1]
         )
 
     # 检查字符串是否包含至少一个汉字（中文）字符
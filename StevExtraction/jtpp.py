@@ -7,6 +7,9 @@ import openpyxl
 from chardet import detect
 import csv
 import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 
 version = "v3.00"
 
@@ -17,6 +20,178 @@ pd.options.display.max_rows = None
 pd.options.display.max_columns = None
 pd.options.display.width = None
 
+# 日语字符
+JA_PATTERN = re.compile(r"[\u4e00-\u9fa5\u3040-\u309f\u30a0-\u30ff\u4e00-\u9fa5ー々〆〤]")
+
+# 数据文件总大小达到该值时才使用多进程读取，较小的游戏直接在当前进程读取更快
+PARALLEL_MIN_BYTES = 4 << 20
+
+
+class TextExtractor:
+    """
+    从单个 JSON 文件的数据中提取需要翻译的文本。
+
+    按文本在文件中出现的顺序逐个产出 (原文, 地址, code) 文本行，
+    只依赖配置与当前文件，可以在子进程中独立运行。
+    """
+
+    def __init__(self, ja, sumcode, ReadCode, sptext_rules: dict):
+        self.ja = ja
+        self.sumcode = frozenset(sumcode)
+        self.ReadCode = frozenset(ReadCode)
+        self.sptext_rules = sptext_rules  # {code: [(mark, 编译后的正则), ...]}
+
+    def __walk(self, data, path: list):
+        """
+        深度优先遍历数据，产出 (地址片段列表, code, 字符串)。
+
+        使用显式栈代替递归，地址片段列表会被复用，使用方需要立即处理。
+        """
+        if type(data) == str:
+            yield path, False, data
+            return
+
+        # 栈中保存 (子元素迭代器, 子元素所属的 code)
+        stack = []
+        if type(data) == dict:
+            stack.append((iter(data.items()), data.get("code", False)))
+        elif type(data) == list:
+            stack.append((zip(map(str, range(len(data))), data), False))
+
+        while stack:
+            items, code = stack[-1]
+            for key, value in items:
+                path.append(key)
+                tp = type(value)
+                if tp == str:
+                    yield path, code, value
+                elif tp == dict:
+                    stack.append((iter(value.items()), value.get("code", False)))
+                    break
+                elif tp == list:
+                    stack.append((zip(map(str, range(len(value))), value), code))
+                    break
+                path.pop()
+            else:
+                # 当前容器遍历完毕，回到上一层
+                stack.pop()
+                if stack:
+                    path.pop()
+
+    def __GetSptext(self, data: str, Dir: str, code: str, rule: re.Pattern):
+        """
+        根据特殊规则提取文本。
+        """
+        if self.ja:
+            Dir += "\u200B" + "1"  # 在地址后添加一个零宽空格和一个数字 1，用于后续处理
+            for i in rule.findall(data):
+                # 检查提取的文本中是否包含日语字符
+                if JA_PATTERN.search(i):
+                    yield i, Dir, code
+
+    def extract(self, data, FileName: str):
+        """
+        提取文件中需要翻译的文本，连续的合并代码 (如 401、405) 会合并为一行。
+
+        :param data: 文件数据。
+        :param FileName: 文件名，作为地址的开头。
+        :return: 逐个产出 (原文, 地址, code) 的生成器。
+        """
+        tempdata = ["原文", "地址", "code"]  # 正在合并的文本行
+        sumlen = 0  # 已合并的行数
+
+        for path, code, data in self.__walk(data, [FileName]):
+            current_code = str(code) if code else "-1"  # 将 code 转换为字符串
+
+            rules = self.sptext_rules.get(current_code)
+            if rules is not None:
+                # 如果当前 code 在 sptext 字典中，应用特殊规则提取文本
+                for mark, rule in rules:
+                    if mark in data or mark == "空":
+                        yield from self.__GetSptext(data, "\\".join(path), current_code, rule)
+                continue
+
+            # 合并条件: 与上一行 code 相同 (或 108 之后的 408)，且 code 需要合并
+            merge = (
+                current_code == tempdata[2]
+                or (tempdata[2] == "108" and current_code == "408")
+            ) and current_code in self.sumcode
+
+            # 检查是否包含日语字符或特殊情况下的处理
+            Dir = "\\".join(path)
+            if (
+                not self.ja
+                or JA_PATTERN.search(data)
+                or r"System.json\gameTitle" in Dir
+            ):
+                if r"System.json\gameTitle" in Dir and data == "":
+                    data = " "  # 确保 gameTitle 不为空
+
+                if merge:
+                    tempdata[0] += "\n" + data
+                    sumlen += 1
+                else:
+                    # 如果存在合并的文本，产出该行
+                    if sumlen:
+                        tempdata[1] += "\u200B" + str(sumlen)
+                        if tempdata[0] != "":
+                            yield tuple(tempdata)
+
+                    # 根据 ReadCode 设置决定是否读取
+                    if current_code in self.ReadCode or not self.ReadCode:
+                        tempdata = [data, Dir, current_code]
+                        sumlen = 1
+                    else:
+                        tempdata = ["原文", "地址", "code"]
+                        sumlen = 0
+            else:
+                # 处理不包含日语字符的情况
+                if merge:
+                    tempdata[0] += "\n" + data
+                    sumlen += 1
+                else:
+                    if sumlen:
+                        tempdata[1] += "\u200B" + str(sumlen)
+                        if tempdata[0] != "":
+                            yield tuple(tempdata)
+                    tempdata = ["原文", "地址", "code"]
+                    sumlen = 0
+
+        # 处理文件末尾仍在合并的文本
+        if sumlen:
+            if "\u200B" not in tempdata[1]:
+                tempdata[1] += "\u200B" + str(sumlen)
+            if tempdata[0] != "":
+                yield tuple(tempdata)
+
+
+def ReadGameFile(task: tuple) -> tuple:
+    """
+    读取单个 JSON 文件并提取文本，可以在子进程中运行。
+
+    :param task: (文件路径, 文件名, TextExtractor) 元组。
+    :return: (文件名, 文本行列表, 错误信息) 元组，读取失败时文本行列表为 None。
+    """
+    File, name, extractor = task
+    try:
+        # 尝试使用 UTF-8 编码读取 JSON 文件
+        with open(File, "r", encoding="utf8") as f:
+            data = json.load(f)
+    except Exception:
+        # 如果 UTF-8 编码失败，尝试自动检测编码并读取
+        try:
+            with open(File, "rb") as f:
+                encoding = detect(f.read())["encoding"]
+                encoding = (
+                    encoding if encoding else "ansi"
+                )  # 如果未检测到编码，则使用 ansi
+            with open(File, "r", encoding=encoding) as f:
+                data = json.load(f)
+        except Exception:
+            return name, None, traceback.format_exc()
+
+    return name, list(extractor.extract(data, name)), None
+
 
 class Jr_Tpp:
     def __init__(self, config: dict, path: str = False):
@@ -27,14 +202,6 @@ class Jr_Tpp:
         :param path: 可选的项目路径，如果提供，将从该路径加载项目。
         """
         self.ProgramData = {}  # 存储项目数据的字典
-        self.__tempdata = [  # 临时数据列表，用于存储提取的文本行
-            "原文",
-            "译文",
-            "地址",
-            "标签",
-            "code",
-        ]
-        self.__sumlen = 0  # 记录合并文本的长度
 
         # 初始化日志记录器
         self.logger = logging.getLogger(__name__)
@@ -72,6 +239,12 @@ class Jr_Tpp:
         for key in self.sptext:
             for mark in self.sptext[key]:
                 self.sptext[key][mark] = self.sptext[key][mark].replace("。", "'")
+        # 预编译特殊文本提取规则
+        self.__sptext_rules = {
+            key: [(mark, re.compile(rule)) for mark, rule in marks.items()]
+            for key, marks in self.sptext.items()
+        }
+        self.read_workers = config.get("read_workers", 0)  # 读取游戏的进程数 (0: CPU 核心数, 1: 不使用多进程)
 
         self.AutoLineFeed_jsdir = config.get(
             "auto_linefeed_js", "自动换行.js"
@@ -176,124 +349,6 @@ class Jr_Tpp:
             print(e)
             input("导出失败，请关闭所有xlsx文件后再次尝试")
 
-    def __GetSptext(self, data: str, Dir, code, rule) -> list:
-        """
-        根据特殊规则提取文本。
-
-        :param data: 要提取文本的字符串。
-        :param Dir: 文本的地址。
-        :param code: 文本的 code。
-        :param rule: 用于提取文本的正则表达式。
-        :return: 包含提取的文本的列表。
-        """
-        res = []
-        Dir += "\u200B" + "1"  # 在地址后添加一个零宽空格和一个数字 1，用于后续处理
-        if self.ja:
-            # 使用正则表达式查找所有匹配的文本
-            data = re.findall(rule, data)
-            for i in data:
-                # 检查提取的文本中是否包含日语字符
-                if re.search(
-                    "[\u4e00-\u9fa5\u3040-\u309f\u30a0-\u30ff\u4e00-\u9fa5ー々〆〤]", i
-                ):
-                    res.append([i, "", Dir, "", code])  # 将提取的文本添加到结果列表
-        return res
-
-    def __ReadFile(self, data, FileName: str, code: int = False) -> list:
-        """
-        递归地读取文件内容，提取需要翻译的文本。
-
-        :param data: 要读取的数据（可以是字典、列表或字符串）。
-        :param FileName: 当前处理的文件名或路径。
-        :param code: 当前文本的 code（可选，默认为 False）。
-        :return: 包含提取的文本的列表，每个元素是一个包含原文、译文、地址、标签和 code 的列表。
-        """
-        res = []
-        tp = type(data)
-
-        if tp == dict:
-            # 如果数据是字典，遍历键值对
-            for key in data.keys():
-                current_code = data.get("code", False)  # 获取当前的 code
-                # 递归调用 __ReadFile 处理子元素
-                res += self.__ReadFile(data[key], FileName + "\\" + key, current_code)
-
-        elif tp == list:
-            # 如果数据是列表，遍历元素
-            for i in range(0, len(data)):
-                # 递归调用 __ReadFile 处理子元素
-                res += self.__ReadFile(data[i], FileName + "\\" + str(i), code)
-
-        elif tp == str:
-            # 如果数据是字符串，处理文本提取逻辑
-            current_code = str(code) if code else "-1"  # 将 code 转换为字符串
-
-            if current_code in self.sptext.keys():
-                # 如果当前 code 在 sptext 字典中，应用特殊规则提取文本
-                for mark in self.sptext[current_code].keys():
-                    if mark in data or mark == "空":
-                        rule = self.sptext[current_code][mark]
-                        # 使用正则表达式提取文本
-                        [
-                            res.append(x)
-                            for x in self.__GetSptext(
-                                data, FileName, current_code, rule
-                            )
-                        ]
-            else:
-                # 检查是否包含日语字符或特殊情况下的处理
-                if (
-                    not self.ja
-                    or re.search(
-                        r"[\u4e00-\u9fa5\u3040-\u309f\u30a0-\u30ff\u4e00-\u9fa5ー々〆〤]",
-                        data,
-                    )
-                    or r"System.json\gameTitle" in FileName
-                ):
-                    if r"System.json\gameTitle" in FileName and data == "":
-                        data = " "  # 确保 gameTitle 不为空
-                    textdata = [data, "", FileName, "", current_code]
-
-                    # 处理 code 为 108 或 408 时的文本合并逻辑
-                    if (
-                        current_code == self.__tempdata[4]
-                        or (self.__tempdata[4] == "108" and current_code == "408")
-                    ) and current_code in self.sumcode:
-                        self.__tempdata[0] += "\n" + textdata[0]
-                        self.__sumlen += 1
-                    else:
-                        # 如果存在合并的文本，添加到结果列表
-                        if self.__sumlen:
-                            self.__tempdata[2] += "\u200B" + str(self.__sumlen)
-                            if self.__tempdata[0] != "":
-                                res.append(self.__tempdata)
-
-                        # 根据 ReadCode 设置决定是否添加到结果列表
-                        if current_code in self.ReadCode or not self.ReadCode:
-                            self.__tempdata = textdata
-                            self.__sumlen = 1
-                        else:
-                            self.__tempdata = ["原文", "译文", "地址", "标签", "code"]
-                            self.__sumlen = 0
-                else:
-                    # 处理不包含日语字符的情况
-                    if (
-                        current_code == self.__tempdata[4]
-                        or (self.__tempdata[4] == "108" and current_code == "408")
-                    ) and current_code in self.sumcode:
-                        self.__tempdata[0] += "\n" + data
-                        self.__sumlen += 1
-                    elif self.__sumlen:
-                        self.__tempdata[2] += "\u200B" + str(self.__sumlen)
-                        if self.__tempdata[0] != "":
-                            res.append(self.__tempdata)
-                        self.__tempdata = ["原文", "译文", "地址", "标签", "code"]
-                        self.__sumlen = 0
-                    else:
-                        self.__tempdata = ["原文", "译文", "地址", "标签", "code"]
-                        self.__sumlen = 0
-        return res
-
     def __ReadFolder(self, dir: str) -> list:
         """
         读取指定目录下的所有文件。
@@ -360,15 +415,27 @@ class Jr_Tpp:
 
     def __toDataFrame(self, data: list) -> pd.DataFrame:
         """
-        将数据列表转换为 DataFrame。
+        将文本行列表转换为 DataFrame。
 
-        :param data: 包含文本数据的列表。
-        :return: 转换后的 DataFrame。
+        :param data: 包含 (原文, 地址, code) 文本行的列表。
+        :return: 转换后的 DataFrame，重复的原文只保留一行并合并地址和 code。
         """
+        rows = {}  # {原文: (地址列表, code 列表)}
+        for text, Dir, code in data:
+            row = rows.get(text)
+            if row is None:
+                rows[text] = ([Dir], [code])
+            # 如果重复行的地址和 code 不在黑名单中，将其合并到首次出现的行中
+            elif not self.__IfBlackDir(Dir) and code not in self.BlackCode:
+                row[0].append(Dir)
+                row[1].append(code)
+
         # 创建 DataFrame，并设置列名
-        DataFrame = pd.DataFrame(data, columns=["原文", "译文", "地址", "标签", "code"])
+        DataFrame = pd.DataFrame(
+            [[text, "", "☆↑↓".join(Dirs), "", ",".join(codes)] for text, (Dirs, codes) in rows.items()],
+            columns=["原文", "译文", "地址", "标签", "code"],
+        )
         DataFrame.index = list(DataFrame["原文"])  # 将 "原文" 列设置为索引
-        DataFrame = self.__RemoveDuplicated(DataFrame)  # 去除重复行并合并地址和 code
         return DataFrame
 
     def __nameswitch(self, name, csv: bool = False):
@@ -512,6 +579,8 @@ class Jr_Tpp:
         data_folder_name = "data"  # 数据文件夹的名称
         data_dir = os.path.join(GameDir, data_folder_name)  # 构造数据文件夹的完整路径
         Files = self.__ReadFolder(GameDir)  # 读取游戏目录下的所有文件
+        extractor = TextExtractor(self.ja, self.sumcode, self.ReadCode, self.__sptext_rules)
+        tasks = []
         for File in Files:
             # 计算文件相对于数据文件夹的路径
             relative_path = os.path.relpath(File, data_dir)
@@ -524,52 +593,57 @@ class Jr_Tpp:
             # 处理数据文件夹内的 JSON 文件
             if data_folder_name in File.lower() and name.endswith(".json"):
                 if name not in self.BlackFiles:
-                    print(f"正在读取{name}")
-                    try:
-                        # 尝试使用 UTF-8 编码读取 JSON 文件
-                        with open(File, "r", encoding="utf8") as f:
-                            data = json.load(f)
-                    except Exception:
-                        # 如果 UTF-8 编码失败，尝试自动检测编码并读取
-                        try:
-                            with open(File, "rb") as f:
-                                encoding = detect(f.read())["encoding"]
-                                encoding = (
-                                    encoding if encoding else "ansi"
-                                )  # 如果未检测到编码，则使用 ansi
-                            with open(File, "r", encoding=encoding) as f:
-                                data = json.load(f)
-                        except Exception as e:
-                            self.logger.error(f"读取文件 {name} 失败")
-                            self.logger.error(traceback.format_exc())
-                            print(
-                                f"无法确定{name}文件编码, 且无法用ANSI编码打开，读取失败"
-                            )
-                            continue
+                    tasks.append((File, name, extractor))
 
-                    # 调用 __ReadFile 提取文本数据
-                    TextDatas = self.__ReadFile(data, name)
-                    # 处理可能存在的文本合并
-                    if self.__sumlen and self.__tempdata not in TextDatas:
-                        if "\u200B" not in self.__tempdata[2]:
-                            self.__tempdata[2] += "\u200B" + str(self.__sumlen)
-                        if self.__tempdata[0] != "":
-                            TextDatas.append(self.__tempdata)
-                    # 重置临时数据和合并长度
-                    self.__tempdata = [
-                        "原文",
-                        "译文",
-                        "地址",
-                        "标签",
-                        "code",
-                    ]
-                    self.__sumlen = 0
-                    # 将提取的文本数据转换为 DataFrame 并添加到 ProgramData 中
-                    if TextDatas:
-                        self.ProgramData.update({name: self.__toDataFrame(TextDatas)})
+        workers = self.read_workers or os.cpu_count() or 1
+        total_size = sum(os.path.getsize(task[0]) for task in tasks)
+        if workers > 1 and len(tasks) > 1 and total_size >= PARALLEL_MIN_BYTES:
+            try:
+                self.__ReadGameParallel(tasks, min(workers, len(tasks)))
+            except BrokenProcessPool:
+                self.logger.warning("多进程读取失败，改为逐个读取")
+                self.logger.warning(traceback.format_exc())
+                self.__CollectGameFiles(map(ReadGameFile, tasks))
+        else:
+            self.__CollectGameFiles(map(ReadGameFile, tasks))
         self.logger.info("游戏读取完成")
         print("########################读取游戏完成########################")
 
+    def __ReadGameParallel(self, tasks: list, workers: int):
+        """
+        使用多个进程读取游戏文件，每个进程一次处理一个文件。
+
+        :param tasks: ReadGameFile 的参数列表。
+        :param workers: 进程数。
+        """
+        self.logger.info(f"使用 {workers} 个进程读取 {len(tasks)} 个文件")
+        # 使用 spawn 方式启动，避免在多线程的界面程序中 fork
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as executor:
+            # 先提交较大的文件以均衡负载，结果仍按原有的文件顺序收集
+            futures = {}
+            for task in sorted(tasks, key=lambda task: os.path.getsize(task[0]), reverse=True):
+                futures[task[1]] = executor.submit(ReadGameFile, task)
+            self.__CollectGameFiles(futures[task[1]].result() for task in tasks)
+
+    def __CollectGameFiles(self, results):
+        """
+        将读取的结果按顺序添加到 ProgramData 中。
+
+        :param results: ReadGameFile 返回值的可迭代对象。
+        """
+        for name, TextDatas, error in results:
+            print(f"正在读取{name}")
+            if TextDatas is None:
+                self.logger.error(f"读取文件 {name} 失败")
+                self.logger.error(error)
+                print(f"无法确定{name}文件编码, 且无法用ANSI编码打开，读取失败")
+                continue
+
+            # 将提取的文本数据转换为 DataFrame 并添加到 ProgramData 中
+            if TextDatas:
+                self.ProgramData.update({name: self.__toDataFrame(TextDatas)})
+
     def InjectGame(
         self, GameDir: str, path: str, BlackLabel: list = None, BlackCode: list = None
     ):
@@ -0,0 +1,130 @@
+"""缓存保存基准测试：增量日志与完整快照
+
+模拟翻译过程中的定时保存，每轮修改少量条目后分别使用两种方式保存，对比写入字节数与保存耗时：
+- full：每次都重新编码整个项目并写入完整快照（原有的保存方式）
+- journal：写入一次快照后，只把变动的条目追加到增量日志
+
+用法（在项目根目录下执行）：
+    python Tools/bench_cache_journal.py --lines 400000 --changed 500 --rounds 10
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ModuleFolders.Cache.CacheFile import CacheFile
+from ModuleFolders.Cache.CacheItem import CacheItem, TranslationStatus
+from ModuleFolders.Cache.CacheManager import CacheManager
+from ModuleFolders.Cache.CacheProject import CacheProject, CacheProjectStatistics
+
+
+# 生成测试项目
+def build_project(lines: int, files: int) -> CacheProject:
+    rng = random.Random(0)
+    project_files = {}
+    text_index = 0
+    per_file = max(1, lines // files)
+    for file_index in range(files):
+        storage_path = f"data/file_{file_index:05d}.json"
+        items = []
+        for _ in range(per_file):
+            source_text = "".join(chr(rng.randint(0x3041, 0x3096)) for _ in range(rng.randint(8, 60)))
+            items.append(CacheItem(text_index = text_index, source_text = source_text))
+            text_index += 1
+        project_files[storage_path] = CacheFile(storage_path = storage_path, items = items)
+
+    return CacheProject(
+        project_id = "bench",
+        project_type = "Json",
+        files = project_files,
+        stats_data = CacheProjectStatistics(total_line = text_index),
+    )
+
+
+# 模拟一轮翻译，返回本轮修改的条目
+def translate_round(items: list[CacheItem], changed: int, rng: random.Random) -> list[CacheItem]:
+    updated = rng.sample(items, min(changed, len(items)))
+    for item in updated:
+        with item.atomic_scope():
+            item.translated_text = item.source_text[::-1]
+            item.model = "bench-model"
+            item.translation_status = TranslationStatus.TRANSLATED
+    return updated
+
+
+def get_size(path: str) -> int:
+    return os.path.getsize(path) if os.path.isfile(path) else 0
+
+
+def run(mode: str, project: CacheProject, changed: int, rounds: int, work_dir: str) -> tuple[list[float], list[int]]:
+    path = os.path.join(work_dir, mode, "AinieeCacheData.json")
+    journal_path = CacheManager.get_journal_path(path)
+    os.makedirs(os.path.dirname(path), exist_ok = True)
+
+    manager = CacheManager()
+    manager.project = project
+    manager.write_snapshot(path, journal_path)
+
+    rng = random.Random(1)
+    items = list(project.items_iter())
+    latencies, written = [], []
+    for _ in range(rounds):
+        updated = translate_round(items, changed, rng)
+        manager.append_journal_items(updated)
+
+        journal_size = get_size(journal_path)
+        start = time.perf_counter()
+        if mode == "full":
+            manager.write_snapshot(path, journal_path)
+        else:
+            manager.append_journal(journal_path)
+        latencies.append(time.perf_counter() - start)
+        written.append(get_size(path) if mode == "full" else get_size(journal_path) - journal_size)
+
+    # 确认增量日志回放后与内存中的数据一致
+    loaded = CacheManager.read_from_file(path)
+    assert loaded.count_items(TranslationStatus.TRANSLATED) == project.count_items(TranslationStatus.TRANSLATED)
+    return latencies, written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "对比增量日志与完整快照的保存开销")
+    parser.add_argument("--lines", type = int, default = 400000, help = "项目总行数")
+    parser.add_argument("--files", type = int, default = 400, help = "文件数量")
+    parser.add_argument("--changed", type = int, default = 500, help = "每轮保存之间变动的条目数")
+    parser.add_argument("--rounds", type = int, default = 10, help = "保存次数")
+    args = parser.parse_args()
+
+    print(f"生成测试项目：{args.lines} 行，{args.files} 个文件 ...")
+    work_dir = tempfile.mkdtemp(prefix = "ainiee_bench_")
+    try:
+        results = {}
+        for mode in ("full", "journal"):
+            # 每种方式使用独立的项目，避免相互影响
+            results[mode] = run(mode, build_project(args.lines, args.files), args.changed, args.rounds, work_dir)
+
+        print(f"\n每轮变动 {args.changed} 条，共保存 {args.rounds} 次")
+        print(f"{'方式':<10}{'平均耗时(ms)':>16}{'最大耗时(ms)':>16}{'平均写入(KB)':>16}")
+        for mode, (latencies, written) in results.items():
+            print(
+                f"{mode:<10}{sum(latencies) / len(latencies) * 1000:>16.1f}{max(latencies) * 1000:>16.1f}"
+                f"{sum(written) / len(written) / 1024:>16.1f}"
+            )
+
+        full, journal = results["full"], results["journal"]
+        print(
+            f"\n增量日志相比完整快照：耗时 {sum(full[0]) / max(sum(journal[0]), 1e-9):.1f} 倍，"
+            f"写入量 {sum(full[1]) / max(sum(journal[1]), 1):.1f} 倍"
+        )
+    finally:
+        shutil.rmtree(work_dir, ignore_errors = True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""任务切分基准测试：逐条计算 Token 与 ChunkPlanner
+
+模拟 Token 模式下的多轮切分（每轮上限减半，与翻译失败后的对半切分一致），对比：
+- legacy：逐条调用 encode 计算 Token 数并以无上限缓存记录，按文件顺序装箱（原有的切分方式）
+- planner：ChunkPlanner 一次性批量计算 Token 数并保存在条目上，之后的轮次直接复用
+同时输出 greedy 与 balanced 策略的片段大小分布，观察文件末尾的过小片段，
+并检查除单个超限的条目外，两种策略的片段都不超过上限（测试条目中包含少量单独超限的长文本）
+原有方式只有精确计数，approximate 模式下 legacy 改为逐条估算，仅用于在无法下载编码器时对比装箱开销
+
+用法（在项目根目录下执行）：
+    python Tools/bench_chunk_planner.py --lines 200000 --limit 1000 --rounds 3 --mode exact
+"""
+
+import argparse
+import gc
+import os
+import random
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ModuleFolders.Cache.CacheItem import CacheItem
+from ModuleFolders.Cache.ChunkPlanner import ChunkPlanner
+from ModuleFolders.TokenCounter.TokenCounter import TokenCounter
+
+
+# 生成测试条目，按文件分组
+def build_items_of_file(lines: int, files: int) -> dict[str, list[CacheItem]]:
+    rng = random.Random(0)
+    words = ["勇者", "魔王", "の", "は", "を", "に", "村", "剣", "「", "」", "……", "Lv", "HP", "100", "ゴールド", "です", "ました"]
+    items_of_file = {}
+    text_index = 0
+    per_file = max(1, lines // files)
+    for file_index in range(files):
+        items = []
+        for _ in range(rng.randint(per_file // 2, per_file * 3 // 2)):
+            # 偶尔出现单独超过上限的长文本
+            length = rng.randint(1500, 3000) if rng.random() < 0.002 else rng.randint(2, 40)
+            source_text = "".join(rng.choice(words) for _ in range(length))
+            items.append(CacheItem(text_index = text_index, source_text = source_text))
+            text_index += 1
+        items_of_file[f"file_{file_index:05d}.txt"] = items
+    return items_of_file
+
+
+# 原有的单条计数：每次调用都获取编码器并完整编码
+def legacy_count(text: str, mode: str) -> int:
+    if mode == TokenCounter.MODE_APPROXIMATE:
+        return TokenCounter.approximate(text)
+    return len(TokenCounter.get_singleton().get_encoding().encode(text))
+
+
+# 原有的切分方式：逐条计算 Token 数，按顺序装满一个片段再开启下一个
+def legacy_plan(items_of_file: dict[str, list[CacheItem]], limit_count: int, token_cache: dict, mode: str) -> list[list[CacheItem]]:
+    chunks = []
+    for items in items_of_file.values():
+        current_chunk, current_length = [], 0
+        for item in items:
+            item_length = token_cache.get(item.source_text)
+            if item_length is None:
+                item_length = legacy_count(item.source_text, mode)
+                token_cache[item.source_text] = item_length
+            if current_chunk and current_length + item_length > limit_count:
+                chunks.append(current_chunk)
+                current_chunk, current_length = [], 0
+            current_chunk.append(item)
+            current_length += item_length
+        if current_chunk:
+            chunks.append(current_chunk)
+    return chunks
+
+
+# 使用 ChunkPlanner 切分
+def planner_plan(items_of_file: dict[str, list[CacheItem]], limit_count: int, strategy: str) -> list[list[CacheItem]]:
+    ChunkPlanner.prepare_token_counts([item for items in items_of_file.values() for item in items])
+    chunks = []
+    for items in items_of_file.values():
+        chunks.extend(ChunkPlanner.plan(items, "token", limit_count, strategy))
+    return chunks
+
+
+# 除单个超限的条目独占的片段外，每个片段都不能超过上限
+def check_limit(chunks: list[list[CacheItem]], limit_count: int, strategy: str) -> None:
+    for chunk in chunks:
+        size = sum(item.token_count for item in chunk)
+        assert size <= limit_count or len(chunk) == 1, f"{strategy} 策略的片段超过上限：{size} > {limit_count}"
+
+
+# 片段大小分布
+def describe(chunks: list[list[CacheItem]], limit_count: int) -> str:
+    sizes = [sum(item.token_count for item in chunk) for chunk in chunks]
+    small = sum(1 for size in sizes if size < limit_count // 4)
+    return (
+        f"{len(chunks)} 个片段，平均 {statistics.mean(sizes):.0f}，标准差 {statistics.pstdev(sizes):.0f}，"
+        f"小于上限 1/4 的片段 {small} 个"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "对比逐条计算 Token 与 ChunkPlanner 的切分耗时")
+    parser.add_argument("--lines", type = int, default = 200000, help = "项目总行数")
+    parser.add_argument("--files", type = int, default = 200, help = "文件数量")
+    parser.add_argument("--limit", type = int, default = 1000, help = "第一轮的 Token 上限")
+    parser.add_argument("--rounds", type = int, default = 3, help = "切分轮数，每轮上限减半")
+    parser.add_argument("--repeat", type = int, default = 3, help = "重复次数，每轮取最短耗时")
+    parser.add_argument("--mode", choices = (TokenCounter.MODE_EXACT, TokenCounter.MODE_APPROXIMATE), default = TokenCounter.MODE_EXACT, help = "Token 计数模式")
+    args = parser.parse_args()
+
+    token_counter = TokenCounter.get_singleton()
+    token_counter.set_mode(args.mode)
+    if args.mode == TokenCounter.MODE_EXACT:
+        token_counter.get_encoding()  # 预先加载编码器，不计入耗时
+
+    print(f"生成测试项目：约 {args.lines} 行，{args.files} 个文件 ...")
+    limits = [max(1, args.limit >> i) for i in range(args.rounds)]
+
+    # 两种方式交替运行多次，每轮取最短耗时，减少机器波动的影响
+    legacy_times = [float("inf")] * len(limits)
+    planner_times = [float("inf")] * len(limits)
+    for _ in range(args.repeat):
+        # 原有方式，缓存在各轮之间保留
+        items_of_file = build_items_of_file(args.lines, args.files)
+        gc.collect()
+        token_cache = {}
+        for i, limit_count in enumerate(limits):
+            start = time.perf_counter()
+            legacy_chunks = legacy_plan(items_of_file, limit_count, token_cache, args.mode)
+            legacy_times[i] = min(legacy_times[i], time.perf_counter() - start)
+        legacy_bounds = [[item.text_index for item in chunk] for chunk in legacy_chunks]
+        del items_of_file, token_cache, legacy_chunks
+
+        # ChunkPlanner，使用新生成的条目，避免复用上面已计算的 Token 数
+        items_of_file = build_items_of_file(args.lines, args.files)
+        gc.collect()
+        for i, limit_count in enumerate(limits):
+            start = time.perf_counter()
+            planner_chunks = planner_plan(items_of_file, limit_count, ChunkPlanner.STRATEGY_GREEDY)
+            planner_times[i] = min(planner_times[i], time.perf_counter() - start)
+
+        # 两种方式在 greedy 策略下的切分结果应当一致
+        assert legacy_bounds == [[item.text_index for item in chunk] for chunk in planner_chunks]
+
+    # 各轮上限下两种策略的片段都不能超过上限
+    for limit_count in limits:
+        for strategy in (ChunkPlanner.STRATEGY_GREEDY, ChunkPlanner.STRATEGY_BALANCED):
+            check_limit(planner_plan(items_of_file, limit_count, strategy), limit_count, strategy)
+
+    print(f"\n{'轮次':<6}{'上限':>8}{'legacy(ms)':>14}{'planner(ms)':>14}")
+    for i, limit_count in enumerate(limits):
+        print(f"{i + 1:<6}{limit_count:>8}{legacy_times[i] * 1000:>14.1f}{planner_times[i] * 1000:>14.1f}")
+    print(f"{'合计':<6}{'':>8}{sum(legacy_times) * 1000:>14.1f}{sum(planner_times) * 1000:>14.1f}")
+    print(f"\n总耗时 legacy / planner = {sum(legacy_times) / max(sum(planner_times), 1e-9):.2f}")
+
+    # 片段大小分布
+    print(f"\n上限 {args.limit} 时的片段分布：")
+    for strategy in (ChunkPlanner.STRATEGY_GREEDY, ChunkPlanner.STRATEGY_BALANCED):
+        print(f"  {strategy:<9} {describe(planner_plan(items_of_file, args.limit, strategy), args.limit)}")
+
+
+if __name__ == "__main__":
+    main()
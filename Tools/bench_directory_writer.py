@@ -0,0 +1,157 @@
+"""导出基准测试：单线程与多线程输出
+
+模拟导出一个包含大量文件的项目，对比 DirectoryWriter 单线程与多线程输出的耗时：
+- sequential：max_workers = 1，所有文件由同一个 writer 依次输出（原有的输出方式）
+- parallel：max_workers = N，不同的文件由各线程中的 writer 同时输出
+两种方式输出的文件内容应当一致
+
+用法（在项目根目录下执行）：
+    python Tools/bench_directory_writer.py --type txt --files 2000 --workers 8
+    python Tools/bench_directory_writer.py --type epub --files 100 --workers 8
+"""
+
+import argparse
+import contextlib
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ModuleFolders.Cache.CacheItem import TranslationStatus
+from ModuleFolders.Cache.CacheProject import CacheProject, CacheProjectStatistics
+from ModuleFolders.FileOutputer.BaseWriter import OutputConfig, TranslationOutputConfig
+from ModuleFolders.FileOutputer.DirectoryWriter import DirectoryWriter
+from ModuleFolders.FileOutputer.EpubWriter import EpubWriter
+from ModuleFolders.FileOutputer.TxtWriter import TxtWriter
+from ModuleFolders.FileReader.BaseReader import InputConfig, PreReadMetadata
+from ModuleFolders.FileReader.EpubReader import EpubReader
+from ModuleFolders.FileReader.TxtReader import TxtReader
+
+
+# 各类型对应的读取器与输出器
+PROJECT_TYPES = {
+    "txt": (TxtReader, TxtWriter),
+    "epub": (EpubReader, EpubWriter),
+}
+
+
+def random_text(rng: random.Random) -> str:
+    return "".join(chr(rng.randint(0x3041, 0x3096)) for _ in range(rng.randint(10, 80)))
+
+
+# 生成原文文件
+def build_sources(source_dir: Path, project_type: str, files: int, lines: int) -> None:
+    rng = random.Random(0)
+    for i in range(files):
+        if project_type == "txt":
+            path = source_dir / f"dir_{i % 20:02d}" / f"file_{i:05d}.txt"
+            path.parent.mkdir(parents = True, exist_ok = True)
+            path.write_text("".join(f"{random_text(rng)}\n" for _ in range(lines)), encoding = "utf-8")
+        else:
+            path = source_dir / f"book_{i:05d}.epub"
+            with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zipf:
+                zipf.writestr("mimetype", "application/epub+zip", compress_type = zipfile.ZIP_STORED)
+                for chapter in range(5):
+                    paragraphs = "".join(f"<p>{random_text(rng)}</p>\n" for _ in range(lines // 5))
+                    zipf.writestr(
+                        f"OEBPS/Text/chapter_{chapter}.xhtml",
+                        f'<html xmlns="http://www.w3.org/1999/xhtml"><body>\n{paragraphs}</body></html>',
+                    )
+                # 插图的数据已经压缩过，这里用随机字节模拟
+                zipf.writestr("OEBPS/Images/cover.jpg", rng.randbytes(512 * 1024))
+
+
+# 读取原文并填入译文，不做语言检测
+def build_project(source_dir: Path, project_type: str) -> CacheProject:
+    reader_class, _ = PROJECT_TYPES[project_type]
+    project = CacheProject(project_type = reader_class.get_project_type(), stats_data = CacheProjectStatistics())
+    with reader_class(InputConfig(source_dir)) as reader:
+        for path in sorted(source_dir.rglob(f"*.{project_type}")):
+            file_data = reader.on_read_source(path, PreReadMetadata())
+            file_data.storage_path = path.relative_to(source_dir).as_posix()
+            for item in file_data.items:
+                item.translated_text = f"译：{item.source_text}"
+                item.translation_status = TranslationStatus.TRANSLATED
+            project.add_file(file_data)
+    return project
+
+
+def run(project: CacheProject, project_type: str, source_dir: Path, output_dir: Path, workers: int) -> float:
+    _, writer_class = PROJECT_TYPES[project_type]
+    output_config = OutputConfig(
+        translated_config = TranslationOutputConfig(True, "_translated", output_dir),
+        bilingual_config = TranslationOutputConfig(True, "_bilingual", output_dir / "bilingual"),
+        input_root = source_dir,
+    )
+    directory_writer = DirectoryWriter(lambda: writer_class(output_config), workers)
+
+    # 不输出逐个文件的日志与进度条，终端输出不计入耗时
+    with open(os.devnull, "w", encoding = "utf-8") as devnull, contextlib.redirect_stdout(devnull):
+        start = time.perf_counter()
+        directory_writer.write_translation_directory(project, source_dir)
+        return time.perf_counter() - start
+
+
+# 读取输出目录中全部文件的内容，压缩包按成员比较
+def read_outputs(output_dir: Path) -> dict[str, object]:
+    outputs = {}
+    for path in sorted(output_dir.rglob("*")):
+        if not path.is_file():
+            continue
+        key = path.relative_to(output_dir).as_posix()
+        if zipfile.is_zipfile(path):
+            with zipfile.ZipFile(path, "r") as zipf:
+                outputs[key] = {info.filename: zipf.read(info) for info in zipf.infolist()}
+        else:
+            outputs[key] = path.read_bytes()
+    return outputs
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "对比单线程与多线程输出的导出耗时")
+    parser.add_argument("--type", choices = list(PROJECT_TYPES), default = "txt", help = "项目类型")
+    parser.add_argument("--files", type = int, default = 2000, help = "文件数量")
+    parser.add_argument("--lines", type = int, default = 200, help = "每个文件的行数")
+    parser.add_argument("--workers", type = int, default = os.cpu_count() or 1, help = "多线程输出使用的线程数")
+    parser.add_argument("--repeat", type = int, default = 3, help = "重复次数，取最短耗时")
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix = "ainiee_bench_"))
+    try:
+        source_dir = work_dir / "source"
+        print(f"生成测试项目：{args.files} 个 {args.type} 文件，每个文件 {args.lines} 行 ...")
+        build_sources(source_dir, args.type, args.files, args.lines)
+        project = build_project(source_dir, args.type)
+
+        results = {}
+        for label, workers in (("sequential", 1), (f"parallel x{args.workers}", args.workers)):
+            output_dir = work_dir / f"output_{workers}"
+            best = float("inf")
+            for _ in range(args.repeat):
+                shutil.rmtree(output_dir, ignore_errors = True)
+                best = min(best, run(project, args.type, source_dir, output_dir, workers))
+            results[label] = (best, read_outputs(output_dir))
+
+        # 两种方式输出的文件内容应当一致
+        outputs = [result[1] for result in results.values()]
+        assert outputs[0] == outputs[-1], "多线程输出的文件与单线程不一致"
+
+        print(f"\n共输出 {len(outputs[0])} 个文件")
+        print(f"{'方式':<16}{'耗时(ms)':>12}{'文件/秒':>12}")
+        for label, (elapsed, _) in results.items():
+            print(f"{label:<16}{elapsed * 1000:>12.1f}{len(outputs[0]) / max(elapsed, 1e-9):>12.0f}")
+
+        sequential, parallel = (result[0] for result in results.values())
+        print(f"\n多线程输出相比单线程快 {sequential / max(parallel, 1e-9):.1f} 倍")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors = True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""语言检测基准测试：逐行检测与批量检测
+
+模拟读取大型项目时的语言检测，对比每秒处理行数：
+- legacy：逐行预筛选后直接调用模型，不去重也不缓存（原有的检测方式）
+- batch：ReaderUtil.detect_languages，预筛选与模型结果按文本去重并缓存，可分发到多个进程
+完整模式下两种方式的结果应当逐行一致，另外输出混合与快速模式下交给模型的文本数
+
+用法（在项目根目录下执行）：
+    python Tools/bench_language_detection.py --lines 500000 --workers 4
+    python Tools/bench_language_detection.py --input lines.txt
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# 检测器按 sys.argv[0] 所在目录查找模型文件，这里指向项目根目录
+sys.argv[0] = os.path.join(ROOT_DIR, os.path.basename(__file__))
+
+from ModuleFolders.FileReader import ReaderUtil
+
+
+# 生成测试文本，模拟游戏脚本中常见的台词、系统文本、重复短句与纯符号行
+def build_lines(lines: int) -> list[str]:
+    rng = random.Random(0)
+    names = ["アリス", "ボブ", "勇者", "Alice", "Bob", "魔王", "리나", "Лена"]
+    fragments = {
+        "ja": ["村の外へ", "向かった", "剣を", "手に入れた", "ありがとう", "森の奥で", "待っている", "魔法を", "使った", "本当に"],
+        "zh": ["村子外面", "出发了", "获得了", "宝剑", "谢谢你", "森林深处", "等待着", "使用了", "魔法", "真的吗"],
+        "ko": ["마을 밖으로", "떠났다", "검을", "얻었다", "고마워", "숲 속에서", "기다리고 있다", "마법을", "사용했다", "정말"],
+        "ru": ["за деревней", "ушёл", "меч", "получил", "спасибо", "в глубине леса", "ждёт", "магию", "использовал", "правда"],
+        "en": ["outside the village", "left", "the sword", "obtained", "thank you", "deep in the forest", "is waiting", "magic", "used", "really"],
+    }
+    separators = {"ja": "", "zh": "", "ko": " ", "ru": " ", "en": " "}
+    repeated = ["……", "はい", "いいえ", "", "★☆★", "HP 100/100", "<color=red>!</color>"]
+
+    source_texts = []
+    for _ in range(lines):
+        # 约两成是重复出现的短句与符号
+        if rng.random() < 0.2:
+            source_texts.append(rng.choice(repeated))
+            continue
+
+        lang = rng.choice(list(fragments))
+        phrase = separators[lang].join(rng.choice(fragments[lang]) for _ in range(rng.randint(2, 5)))
+        source_texts.append(f"{rng.choice(names)}「{phrase}」" if lang in ("ja", "zh") else f"{rng.choice(names)}: {phrase}")
+    return source_texts
+
+
+# 原有的检测方式：逐行预筛选后调用模型
+def legacy_detect(source_texts: list[str]) -> list[tuple[list[str], float, float]]:
+    detector = ReaderUtil.get_lang_detector()
+    results = []
+    for source_text in source_texts:
+        if source_text is None or not isinstance(source_text, str) or not source_text.strip():
+            results.append((['no_text'], -1.0, -1.0))
+            continue
+
+        result, detect_text = ReaderUtil.prefilter_detect_text(source_text)
+        if result is None:
+            result = ReaderUtil.detect_prefiltered_text(detector, detect_text)
+        results.append(result)
+    return results
+
+
+# 清空检测缓存与统计，并预先加载检测器，模型加载不计入耗时
+def reset() -> None:
+    ReaderUtil.close_lang_detector()
+    ReaderUtil.reset_detect_stats()
+    ReaderUtil.get_lang_detector()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "对比逐行检测与批量检测的语言检测速度")
+    parser.add_argument("--lines", type = int, default = 500000, help = "生成的测试行数")
+    parser.add_argument("--input", help = "从文本文件读取测试行，每行一条，指定后忽略 --lines")
+    parser.add_argument("--workers", type = int, default = max(1, min(4, (os.cpu_count() or 1))), help = "批量检测使用的进程数")
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, "r", encoding = "utf-8") as reader:
+            source_texts = reader.read().splitlines()
+    else:
+        source_texts = build_lines(args.lines)
+    print(f"测试文本：{len(source_texts)} 行，不同文本 {len(set(source_texts))} 行")
+
+    rows = []
+
+    reset()
+    start = time.perf_counter()
+    expected = legacy_detect(source_texts)
+    rows.append(("legacy", time.perf_counter() - start, None))
+
+    runs = [("batch x1", 1, ReaderUtil.DETECT_MODE_FULL)]
+    if args.workers > 1:
+        runs.append((f"batch x{args.workers}", args.workers, ReaderUtil.DETECT_MODE_FULL))
+    runs.append(("hybrid", 1, ReaderUtil.DETECT_MODE_HYBRID))
+    runs.append(("fast", 1, ReaderUtil.DETECT_MODE_FAST))
+
+    for label, workers, mode in runs:
+        reset()
+        start = time.perf_counter()
+        results = ReaderUtil.detect_languages(source_texts, workers, mode = mode)
+        rows.append((label, time.perf_counter() - start, ReaderUtil.get_detect_stats()))
+
+        # 完整模式下结果应与逐行检测一致
+        if mode == ReaderUtil.DETECT_MODE_FULL:
+            assert results == expected, f"{label} 的检测结果与逐行检测不一致"
+
+    ReaderUtil.close_lang_detector()
+
+    legacy_time = rows[0][1]
+    print(f"\n{'方式':<12}{'耗时(s)':>10}{'行/秒':>12}{'加速':>8}{'预筛选':>10}{'去重':>10}{'按文字':>10}{'送入模型':>10}")
+    for label, elapsed, stats in rows:
+        stats = stats if stats is not None else dict.fromkeys(("prefiltered", "deduplicated", "script_texts", "model_texts"), "-")
+        print(
+            f"{label:<12}{elapsed:>10.2f}{len(source_texts) / max(elapsed, 1e-9):>12.0f}{legacy_time / max(elapsed, 1e-9):>8.1f}"
+            f"{stats.get('prefiltered', 0):>10}{stats.get('deduplicated', 0):>10}"
+            f"{stats.get('script_texts', 0):>10}{stats.get('model_texts', 0):>10}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""术语提取基准测试：逐行 nlp() 与 nlp.pipe
+
+模拟术语提取中的实体识别，对比每秒处理行数：
+- legacy：逐行调用 nlp(text)，重复的原文也会再识别一次（原有的识别方式）
+- pipe：NERProcessor.extract_terms，原文去重后使用 nlp.pipe 分批识别，可指定进程数
+两种方式最终返回的术语应当一致，模型只加载一次，加载耗时不计入
+
+用法（在项目根目录下执行，模型位于 Resource/Models/ner 下）：
+    python Tools/bench_ner_pipe.py --model ja_core_news_md --lines 20000
+    python Tools/bench_ner_pipe.py --model ja_core_news_md --input output/cache/AinieeCacheData.json --processes 4
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# 模型按当前目录下的 Resource/Models/ner 查找
+os.chdir(ROOT_DIR)
+
+from ModuleFolders.Cache.CacheManager import CacheManager
+from ModuleFolders.NERProcessor.NERProcessor import NERProcessor
+
+
+# 生成测试文本，模拟小说与游戏台词中反复出现的人名与地名
+def build_items_data(lines: int) -> list[dict]:
+    rng = random.Random(0)
+    names = ["アリス", "ボブ", "田中", "佐藤花子", "レオン", "シャルロット", "山田太郎", "クロエ"]
+    places = ["東京", "王都ルミナス", "大阪", "エルフの森", "京都", "北の砦"]
+    actions = ["剣を抜いた", "静かに笑った", "手紙を読んだ", "空を見上げた", "扉を開けた", "深く息を吸った", "本を閉じた", "黙り込んだ"]
+    templates = [
+        "{name}は{place}へ向かい、{action}。",
+        "「{name}さん、{place}で待っているよ」と言って、{action}。",
+        "{place}に着いた{name}は、{name2}と再会して{action}。",
+        "{name}と{name2}は{place}の宿に泊まり、{action}。",
+        "はい。",
+        "……",
+    ]
+    items_data = []
+    for i in range(lines):
+        # 大部分台词只出现一次，简短的回答会反复出现
+        source_text = rng.choice(templates).format(
+            name = rng.choice(names), name2 = rng.choice(names), place = rng.choice(places),
+            action = "、".join(rng.sample(actions, rng.randint(1, 4))),
+        )
+        items_data.append({"source_text": source_text, "file_path": f"file_{i // 1000:04d}.txt"})
+    return items_data
+
+
+# 从缓存文件读取全部原文，与编辑页发起术语提取时的数据一致
+def load_items_data(cache_path: str) -> list[dict]:
+    project = CacheManager.read_from_file(cache_path)
+    return [
+        {"source_text": item.source_text, "file_path": file_path}
+        for file_path, cache_file in project.files.items()
+        for item in cache_file.items
+        if item.source_text and item.source_text.strip()
+    ]
+
+
+# 原有的识别方式：逐行调用 nlp()，其余处理与 NERProcessor 相同
+def legacy_extract_terms(processor: NERProcessor, nlp, items_data: list, entity_types: list) -> list:
+    raw_results = []
+    for item_data in items_data:
+        source_text = item_data.get("source_text")
+        if not source_text or not source_text.strip():
+            continue
+
+        doc = nlp(source_text)
+        for ent in doc.ents:
+            if ent.label_ in entity_types:
+                raw_results.append({
+                    "term": ent.text,
+                    "type": ent.label_,
+                    "context": source_text,
+                    "file_path": item_data.get("file_path"),
+                })
+
+    return processor._sort_results(processor._filter_results(processor._deduplicate_results(raw_results)))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "对比逐行 nlp() 与 nlp.pipe 的实体识别速度")
+    parser.add_argument("--model", required = True, help = "Resource/Models/ner 下的模型文件夹名")
+    parser.add_argument("--input", help = "从缓存文件读取原文，指定后忽略 --lines")
+    parser.add_argument("--lines", type = int, default = 20000, help = "生成的测试行数")
+    parser.add_argument("--entity-types", nargs = "*", help = "需要提取的实体类型，默认为模型支持的全部类型")
+    parser.add_argument("--batch-size", type = int, default = NERProcessor.PIPE_BATCH_SIZE, help = "每批送入模型的文本数量")
+    parser.add_argument("--processes", type = int, default = 1, help = "nlp.pipe 额外测试的进程数，大于 1 时生效")
+    args = parser.parse_args()
+
+    items_data = load_items_data(args.input) if args.input else build_items_data(args.lines)
+    print(f"测试文本：{len(items_data)} 行，不同文本 {len({item['source_text'] for item in items_data})} 行")
+
+    # 预先加载模型，之后 extract_terms 直接复用
+    processor = NERProcessor()
+    nlp = processor._load_model(args.model)
+    if nlp is None:
+        sys.exit(1)
+    entity_types = args.entity_types or list(nlp.get_pipe("ner").labels)
+
+    rows = []
+    start = time.perf_counter()
+    expected = legacy_extract_terms(processor, nlp, items_data, entity_types)
+    rows.append(("legacy", time.perf_counter() - start))
+
+    runs = [1] + ([args.processes] if args.processes > 1 else [])
+    for n_process in runs:
+        start = time.perf_counter()
+        results = processor.extract_terms(items_data, args.model, entity_types, args.batch_size, n_process)
+        rows.append((f"pipe x{n_process}", time.perf_counter() - start))
+        assert results == expected, f"pipe x{n_process} 提取的术语与逐行识别不一致"
+
+    legacy_time = rows[0][1]
+    print(f"\n共提取 {len(expected)} 个术语")
+    print(f"{'方式':<12}{'耗时(s)':>10}{'行/秒':>12}{'加速':>8}")
+    for label, elapsed in rows:
+        print(f"{label:<12}{elapsed:>10.2f}{len(items_data) / max(elapsed, 1e-9):>12.0f}{legacy_time / max(elapsed, 1e-9):>8.1f}")
+
+
+if __name__ == "__main__":
+    main()
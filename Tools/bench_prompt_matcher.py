@@ -0,0 +1,147 @@
+"""提示词匹配基准测试：逐条查找与 PromptMatcher
+
+模拟拼接提示词时筛选当前片段中出现的术语表、角色介绍与禁翻表条目，对比每个片段的耗时：
+- legacy：逐条目在片段的每一行中查找，禁翻表的正则每个片段重新编译（原有的筛选方式）
+- matcher：PromptMatcher 每次任务构建一次，之后每个片段只扫描一遍文本
+两种方式筛选出的条目应当一致，另外输出 PromptMatcher 的构建耗时
+
+用法（在项目根目录下执行）：
+    python Tools/bench_prompt_matcher.py --glossary 5000 --lines 25 --chunks 200
+"""
+
+import argparse
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ModuleFolders.PromptBuilder.PromptMatcher import PromptMatcher
+
+
+def random_word(rng: random.Random, low: int, high: int) -> str:
+    return "".join(chr(rng.randint(0x30A1, 0x30F6)) for _ in range(rng.randint(low, high)))
+
+
+# 生成术语表、角色介绍、禁翻表与待翻译的片段，片段中会出现一部分术语与角色名
+def build_data(glossary: int, characters: int, exclusions: int, lines: int, chunks: int):
+    rng = random.Random(0)
+    glossary_data = [
+        {"src": random_word(rng, 2, 6) if i % 10 else f"Term{i}", "dst": f"术语{i}", "info": ""}
+        for i in range(glossary)
+    ]
+    characterization_data = [
+        {"original_name": random_word(rng, 2, 5), "translated_name": f"角色{i}", "gender": "", "age": "", "personality": "", "speech_style": "", "additional_info": ""}
+        for i in range(characters)
+    ]
+    exclusion_list_data = [
+        {"markers": f"\\c[{i}]", "info": "颜色", "regex": ""} if i % 5 else {"markers": "", "info": "变量", "regex": rf"\\V\[{i}\]"}
+        for i in range(exclusions)
+    ]
+
+    chunk_list = []
+    for _ in range(chunks):
+        chunk = {}
+        for i in range(lines):
+            parts = [random_word(rng, 5, 20)]
+            if rng.random() < 0.3:
+                parts.append(rng.choice(glossary_data)["src"].upper())
+            if rng.random() < 0.2:
+                parts.append(rng.choice(characterization_data)["original_name"])
+            if rng.random() < 0.1:
+                parts.append(f"\\c[{rng.randrange(exclusions)}]\\V[{rng.randrange(exclusions)}]")
+            rng.shuffle(parts)
+            chunk[str(i)] = "".join(parts)
+        chunk_list.append(chunk)
+    return glossary_data, characterization_data, exclusion_list_data, chunk_list
+
+
+# 原有的筛选方式，与修改前的 PromptBuilder 一致
+def legacy_match(glossary_data: list, characterization_data: list, exclusion_list_data: list, input_dict: dict):
+    lines = set(line for line in input_dict.values())
+    glossary = []
+    for v in glossary_data:
+        src_lower = v.get("src").lower()
+        if any(src_lower in line.lower() for line in lines):
+            glossary.append(v)
+
+    dictionary = {}
+    for v in characterization_data:
+        dictionary[v.get("original_name", "")] = v
+    characters = {}
+    for key_a, value_a in dictionary.items():
+        for _, value_b in input_dict.items():
+            if key_a in value_b:
+                characters[key_a] = value_a
+
+    exclusions = {}
+    texts = list(input_dict.values())
+    for element in exclusion_list_data:
+        regex = element.get("regex", "").strip()
+        marker = element.get("markers", "").strip()
+        info = element.get("info", "")
+        if regex:
+            try:
+                pattern = re.compile(regex)
+                for text in texts:
+                    for match in pattern.finditer(text):
+                        if match.group(0) not in exclusions:
+                            exclusions[match.group(0)] = info
+            except re.error:
+                pass
+        else:
+            if any(marker in text for text in texts) and marker not in exclusions:
+                exclusions[marker] = info
+
+    return glossary, characters, exclusions
+
+
+def matcher_match(matcher: PromptMatcher, input_dict: dict):
+    return (
+        matcher.match_glossary(input_dict.values()),
+        matcher.match_characters(input_dict.values()),
+        matcher.match_exclusions(input_dict.values()),
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "对比逐条查找与 PromptMatcher 的提示词筛选耗时")
+    parser.add_argument("--glossary", type = int, default = 5000, help = "术语表条目数")
+    parser.add_argument("--characters", type = int, default = 200, help = "角色介绍条目数")
+    parser.add_argument("--exclusions", type = int, default = 300, help = "禁翻表条目数")
+    parser.add_argument("--lines", type = int, default = 25, help = "每个片段的行数")
+    parser.add_argument("--chunks", type = int, default = 200, help = "片段数量")
+    args = parser.parse_args()
+
+    glossary_data, characterization_data, exclusion_list_data, chunk_list = build_data(
+        args.glossary, args.characters, args.exclusions, args.lines, args.chunks
+    )
+    print(f"术语表 {args.glossary} 条，角色 {args.characters} 个，禁翻表 {args.exclusions} 条，{args.chunks} 个片段，每个片段 {args.lines} 行")
+
+    start = time.perf_counter()
+    expected = [legacy_match(glossary_data, characterization_data, exclusion_list_data, chunk) for chunk in chunk_list]
+    legacy_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    matcher = PromptMatcher(glossary_data, characterization_data, exclusion_list_data)
+    build_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    results = [matcher_match(matcher, chunk) for chunk in chunk_list]
+    matcher_time = time.perf_counter() - start
+
+    # 两种方式筛选出的条目应当一致
+    assert results == expected, "PromptMatcher 的筛选结果与逐条查找不一致"
+
+    matched = sum(len(result[0]) for result in results) / len(results)
+    print(f"平均每个片段命中术语 {matched:.1f} 条")
+    print(f"\n{'方式':<10}{'每片段(ms)':>14}{'合计(ms)':>12}")
+    print(f"{'legacy':<10}{legacy_time * 1000 / args.chunks:>14.2f}{legacy_time * 1000:>12.1f}")
+    print(f"{'matcher':<10}{matcher_time * 1000 / args.chunks:>14.2f}{matcher_time * 1000:>12.1f}")
+    print(f"\nPromptMatcher 构建耗时 {build_time * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
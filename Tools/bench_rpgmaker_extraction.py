@@ -0,0 +1,169 @@
+"""RPG Maker 提取基准测试：Jr_Tpp.ReadGame
+
+生成一个 RPG Maker MV 的 data 文件夹（部分台词在不同事件中重复出现），按 StevExtraction/config.yaml 的提取规则读取，
+分别以 read_workers = 1 与 read_workers = N 运行 ReadGame，输出耗时、提取的行数与结果校验值。
+脚本只使用 Jr_Tpp(config) 与 ReadGame，可以在修改前的提交上运行同一脚本得到原有实现的耗时，
+两次运行的校验值应当一致（原有实现没有 read_workers，两行耗时相同）
+
+用法（在项目根目录下执行）：
+    python Tools/bench_rpgmaker_extraction.py --maps 4 --events 400 --workers 4
+    python Tools/bench_rpgmaker_extraction.py --game-dir path/to/game --no-ja
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+import yaml
+
+from StevExtraction.jtpp import Jr_Tpp
+
+
+def random_line(rng: random.Random) -> str:
+    return "".join(chr(rng.randint(0x3041, 0x3096)) for _ in range(rng.randint(5, 30)))
+
+
+# 游戏中的相当一部分台词会在不同事件中重复出现
+class LineSource:
+    def __init__(self, rng: random.Random, repeated: float, pool_size: int = 2000):
+        self.rng = rng
+        self.repeated = repeated
+        self.pool = [random_line(rng) for _ in range(pool_size)]
+
+    def next(self) -> str:
+        if self.rng.random() < self.repeated:
+            return self.rng.choice(self.pool)
+        return random_line(self.rng)
+
+
+# 生成一页事件指令：对话、选项、脚本与不需要翻译的指令交替出现
+def build_event_list(lines: LineSource, commands: int) -> list:
+    rng = lines.rng
+    event_list = []
+    for _ in range(commands):
+        kind = rng.random()
+        if kind < 0.6:
+            event_list.append({"code": 101, "indent": 0, "parameters": ["Actor1", 0, 0, 2]})
+            for _ in range(rng.randint(1, 4)):
+                event_list.append({"code": 401, "indent": 0, "parameters": [lines.next()]})
+        elif kind < 0.75:
+            choices = [lines.next() for _ in range(rng.randint(2, 4))]
+            event_list.append({"code": 102, "indent": 0, "parameters": [choices, 1, 0, 2, 0]})
+        elif kind < 0.85:
+            event_list.append({"code": 355, "indent": 0, "parameters": [f"$gameSystem.addText('{random_line(rng)}')"]})
+        else:
+            event_list.append({"code": 122, "indent": 0, "parameters": [1, 1, 0, 0, rng.randint(0, 100)]})
+    event_list.append({"code": 0, "indent": 0, "parameters": []})
+    return event_list
+
+
+# 生成 data 文件夹：若干地图、公共事件与数据库文件
+def build_game(game_dir: str, maps: int, events: int, commands: int, repeated: float) -> None:
+    rng = random.Random(0)
+    lines = LineSource(rng, repeated)
+    data_dir = os.path.join(game_dir, "data")
+    os.makedirs(data_dir)
+
+    files = {}
+    for map_index in range(1, maps + 1):
+        files[f"Map{map_index:03d}.json"] = {
+            "displayName": random_line(rng),
+            "events": [None] + [
+                {
+                    "id": event_id,
+                    "name": f"EV{event_id:03d}",
+                    "pages": [{"list": build_event_list(lines, commands)} for _ in range(rng.randint(1, 3))],
+                }
+                for event_id in range(1, events + 1)
+            ],
+        }
+    files["CommonEvents.json"] = [None] + [
+        {"id": event_id, "name": random_line(rng), "list": build_event_list(lines, commands)}
+        for event_id in range(1, events + 1)
+    ]
+    for name in ("Actors.json", "Items.json", "Skills.json"):
+        files[name] = [None] + [
+            {"id": i, "name": random_line(rng), "description": random_line(rng), "note": ""}
+            for i in range(1, 501)
+        ]
+    files["System.json"] = {"gameTitle": random_line(rng), "switches": ["", "スイッチ"], "variables": ["", "変数"]}
+    # 黑名单中的文件不会被读取
+    files["MapInfos.json"] = [None] + [{"id": i, "name": random_line(rng)} for i in range(1, maps + 1)]
+
+    for name, data in files.items():
+        with open(os.path.join(data_dir, name), "w", encoding = "utf-8") as writer:
+            json.dump(data, writer, ensure_ascii = False)
+
+
+def load_config(ja: bool, read_workers: int) -> dict:
+    with open(os.path.join(ROOT_DIR, "StevExtraction", "config.yaml"), "r", encoding = "utf-8") as reader:
+        config = yaml.safe_load(reader)
+    config["ja"] = 1 if ja else 0
+    config["read_workers"] = read_workers
+    return config
+
+
+# 提取结果的校验值，与读取方式无关
+def digest(program_data: dict) -> tuple[int, str]:
+    sha = hashlib.sha256()
+    rows = 0
+    for name, data in program_data.items():
+        sha.update(name.encode("utf-8"))
+        sha.update(data.to_csv().encode("utf-8"))
+        rows += len(data)
+    return rows, sha.hexdigest()[:16]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "测量 RPG Maker 游戏文本提取的耗时")
+    parser.add_argument("--game-dir", help = "使用已有的游戏目录，指定后忽略生成参数")
+    parser.add_argument("--maps", type = int, default = 4, help = "地图文件数量")
+    parser.add_argument("--events", type = int, default = 400, help = "每个地图（及公共事件）的事件数量")
+    parser.add_argument("--commands", type = int, default = 25, help = "每页事件的指令数量")
+    parser.add_argument("--repeated", type = float, default = 0.3, help = "对话与选项取自重复台词的比例")
+    parser.add_argument("--workers", type = int, default = os.cpu_count() or 1, help = "多进程读取使用的进程数")
+    parser.add_argument("--no-ja", action = "store_true", help = "按非日文游戏提取（ja = 0）")
+    parser.add_argument("--repeat", type = int, default = 1, help = "重复次数，取最短耗时")
+    args = parser.parse_args()
+
+    work_dir = tempfile.mkdtemp(prefix = "ainiee_bench_")
+    try:
+        game_dir = args.game_dir
+        if not game_dir:
+            game_dir = os.path.join(work_dir, "game")
+            build_game(game_dir, args.maps, args.events, args.commands, args.repeated)
+        data_dir = os.path.join(game_dir, "data")
+        total_size = sum(os.path.getsize(os.path.join(data_dir, name)) for name in os.listdir(data_dir))
+        print(f"游戏目录：{len(os.listdir(data_dir))} 个文件，{total_size / 1024 / 1024:.1f} MB")
+
+        results = {}
+        for read_workers in sorted({1, args.workers}):
+            best = float("inf")
+            for _ in range(args.repeat):
+                project = Jr_Tpp(load_config(not args.no_ja, read_workers))
+                start = time.perf_counter()
+                project.ReadGame(game_dir)
+                best = min(best, time.perf_counter() - start)
+            results[f"read_workers={read_workers}"] = (best, *digest(project.ProgramData))
+
+        # 不同进程数读取的结果应当一致
+        assert len({result[1:] for result in results.values()}) == 1, "多进程读取的结果与逐个读取不一致"
+
+        print(f"\n{'方式':<18}{'耗时(s)':>10}{'行数':>10}{'校验值':>20}")
+        for label, (elapsed, rows, checksum) in results.items():
+            print(f"{label:<18}{elapsed:>10.2f}{rows:>10}{checksum:>20}")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors = True)
+
+
+if __name__ == "__main__":
+    main()
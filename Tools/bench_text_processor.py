@@ -0,0 +1,88 @@
+"""文本处理器基准测试：逐任务构建与共用处理器
+
+模拟一次翻译中创建大量任务，对比获取文本处理器的耗时：
+- build：每个任务各自构建 TextProcessor，重新编译全部规则并读取正则库（原有的方式）
+- shared：TextProcessor.get_shared，所有任务传入同一份配置数据，直接复用已构建的处理器
+- shared-copy：每次传入内容相同的新数据，需要重新计算指纹，但不会重新构建
+另外检查修改规则后会重新构建处理器
+
+用法（在项目根目录下执行）：
+    python Tools/bench_text_processor.py --rules 100 --exclusions 300 --tasks 50
+"""
+
+import argparse
+import copy
+import os
+import sys
+import time
+from types import SimpleNamespace
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT_DIR)
+
+# 正则库按当前目录下的 Resource/Regex 查找
+os.chdir(ROOT_DIR)
+
+from ModuleFolders.TextProcessor.TextProcessor import ProcessorCache, TextProcessor
+
+
+# 生成替换规则与禁翻表，一半规则使用正则
+def build_config(rules: int, exclusions: int) -> SimpleNamespace:
+    def replace_rules(prefix: str) -> list[dict]:
+        return [
+            {"src": f"{prefix}{i}", "dst": f"{prefix}替换{i}", "regex": rf"{prefix}{i}\d*" if i % 2 else "", "info": ""}
+            for i in range(rules)
+        ]
+
+    return SimpleNamespace(
+        pre_translation_data = replace_rules("前"),
+        post_translation_data = replace_rules("后"),
+        exclusion_list_data = [
+            {"markers": f"<tag{i}>", "info": "", "regex": ""} if i % 3 else {"markers": "", "info": "", "regex": rf"\\C\[{i}\]"}
+            for i in range(exclusions)
+        ],
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "对比逐任务构建与共用文本处理器的耗时")
+    parser.add_argument("--rules", type = int, default = 100, help = "译前与译后替换规则数")
+    parser.add_argument("--exclusions", type = int, default = 300, help = "禁翻表条目数")
+    parser.add_argument("--tasks", type = int, default = 50, help = "任务数量")
+    args = parser.parse_args()
+
+    config = build_config(args.rules, args.exclusions)
+    print(f"替换规则 {args.rules} 条，禁翻表 {args.exclusions} 条，{args.tasks} 个任务")
+
+    # 原有方式，每个任务各自构建
+    start = time.perf_counter()
+    for _ in range(args.tasks):
+        TextProcessor(config)
+    build_time = time.perf_counter() - start
+
+    # 共用处理器，首次调用包含一次构建
+    TextProcessor.SHARED_CACHE = ProcessorCache()
+    start = time.perf_counter()
+    processors = [TextProcessor.get_shared(config) for _ in range(args.tasks)]
+    shared_time = time.perf_counter() - start
+    assert all(processor is processors[0] for processor in processors), "同一份配置应当共用同一个处理器"
+
+    # 内容相同的新数据，只计算指纹
+    configs = [copy.deepcopy(config) for _ in range(args.tasks)]
+    start = time.perf_counter()
+    processors = [TextProcessor.get_shared(item) for item in configs]
+    copy_time = time.perf_counter() - start
+    assert all(processor is processors[0] for processor in processors), "规则内容相同时不应重新构建"
+
+    # 修改规则后应重新构建
+    changed = copy.deepcopy(config)
+    changed.pre_translation_data[0]["dst"] = "修改后"
+    assert TextProcessor.get_shared(changed) is not processors[0], "规则修改后应当重新构建"
+
+    print(f"\n{'方式':<14}{'合计(ms)':>12}{'每任务(ms)':>14}")
+    for label, elapsed in (("build", build_time), ("shared", shared_time), ("shared-copy", copy_time)):
+        print(f"{label:<14}{elapsed * 1000:>12.1f}{elapsed * 1000 / args.tasks:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
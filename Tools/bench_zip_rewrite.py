@@ -0,0 +1,129 @@
+"""EPUB 写入基准测试：逐个重新压缩与原样复制
+
+模拟翻译完成后写出 EPUB，替换全部章节文件，对比重写整个压缩包的耗时：
+- legacy：解压并重新压缩压缩包中的每一个文件（原有的写入方式）
+- raw-copy：ZipUtil.replace_in_zip_file，只重新压缩被替换的章节，其余文件原样复制压缩数据
+两种方式写出的文件内容应当一致
+
+用法（在项目根目录下执行）：
+    python Tools/bench_zip_rewrite.py --chapters 50 --images 200 --image-size 300
+    python Tools/bench_zip_rewrite.py --input book.epub
+"""
+
+import argparse
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+import zipfile
+from pathlib import Path
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ModuleFolders.FileAccessor import ZipUtil
+
+
+# 生成以图片为主的测试 EPUB
+def build_epub(path: Path, chapters: int, images: int, image_size: int) -> None:
+    rng = random.Random(0)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zipf:
+        zipf.writestr("mimetype", "application/epub+zip", compress_type = zipfile.ZIP_STORED)
+        zipf.writestr(
+            "META-INF/container.xml",
+            '<?xml version="1.0"?><container version="1.0" xmlns="urn:oasis:names:tc:opendocument:xmlns:container">'
+            '<rootfiles><rootfile full-path="OEBPS/content.opf" media-type="application/oebps-package+xml"/></rootfiles></container>',
+        )
+        zipf.writestr("OEBPS/content.opf", '<?xml version="1.0"?><package xmlns="http://www.idpf.org/2007/opf" version="3.0"/>')
+        zipf.writestr("OEBPS/style.css", "p { text-indent: 2em; }\n" * 200)
+
+        for i in range(chapters):
+            paragraphs = "".join(
+                f"<p>{''.join(chr(rng.randint(0x3041, 0x3096)) for _ in range(rng.randint(20, 120)))}</p>\n"
+                for _ in range(200)
+            )
+            zipf.writestr(f"OEBPS/Text/chapter_{i:04d}.xhtml", f"<html><body>\n{paragraphs}</body></html>")
+
+        # 图片与字体的数据已经压缩过，这里用随机字节模拟
+        for i in range(images):
+            zipf.writestr(f"OEBPS/Images/image_{i:04d}.jpg", rng.randbytes(image_size * 1024))
+        zipf.writestr("OEBPS/Fonts/font.otf", rng.randbytes(2 * 1024 * 1024))
+
+
+# 原有的写入方式：逐个解压并重新压缩
+def legacy_replace(src_zip_file_path: Path, dst_zip_file_path: Path, content: dict[str, str]) -> None:
+    with (
+        zipfile.ZipFile(src_zip_file_path, "r") as zin,
+        zipfile.ZipFile(dst_zip_file_path, "w") as zout,
+    ):
+        for item in zin.infolist():
+            if item.filename in content:
+                zout.writestr(item, content[item.filename])
+            else:
+                zout.writestr(item, zin.read(item.filename))
+
+
+# 读取压缩包中全部文件的内容
+def read_members(path: Path) -> dict[str, bytes]:
+    with zipfile.ZipFile(path, "r") as zipf:
+        assert zipf.testzip() is None, f"{path} 校验失败"
+        return {info.filename: zipf.read(info) for info in zipf.infolist()}
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description = "对比逐个重新压缩与原样复制的 EPUB 写入耗时")
+    parser.add_argument("--input", help = "使用已有的 EPUB 文件，指定后忽略生成参数")
+    parser.add_argument("--chapters", type = int, default = 50, help = "章节文件数量")
+    parser.add_argument("--images", type = int, default = 200, help = "图片数量")
+    parser.add_argument("--image-size", type = int, default = 300, help = "单张图片大小（KB）")
+    parser.add_argument("--repeat", type = int, default = 5, help = "重复次数，取最短耗时")
+    args = parser.parse_args()
+
+    work_dir = Path(tempfile.mkdtemp(prefix = "ainiee_bench_"))
+    try:
+        if args.input:
+            src_path = Path(args.input)
+        else:
+            src_path = work_dir / "source.epub"
+            build_epub(src_path, args.chapters, args.images, args.image_size)
+
+        # 替换全部章节文件，模拟写出译文
+        with zipfile.ZipFile(src_path, "r") as zipf:
+            content = {
+                info.filename: zipf.read(info).decode("utf-8", errors = "ignore").replace("<p>", "<p>译：")
+                for info in zipf.infolist()
+                if info.filename.endswith((".xhtml", ".html", ".htm"))
+            }
+        print(
+            f"源文件：{os.path.getsize(src_path) / 1024 / 1024:.1f} MB，"
+            f"其中 {len(content)} 个章节文件需要替换"
+        )
+
+        results = {}
+        for mode, replace in (("legacy", legacy_replace), ("raw-copy", ZipUtil.replace_in_zip_file)):
+            dst_path = work_dir / f"{mode}.epub"
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                replace(src_path, dst_path, content)
+                best = min(best, time.perf_counter() - start)
+            results[mode] = (best, os.path.getsize(dst_path), read_members(dst_path))
+
+        # 两种方式写出的文件内容应当一致，mimetype 应为第一个文件
+        assert results["legacy"][2] == results["raw-copy"][2]
+        if ZipUtil.MIMETYPE_FILENAME in results["raw-copy"][2]:
+            with zipfile.ZipFile(work_dir / "raw-copy.epub", "r") as zipf:
+                first = zipf.infolist()[0]
+                assert first.filename == ZipUtil.MIMETYPE_FILENAME and first.compress_type == zipfile.ZIP_STORED
+
+        print(f"\n{'方式':<10}{'耗时(ms)':>12}{'输出(MB)':>12}")
+        for mode, (elapsed, size, _) in results.items():
+            print(f"{mode:<10}{elapsed * 1000:>12.1f}{size / 1024 / 1024:>12.1f}")
+        print(f"\n原样复制相比重新压缩快 {results['legacy'][0] / max(results['raw-copy'][0], 1e-9):.1f} 倍")
+    finally:
+        shutil.rmtree(work_dir, ignore_errors = True)
+
+
+if __name__ == "__main__":
+    main()
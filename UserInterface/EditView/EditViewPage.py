@@ -387,7 +387,8 @@ class NavigationCard(Base,CardWidget):
             # 用户点击了“开始提取”
             params = {
                 "model_name": dialog.selected_model,
-                "entity_types": dialog.selected_types
+                "entity_types": dialog.selected_types,
+                "max_text_length": dialog.selected_max_text_length,
             }
             self.termExtractionRequested.emit(params)
 
@@ -34,6 +34,7 @@ class MonitoringPage(Base,QWidget):
         self.add_waveform_card(self.head_hbox)
         self.add_speed_card(self.head_hbox)
         self.add_stability_card(self.head_hbox)
+        self.add_key_pool_card(self.head_hbox)
 
         # 添加到主容器
         self.container.addWidget(self.head_hbox_container, 1)
@@ -151,6 +152,17 @@ class MonitoringPage(Base,QWidget):
         self.stability.setFixedSize(204, 204)
         parent.addWidget(self.stability)
 
+    # 可用密钥
+    def add_key_pool_card(self, parent: QLayout) -> None:
+        self.key_pool = DashboardCard(
+                title=self.tra("可用密钥"),
+                value="0",
+                unit="Key",
+                icon=FIF.FINGERPRINT,
+            )
+        self.key_pool.setFixedSize(204, 204)
+        parent.addWidget(self.key_pool)
+
 
     # 监控页面更新事件
     def data_update(self, event: int, data: dict) -> None:
@@ -159,6 +171,7 @@ class MonitoringPage(Base,QWidget):
             self.update_line(event, data)
             self.update_token(event, data)
             self.update_stability(event, data)
+            self.update_key_pool(event, data)
 
         self.update_task(event, data)
         self.update_status(event, data)
@@ -234,6 +247,16 @@ class MonitoringPage(Base,QWidget):
 
     # 更新实时任务数
     def update_task(self, event: int, data: dict) -> None:
+        if data.get("concurrency") is not None:
+            self.data["concurrency"] = data["concurrency"]
+
+        # 任务进行中时显示并发控制器的进行中任务数与并发上限，否则按线程统计
+        concurrency = self.data.get("concurrency")
+        if concurrency is not None and Base.work_status in (Base.STATUS.STOPING, Base.STATUS.TASKING):
+            self.task.set_unit(f"/ {concurrency.get('limit', 0)}")
+            self.task.set_value(f"{concurrency.get('in_flight', 0)}")
+            return None
+
         task = len([t for t in threading.enumerate() if "translator" in t.name])
         if task < 1000:
             self.task.set_unit("Task")
@@ -289,6 +312,15 @@ class MonitoringPage(Base,QWidget):
         self.stability.set_unit("%")
         self.stability.set_value(f"{stability_percent:.2f}")
 
+    # 更新密钥池状态，显示当前可立即使用的密钥数量与密钥总数
+    def update_key_pool(self, event: int, data: dict) -> None:
+        if data.get("key_pool") is not None:
+            self.data["key_pool"] = data["key_pool"]
+
+        key_pool = self.data.get("key_pool", {})
+        self.key_pool.set_unit("Key")
+        self.key_pool.set_value(f"{key_pool.get('active', 0)}/{key_pool.get('total', 0)}")
+
     # 更新进度环
     def update_status(self, event: int, data: dict) -> None:
         if Base.work_status == Base.STATUS.STOPING:
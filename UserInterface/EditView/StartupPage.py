@@ -150,7 +150,9 @@ class StartupPage(Base, QWidget):
                 CacheProject = self.file_reader.read_files(
                     translation_project,
                     label_input_path,
-                    label_input_exclude_rule
+                    label_input_exclude_rule,
+                    config.get("parallel_read_switch", True),
+                    config.get("language_detection_mode", "hybrid"),
                 )
                 self.cache_manager.load_from_project(CacheProject)
             else:  # "continue"
@@ -1,6 +1,6 @@
 import os
 from qfluentwidgets import (ComboBox, CheckBox, MessageBoxBase, StrongBodyLabel, 
-                            InfoBar, InfoBarPosition, CaptionLabel, HyperlinkButton)
+                            InfoBar, InfoBarPosition, CaptionLabel, HyperlinkButton, SpinBox)
 from PyQt5.QtWidgets import QGroupBox, QWidget, QVBoxLayout, QGridLayout, QHBoxLayout
 from Base.Base import Base
 
@@ -57,6 +57,18 @@ class TermExtractionDialog(Base, MessageBoxBase):
         
         layout.addWidget(self.entity_group)
 
+        # --- 单段文本长度上限 ---
+        length_layout = QHBoxLayout()
+        length_layout.addWidget(StrongBodyLabel(self.tra("单段文本最大长度:")))
+        length_layout.addStretch(1)
+        self.max_length_spin = SpinBox(self)
+        self.max_length_spin.setRange(0, 100000)
+        self.max_length_spin.setSingleStep(100)
+        self.max_length_spin.setValue(0)
+        length_layout.addWidget(self.max_length_spin)
+        layout.addLayout(length_layout)
+        layout.addWidget(CaptionLabel(self.tra("注: 超出长度的原文会切分后再识别，术语的上下文也只保留所在的片段，0 为不限制"), self))
+
         # 将自定义视图添加到对话框
         self.viewLayout.addWidget(self.view)
 
@@ -66,6 +78,7 @@ class TermExtractionDialog(Base, MessageBoxBase):
         # 用于存储用户选择的属性
         self.selected_model = None
         self.selected_types = []
+        self.selected_max_text_length = 0
 
     def load_ner_models(self):
         """
@@ -94,6 +107,7 @@ class TermExtractionDialog(Base, MessageBoxBase):
         self.selected_types = [
             text for text, cb in self.entity_checkboxes.items() if cb.isChecked()
         ]
+        self.selected_max_text_length = self.max_length_spin.value()
 
         if not self.selected_model or not self.model_combo.isEnabled():
             InfoBar.error(
@@ -36,6 +36,9 @@ class AppSettingsPage(QWidget, Base):
             "interface_language_setting": "简中",
             "auto_check_update": True,
             "label_input_exclude_rule": "",
+            "parallel_read_switch": True,
+            "parallel_write_switch": True,
+            "language_detection_mode": "hybrid",
         }
 
         # 载入并保存默认配置
@@ -67,6 +70,9 @@ class AppSettingsPage(QWidget, Base):
         self.add_widget_scale_factor(self.vbox, config)
         self.add_widget_interface_language_setting(self.vbox, config)
         self.add_widget_exclude_rule(self.vbox, config)
+        self.add_widget_parallel_read(self.vbox, config)
+        self.add_widget_parallel_write(self.vbox, config)
+        self.add_widget_language_detection_mode(self.vbox, config)
 
         # 填充
         self.vbox.addStretch(1)
@@ -257,4 +263,76 @@ class AppSettingsPage(QWidget, Base):
                 init=init,
                 text_changed=text_changed,
             )
-        )
\ No newline at end of file
+        )
+
+    # 多进程读取文件
+    def add_widget_parallel_read(self, parent, config) -> None:
+        def init(widget) -> None:
+            widget.set_checked(config.get("parallel_read_switch", True))
+
+        def checked_changed(widget, checked: bool) -> None:
+            config = self.load_config()
+            config["parallel_read_switch"] = checked
+            self.save_config(config)
+
+        parent.addWidget(
+            SwitchButtonCard(
+                self.tra("多进程读取文件"),
+                self.tra("启用此功能后，载入项目时将使用多个进程并行解析文件与检测语言，适合文件数量较多的项目"),
+                init = init,
+                checked_changed = checked_changed,
+            )
+        )
+
+    # 多线程输出文件
+    def add_widget_parallel_write(self, parent, config) -> None:
+        def init(widget) -> None:
+            widget.set_checked(config.get("parallel_write_switch", True))
+
+        def checked_changed(widget, checked: bool) -> None:
+            config = self.load_config()
+            config["parallel_write_switch"] = checked
+            self.save_config(config)
+
+        parent.addWidget(
+            SwitchButtonCard(
+                self.tra("多线程输出文件"),
+                self.tra("启用此功能后，导出翻译结果时将使用多个线程同时输出不同的文件，适合文件数量较多的项目"),
+                init = init,
+                checked_changed = checked_changed,
+            )
+        )
+
+    # 语言检测模式
+    def add_widget_language_detection_mode(self, parent, config) -> None:
+        # 定义模式配对列表（显示文本, 存储值）
+        mode_pairs = [
+            (self.tra("快速"), "fast"),
+            (self.tra("混合"), "hybrid"),
+            (self.tra("完整"), "full"),
+        ]
+
+        def init(widget) -> None:
+            index = next(
+                (i for i, (_, value) in enumerate(mode_pairs) if value == config.get("language_detection_mode")),
+                1
+            )
+            widget.set_current_index(index)
+
+        def current_text_changed(widget, text: str) -> None:
+            config = self.load_config()
+            config["language_detection_mode"] = next(
+                (value for display, value in mode_pairs if display == text),
+                "hybrid"
+            )
+            self.save_config(config)
+
+        parent.addWidget(
+            ComboBoxCard(
+                self.tra("语言检测模式"),
+                self.tra("快速 只要出现假名、韩文或西里尔字母即直接判断语言，混合 仅在整行只含一种文字时直接判断，完整 全部使用模型检测"),
+                [display for display, _ in mode_pairs],
+                init = init,
+                current_text_changed = current_text_changed,
+            )
+        )
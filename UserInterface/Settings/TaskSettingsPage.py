@@ -5,6 +5,7 @@ from qfluentwidgets import HorizontalSeparator
 from Base.Base import Base
 from Widget.SpinCard import SpinCard
 from Widget.ComboBoxCard import ComboBoxCard
+from Widget.SwitchButtonCard import SwitchButtonCard
 
 class TaskSettingsPage(QFrame, Base):
 
@@ -18,7 +19,12 @@ class TaskSettingsPage(QFrame, Base):
             "tokens_limit_switch": True,
             "lines_limit": 10,
             "tokens_limit": 512,
+            "chunk_strategy": "greedy",
             "user_thread_counts": 0,
+            "async_request_switch": False,
+            "adaptive_concurrency_switch": True,
+            "rpm_burst": 0,
+            "response_stream_switch": False,
             "request_timeout": 120,
             "round_limit": 10,
         }
@@ -40,8 +46,13 @@ class TaskSettingsPage(QFrame, Base):
         self.add_widget_01(self.vbox, config)
         self.add_widget_02(self.vbox, config)
         self.add_widget_03(self.vbox, config)
+        self.add_widget_chunk_strategy(self.vbox, config)
         self.vbox.addWidget(HorizontalSeparator())
         self.add_widget_04(self.vbox, config)
+        self.add_widget_adaptive_concurrency(self.vbox, config)
+        self.add_widget_async_request(self.vbox, config)
+        self.add_widget_rpm_burst(self.vbox, config)
+        self.add_widget_response_stream(self.vbox, config)
         self.vbox.addWidget(HorizontalSeparator())
         self.add_widget_request_timeout(self.vbox, config)
         self.add_widget_06(self.vbox, config)
@@ -158,6 +169,39 @@ class TaskSettingsPage(QFrame, Base):
         )
         parent.addWidget(self.tokens_limit_card)
 
+    # 子任务的切分策略
+    def add_widget_chunk_strategy(self, parent, config) -> None:
+        # 定义策略配对列表（显示文本, 存储值）
+        strategy_pairs = [
+            (self.tra("顺序填满"), "greedy"),
+            (self.tra("均衡切分"), "balanced"),
+        ]
+
+        def init(widget) -> None:
+            index = next(
+                (i for i, (_, value) in enumerate(strategy_pairs) if value == config.get("chunk_strategy")),
+                0
+            )
+            widget.set_current_index(index)
+
+        def current_text_changed(widget, text: str) -> None:
+            config = self.load_config()
+            config["chunk_strategy"] = next(
+                (value for display, value in strategy_pairs if display == text),
+                "greedy"
+            )
+            self.save_config(config)
+
+        parent.addWidget(
+            ComboBoxCard(
+                self.tra("任务切分策略"),
+                self.tra("顺序填满 会装满一个任务后再开始下一个，均衡切分 在任务数量不变的前提下让各任务的大小尽量接近"),
+                [display for display, _ in strategy_pairs],
+                init = init,
+                current_text_changed = current_text_changed,
+            )
+        )
+
     # 同时执行的子任务数量
     def add_widget_04(self, parent, config) -> None:
         def init(widget) -> None:
@@ -178,6 +222,82 @@ class TaskSettingsPage(QFrame, Base):
             )
         )
 
+    # 自适应并发
+    def add_widget_adaptive_concurrency(self, parent, config) -> None:
+        def init(widget) -> None:
+            widget.set_checked(config.get("adaptive_concurrency_switch"))
+
+        def checked_changed(widget, checked: bool) -> None:
+            config = self.load_config()
+            config["adaptive_concurrency_switch"] = checked
+            self.save_config(config)
+
+        parent.addWidget(
+            SwitchButtonCard(
+                self.tra("自适应并发"),
+                self.tra("并发任务数为自动模式时，根据请求耗时与限流情况动态调整同时执行的任务数量，请求耗时与错误率平稳时逐步增加，遇到 429 或超时时自动减少"),
+                init = init,
+                checked_changed = checked_changed,
+            )
+        )
+
+    # 流式请求
+    def add_widget_response_stream(self, parent, config) -> None:
+        def init(widget) -> None:
+            widget.set_checked(config.get("response_stream_switch"))
+
+        def checked_changed(widget, checked: bool) -> None:
+            config = self.load_config()
+            config["response_stream_switch"] = checked
+            self.save_config(config)
+
+        parent.addWidget(
+            SwitchButtonCard(
+                self.tra("流式接收回复"),
+                self.tra("启用后 OpenAI、Anthropic 格式的接口将以流式方式接收回复，并在接收过程中逐行检查数字序号，出现拒绝翻译、错行串行等错误时立即中止请求，减少无效的 Token 消耗"),
+                init = init,
+                checked_changed = checked_changed,
+            )
+        )
+
+    # 异步请求引擎
+    def add_widget_async_request(self, parent, config) -> None:
+        def init(widget) -> None:
+            widget.set_checked(config.get("async_request_switch"))
+
+        def checked_changed(widget, checked: bool) -> None:
+            config = self.load_config()
+            config["async_request_switch"] = checked
+            self.save_config(config)
+
+        parent.addWidget(
+            SwitchButtonCard(
+                self.tra("使用异步请求引擎"),
+                self.tra("启用后 OpenAI、Anthropic、Google 格式的接口将在事件循环中并发请求，不再为每个任务占用一个线程，适合 RPM 很高、并发任务数设置为数百以上的接口"),
+                init = init,
+                checked_changed = checked_changed,
+            )
+        )
+
+    # RPM 突发请求数
+    def add_widget_rpm_burst(self, parent, config) -> None:
+        def init(widget) -> None:
+            widget.set_range(0, 9999999)
+            widget.set_value(config.get("rpm_burst"))
+
+        def value_changed(widget, value: int) -> None:
+            config = self.load_config()
+            config["rpm_burst"] = value
+            self.save_config(config)
+
+        parent.addWidget(
+            SpinCard(
+                self.tra("突发请求数"),
+                self.tra("允许不间隔连续发出的最大请求数，每分钟的请求总数仍受 RPM 限额约束，设置为 0 为自动模式，即允许一秒内的请求量"),
+                init = init,
+                value_changed = value_changed,
+            )
+        )
 
     # 请求超时时间
     def add_widget_request_timeout(self, parent, config) -> None:
@@ -25,6 +25,9 @@ class TranslationSettingsPage(QFrame, Base):
             "pre_line_counts": 0,
             "few_shot_and_example_switch": True,
             "auto_process_text_code_segment": False,
+            "translation_memory_switch": True,
+            "global_translation_memory_switch": False,
+            "deduplication_switch": True,
             "response_check_switch": {
                 "return_to_original_text_check": True,
                 "residual_original_text_check": True,
@@ -48,6 +51,10 @@ class TranslationSettingsPage(QFrame, Base):
         self.add_auto_process_text_code_segment(self.container, config)
         self.add_widget_few_shot_and_example(self.container, config)
         self.container.addWidget(HorizontalSeparator())
+        self.add_widget_translation_memory(self.container, config)
+        self.add_widget_global_translation_memory(self.container, config)
+        self.add_widget_deduplication(self.container, config)
+        self.container.addWidget(HorizontalSeparator())
         self.add_widget_result_check(self.container, config)
 
         # 填充
@@ -227,6 +234,63 @@ class TranslationSettingsPage(QFrame, Base):
             )
         )
 
+    # 项目翻译记忆
+    def add_widget_translation_memory(self, parent, config) -> None:
+        def init(widget) -> None:
+            widget.set_checked(config.get("translation_memory_switch"))
+
+        def checked_changed(widget, checked: bool) -> None:
+            config = self.load_config()
+            config["translation_memory_switch"] = checked
+            self.save_config(config)
+
+        parent.addWidget(
+            SwitchButtonCard(
+                self.tra("项目翻译记忆"),
+                self.tra("将通过检查的译文保存到输出文件夹的记忆库中，生成翻译任务前先查询记忆库，原文相同的文本直接使用已有译文，不再发送请求"),
+                init = init,
+                checked_changed = checked_changed,
+            )
+        )
+
+    # 全局翻译记忆
+    def add_widget_global_translation_memory(self, parent, config) -> None:
+        def init(widget) -> None:
+            widget.set_checked(config.get("global_translation_memory_switch"))
+
+        def checked_changed(widget, checked: bool) -> None:
+            config = self.load_config()
+            config["global_translation_memory_switch"] = checked
+            self.save_config(config)
+
+        parent.addWidget(
+            SwitchButtonCard(
+                self.tra("全局翻译记忆"),
+                self.tra("在所有项目之间共用一个记忆库，适合同一系列作品的翻译，项目记忆库中没有的原文将再查询全局记忆库"),
+                init = init,
+                checked_changed = checked_changed,
+            )
+        )
+
+    # 相同原文只翻译一次
+    def add_widget_deduplication(self, parent, config) -> None:
+        def init(widget) -> None:
+            widget.set_checked(config.get("deduplication_switch"))
+
+        def checked_changed(widget, checked: bool) -> None:
+            config = self.load_config()
+            config["deduplication_switch"] = checked
+            self.save_config(config)
+
+        parent.addWidget(
+            SwitchButtonCard(
+                self.tra("相同原文只翻译一次"),
+                self.tra("将所有文件中规范化后相同的待翻译原文合并，只发送首次出现的一行，译文通过检查后同步到其余各行，以减少请求数与 Tokens 消耗"),
+                init = init,
+                checked_changed = checked_changed,
+            )
+        )
+
     # 结果检查
     def add_widget_result_check(self, parent, config) -> None:
         def on_toggled(checked: bool, key) -> None: